@@ -0,0 +1,168 @@
+"""Signal throughput, lock contention and UI latency of the Bluetooth stack.
+
+Starts the mock BlueZ service on a private bus, runs a real
+BluetoothController against it and drives the Kivy Clock from this thread
+the way the app does. Reports:
+
+- startup: controller start until the first track metadata is published
+- rssi_storm / position_storm: PropertiesChanged signals handled per second,
+  client CPU per 1000 signals and how many change events reached subscribers
+- lock: wait times for every acquire of the controller lock
+- ui_latency: mock emits a track change -> title label updated on the Kivy thread
+
+Usage: python -m benchmarks.bench_bluetooth [--devices N] [--signals N] [--tracks N] [--json PATH]
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+
+from kivy.clock import Clock
+
+from bluetooth.controller import BluetoothController
+from bluetooth.timed_lock import TimedLock
+from benchmarks.mock_bluez import MockBlueZ
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def pump(predicate, timeout):
+    """ Ticks the Kivy Clock until predicate() holds; returns False on timeout. """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        Clock.tick()
+        if predicate():
+            return True
+    return False
+
+
+class TitleView:
+    """ Subscriber standing in for the music page's title label. """
+    def __init__(self, controller):
+        self.controller = controller
+        self.title = ""
+        self.updated_at = {}
+        self.subscription = controller.subscribe(self.update, fields=('metadata',))
+
+    def update(self, change):
+        self.title = self.controller.snapshot()['metadata'].get('Title', '')
+        self.updated_at.setdefault(self.title, time.monotonic())
+
+
+def instrument(controller):
+    """ Counts handled PropertiesChanged signals; must run before start(). """
+    handled = [0]
+    original = controller.properties_changed
+
+    def counting(*args, **kwargs):
+        original(*args, **kwargs)
+        handled[0] += 1
+
+    controller.properties_changed = counting
+    return handled
+
+
+def run_storm(mock, controller, handled, kind, count, timeout):
+    storm = getattr(mock.control, kind)
+    version_before = controller.snapshot()['version']
+    target = handled[0] + count
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    emit_seconds = float(storm(count))
+    drained = pump(lambda: handled[0] >= target, timeout)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    return {
+        "signals": count,
+        "drained": drained,
+        "emit_s": round(emit_seconds, 4),
+        "elapsed_s": round(elapsed, 4),
+        "signals_per_s": round(count / elapsed, 1),
+        "cpu_ms_per_1000": round(cpu * 1000 / count * 1000, 3),
+        "change_events": controller.snapshot()['version'] - version_before,
+    }
+
+
+def run_ui_latency(mock, view, tracks, timeout):
+    latencies = []
+    for i in range(tracks):
+        title = f"bench-{i}"
+        emitted = float(mock.control.SetTrack(title))
+        if pump(lambda: title in view.updated_at, timeout):
+            latencies.append((view.updated_at[title] - emitted) * 1000)
+    return {
+        "tracks": tracks,
+        "received": len(latencies),
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "max_ms": round(max(latencies, default=0.0), 3),
+    }
+
+
+def lock_stats(lock):
+    waits_us = [wait * 1e6 for wait in lock.waits]
+    return {
+        "acquisitions": len(waits_us),
+        "mean_wait_us": round(sum(waits_us) / len(waits_us), 2) if waits_us else 0.0,
+        "p99_wait_us": round(percentile(waits_us, 0.99), 2),
+        "max_wait_us": round(max(waits_us, default=0.0), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--devices', type=int, default=300)
+    parser.add_argument('--signals', type=int, default=20000)
+    parser.add_argument('--tracks', type=int, default=50)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--json', help="also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with MockBlueZ(devices=args.devices, connected=True) as mock, \
+            tempfile.TemporaryDirectory() as state_dir, \
+            contextlib.redirect_stdout(io.StringIO()):
+        controller = BluetoothController(bus_address=mock.address, state_dir=state_dir)
+        controller.lock = TimedLock(max_samples=None)
+        handled = instrument(controller)
+        view = TitleView(controller)
+
+        controller.start()
+        if not pump(lambda: 'first_metadata' in controller.metrics, args.timeout):
+            raise RuntimeError("controller never attached to the mock player")
+        results["startup_ms"] = round(controller.metrics['first_metadata'] * 1000, 1)
+
+        controller.lock.waits.clear()
+        results["rssi_storm"] = run_storm(
+            mock, controller, handled, 'RssiStorm', args.signals, args.timeout)
+        results["position_storm"] = run_storm(
+            mock, controller, handled, 'PositionStorm', args.signals, args.timeout)
+        results["ui_latency"] = run_ui_latency(mock, view, args.tracks, args.timeout)
+        results["lock"] = lock_stats(controller.lock)
+
+        if controller.mainloop:
+            controller.mainloop.quit()
+
+    print(f"devices: {args.devices}  startup: {results['startup_ms']} ms")
+    for name in ("rssi_storm", "position_storm", "ui_latency", "lock"):
+        print(f"{name}:")
+        for key, value in results[name].items():
+            print(f"  {key:<18}{value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
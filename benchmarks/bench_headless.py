@@ -0,0 +1,298 @@
+"""Headless per-page rendering benchmark of the dashboard UI.
+
+Boots the real CarDashboardApp in an offscreen SDL window, with the music
+page's BluetoothController replaced by one that is fed a synthetic phone
+(track changes, position updates, a stream of discovered devices) from a
+background thread, the way the D-Bus thread would. It then visits every
+page. While each page sits on screen receiving that state it records:
+
+- frame times between buffer flips, and how many frames were drawn
+- layout passes (do_layout calls) and texture uploads (text and images)
+- process CPU, resident memory and its growth, live Python objects
+- the busiest Clock callbacks and the controller lock's waits
+
+Needs no display, Bluetooth adapter or D-Bus daemon, so it runs on a CI
+box. With --baseline it compares against an earlier --json result and
+exits non-zero when a page got worse by more than the tolerance.
+
+Usage: python -m benchmarks.bench_headless [--settle S] [--seconds S] [--rate HZ]
+       [--json PATH] [--baseline PATH] [--tolerance F]
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+
+import argparse
+import functools
+import gc
+import json
+import sys
+import tempfile
+import time
+
+from kivy.clock import Clock
+from kivy.core.image import ImageLoaderBase
+from kivy.core.text import LabelBase
+from kivy.core.window import Window
+from kivy.uix.layout import Layout
+# Imported up front so their do_layout is counted as well
+from kivy.uix import anchorlayout, boxlayout, floatlayout, gridlayout  # noqa: F401
+from kivy.uix import recycleboxlayout, relativelayout, stacklayout  # noqa: F401
+
+from ui.perf_monitor import PerfMonitor, percentile
+PerfMonitor.shared().install()  # before the app creates its Clock events
+
+from bluetooth.controller import BluetoothController
+from main import CarDashboardApp, PAGES
+from pages.music_page import MusicPage
+from state_store import STATE_DIR_ENV
+
+SYNTHETIC_DEVICE = '/org/bluez/hci0/dev_00_00_00_00_00_01'
+SYNTHETIC_PLAYER = SYNTHETIC_DEVICE + '/player0'
+TRACK_SECONDS = 5.0  # synthetic track length
+TOP_CALLBACKS = 5
+
+# Metrics checked by --baseline, with absolute slack on top of --tolerance
+# so near-zero values do not fail on noise
+REGRESSION_SLACK = {
+    "frame_ms_p95": 2.0,
+    "cpu_percent": 2.0,
+    "layout_passes": 5,
+    "texture_uploads": 5,
+    "rss_growth_mb": 2.0,
+}
+
+
+def rss_mb():
+    """Resident set size of this process, or 0.0 where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class SyntheticController(BluetoothController):
+    """ BluetoothController without D-Bus, fed a scripted phone by its own thread.
+
+    run() publishes state through the same lock and change notifications
+    the D-Bus handlers use, so the pages see exactly what a real phone
+    would produce, at a rate that does not depend on hardware.
+    """
+    rate = 10.0  # device updates per second
+    device_count = 30
+
+    def __init__(self):
+        super().__init__()  # state in MINI_MATT_STATE_DIR, a temporary directory here
+        self.injected = 0
+
+    def run(self):
+        self.player_path = SYNTHETIC_PLAYER
+        with self.lock:
+            self._connected_device = {"name": "Synthetic Phone", "path": SYNTHETIC_DEVICE}
+            self._status = "Connected"
+            self._changed('connected_device', 'status')
+        self._apply_player_properties({'Status': 'playing', 'Browsable': True})
+
+        tick = 0
+        track = -1
+        while True:
+            time.sleep(1 / self.rate)
+            tick += 1
+            elapsed = tick / self.rate
+            if int(elapsed // TRACK_SECONDS) != track:
+                track = int(elapsed // TRACK_SECONDS)
+                self._apply_player_properties({'Track': {
+                    'Title': f"Track {track}",
+                    'Artist': f"Artist {track % 7}",
+                    'Album': f"Album {track % 3}",
+                    'Duration': int(TRACK_SECONDS * 1000),
+                }})
+            elif tick % int(self.rate) == 0:
+                position = int((elapsed % TRACK_SECONDS) * 1000)
+                self._apply_player_properties({'Position': position})
+
+            index = tick % self.device_count
+            with self.lock:
+                if self._discovered_devices.update(
+                        f'/org/bluez/hci0/dev_00_00_00_00_01_{index:02X}',
+                        name=f"Device {index}", rssi=-40 - (tick * 7 + index) % 50):
+                    self._changed('discovered_devices')
+            self.injected += 1
+
+
+class Counters:
+    """ Layout passes and texture uploads, counted by wrapping the Kivy methods that do them. """
+    def __init__(self):
+        self.layout_passes = 0
+        self.texture_uploads = 0
+
+    def install(self):
+        classes = [Layout]
+        while classes:
+            cls = classes.pop()
+            classes.extend(cls.__subclasses__())
+            if 'do_layout' in cls.__dict__:
+                self._count(cls, 'do_layout', 'layout_passes')
+        # Text is uploaded when its delayed texture is first drawn; images on populate
+        self._count(LabelBase, '_texture_fill', 'texture_uploads')
+        self._count(ImageLoaderBase, 'populate', 'texture_uploads')
+
+    def _count(self, cls, name, counter):
+        original = cls.__dict__[name]
+
+        # Keeps the name: Kivy's WeakMethod looks bound methods up by it
+        @functools.wraps(original)
+        def counted(*args, **kwargs):
+            setattr(self, counter, getattr(self, counter) + 1)
+            return original(*args, **kwargs)
+        setattr(cls, name, counted)
+
+    def reset(self):
+        self.layout_passes = 0
+        self.texture_uploads = 0
+
+
+class HeadlessBenchApp(CarDashboardApp):
+    """ Dashboard app that visits every page once startup has finished. """
+    def __init__(self, settle, seconds, **kwargs):
+        super().__init__(**kwargs)
+        self.settle = settle
+        self.seconds = seconds
+        self.counters = Counters()
+        self.monitor = PerfMonitor.shared()
+        self.results = {"pages": {}}
+        self._steps = None
+        self._flips = []
+
+    def on_start(self):
+        super().on_start()
+        self._started = time.perf_counter()
+        Window.bind(on_flip=self._on_flip)
+
+    def _on_flip(self, *args):
+        self._flips.append(time.perf_counter())
+
+    def on_startup_finished(self):
+        super().on_startup_finished()
+        self.results["startup_ms"] = round((time.perf_counter() - self._started) * 1000, 1)
+        self._steps = self._visit_pages()
+        self._next_step(0)
+
+    def _next_step(self, dt):
+        try:
+            delay = next(self._steps)
+        except StopIteration:
+            self.stop()
+            return
+        Clock.schedule_once(self._next_step, delay)
+
+    def _visit_pages(self):
+        for name in PAGES:
+            self.navigate_to_page(name)
+            yield self.settle
+
+            gc.collect()
+            rss_start = rss_mb()
+            music = dict(self.pages.built()).get('music')
+            controller = music.bt_controller if music else None
+            injected_start = controller.injected if controller else 0
+            self.counters.reset()
+            self.monitor.reset()
+            self._flips = []
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            yield self.seconds
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+
+            frames = [b - a for a, b in zip(self._flips, self._flips[1:])]
+            gc.collect()
+            self.results["pages"][name] = {
+                "build_ms": round(self.pages.build_times.get(name, 0.0) * 1000, 1),
+                "frames_drawn": len(self._flips),
+                "frame_ms_p50": round(percentile(frames, 0.50) * 1000, 2),
+                "frame_ms_p95": round(percentile(frames, 0.95) * 1000, 2),
+                "frame_ms_p99": round(percentile(frames, 0.99) * 1000, 2),
+                "frame_ms_max": round(max(frames, default=0.0) * 1000, 2),
+                "layout_passes": self.counters.layout_passes,
+                "texture_uploads": self.counters.texture_uploads,
+                "cpu_percent": round(cpu / wall * 100, 2),
+                "rss_mb": round(rss_mb(), 1),
+                "rss_growth_mb": round(rss_mb() - rss_start, 2),
+                "python_objects": len(gc.get_objects()),
+                "state_updates": (controller.injected if controller else 0) - injected_start,
+                "locks": self.monitor.lock_stats(),
+                "top_callbacks": [
+                    {key: stats[key] for key in ("name", "calls", "total_ms", "p95_ms")}
+                    for stats in self.monitor.callback_stats(TOP_CALLBACKS)
+                ],
+            }
+
+
+def find_regressions(results, baseline, tolerance, slacks=REGRESSION_SLACK, section="pages"):
+    """Returns a line per page metric that got worse than the baseline allows."""
+    regressions = []
+    for name, values in results[section].items():
+        before = baseline.get(section, {}).get(name)
+        if not before:
+            continue
+        for metric, slack in slacks.items():
+            if metric not in before:
+                continue
+            allowed = before[metric] * (1 + tolerance) + slack
+            if values[metric] > allowed:
+                regressions.append(f"{name}.{metric}: {values[metric]} > {round(allowed, 2)} "
+                                   f"(baseline {before[metric]})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--settle', type=float, default=1.0,
+                        help="seconds to let a page settle before measuring")
+    parser.add_argument('--seconds', type=float, default=5.0,
+                        help="seconds measured per page")
+    parser.add_argument('--rate', type=float, default=SyntheticController.rate,
+                        help="synthetic device updates per second")
+    parser.add_argument('--json', help="also write results to this file")
+    parser.add_argument('--baseline', help="earlier --json output to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="relative worsening allowed against the baseline")
+    args = parser.parse_args()
+
+    SyntheticController.rate = args.rate
+    MusicPage.controller_class = SyntheticController
+    # Pages start from defaults, not from what this machine has saved
+    os.environ[STATE_DIR_ENV] = tempfile.mkdtemp(prefix='bench-headless-state-')
+
+    app = HeadlessBenchApp(args.settle, args.seconds)
+    app.counters.install()
+    app.run()
+    results = app.results
+
+    print(f"startup: {results.get('startup_ms')} ms")
+    for name, values in results["pages"].items():
+        print(f"{name}:")
+        for key, value in values.items():
+            if key in ("locks", "top_callbacks"):
+                continue
+            print(f"  {key:<18}{value}")
+        for stats in values["top_callbacks"]:
+            print(f"  {stats['name'][-40:]:<42}{stats['calls']:>6} calls {stats['total_ms']:>9} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
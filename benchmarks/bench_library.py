@@ -0,0 +1,108 @@
+"""Page latency of AVRCP library browsing under the mock BlueZ.
+
+Opens the library root, enters the large "All Tracks" folder and scrolls
+through it a page at a time the way LibraryModal asks for pages, pausing
+between pages like a driver flicking through a list. Reports how long each
+page took to become available on the Kivy thread, how many were already
+prefetched, and how many ListItems calls reached the phone.
+
+Usage: python -m benchmarks.bench_library [--library N] [--pages N] [--dwell S] [--json PATH]
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+
+from gi.repository import GLib
+
+from bluetooth.controller import BluetoothController
+from benchmarks.bench_bluetooth import pump, percentile
+from benchmarks.mock_bluez import MockBlueZ
+
+
+def load_page(controller, folder, page, timeout):
+    """ Requests a page like the library view does; returns (ms, was_cached). """
+    start = time.monotonic()
+    cached = controller.library_page(folder, page) is not None
+    GLib.idle_add(controller.browse, folder, page)
+    if not pump(lambda: controller.library_page(folder, page) is not None, timeout):
+        raise RuntimeError(f"page {page} of {folder} never arrived")
+    return (time.monotonic() - start) * 1000, cached
+
+
+def run_scroll(mock, controller, folder, pages, dwell, timeout):
+    latencies = []
+    prefetched = 0
+    mock.control.TakeCommandLog()
+    for page in range(pages):
+        elapsed, cached = load_page(controller, folder, page, timeout)
+        latencies.append(elapsed)
+        prefetched += cached
+        pump(lambda: False, dwell)
+    calls = [name for name, _ in mock.control.TakeCommandLog() if name == 'ListItems']
+    return {
+        "pages": pages,
+        "prefetched": prefetched,
+        "list_calls": len(calls),
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "max_ms": round(max(latencies, default=0.0), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--library', type=int, default=20000)
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--dwell', type=float, default=0.05,
+                        help="seconds spent on each page before scrolling on")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--json', help="also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with MockBlueZ(devices=10, connected=True, library=args.library) as mock, \
+            tempfile.TemporaryDirectory() as state_dir, \
+            contextlib.redirect_stdout(io.StringIO()):
+        controller = BluetoothController(bus_address=mock.address, state_dir=state_dir)
+        controller.start()
+        if not pump(lambda: controller.library_root is not None, args.timeout):
+            raise RuntimeError("controller never found a browsable player")
+
+        root = controller.library_root
+        elapsed, _ = load_page(controller, root, 0, args.timeout)
+        results["root_page_ms"] = round(elapsed, 3)
+
+        folder = next(
+            item["path"] for item in controller.library_page(root, 0)
+            if item["type"] == 'folder'
+        )
+        results["scroll"] = run_scroll(
+            mock, controller, folder, args.pages, args.dwell, args.timeout)
+        results["folder_size"] = controller.library_size(folder)
+
+        # Jumping back to the top is served from the cache
+        results["revisit"] = run_scroll(
+            mock, controller, folder, min(args.pages, 20), 0, args.timeout)
+
+        if controller.mainloop:
+            controller.mainloop.quit()
+
+    print(f"library: {results['folder_size']} tracks  root page: {results['root_page_ms']} ms")
+    for name in ("scroll", "revisit"):
+        print(f"{name}:")
+        for key, value in results[name].items():
+            print(f"  {key:<14}{value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
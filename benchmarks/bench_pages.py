@@ -0,0 +1,96 @@
+"""Boot time and per-page idle CPU of the dashboard app.
+
+Runs the real CarDashboardApp in a window. Reports the time from launch
+until the first frame is on screen, how long each page took to import and
+build on its first visit, and the CPU the whole process uses while each
+page sits idle on screen. Hidden pages should contribute nothing to the
+idle figure.
+
+Usage: python -m benchmarks.bench_pages [--settle S] [--seconds S] [--json PATH]
+"""
+import time
+LAUNCHED = time.perf_counter()
+
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import argparse
+import json
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+from main import CarDashboardApp, PAGES, START_PAGE
+
+
+class BenchApp(CarDashboardApp):
+    """ Dashboard app that visits every page and measures it. """
+    def __init__(self, settle, seconds, **kwargs):
+        super().__init__(**kwargs)
+        self.settle = settle
+        self.seconds = seconds
+        self.results = {"pages": {}}
+        self._steps = None
+
+    def on_start(self):
+        super().on_start()
+        Window.bind(on_flip=self._first_frame)
+
+    def _first_frame(self, *args):
+        Window.unbind(on_flip=self._first_frame)
+        self.results["boot_to_first_frame_ms"] = round((time.perf_counter() - LAUNCHED) * 1000, 1)
+        self._steps = self._visit_pages()
+        self._next_step(0)
+
+    def _next_step(self, dt):
+        try:
+            delay = next(self._steps)
+        except StopIteration:
+            self.stop()
+            return
+        Clock.schedule_once(self._next_step, delay)
+
+    def _visit_pages(self):
+        # Start page last as well, to see it again after being hidden
+        for name in [page for page in PAGES if page != START_PAGE] + [START_PAGE]:
+            self.navigate_to_page(name)
+            yield self.settle
+
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            yield self.seconds
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+
+            self.results["pages"][name] = {
+                "build_ms": round(self.pages.build_times.get(name, 0.0) * 1000, 1),
+                "idle_cpu_percent": round(cpu / wall * 100, 2),
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--settle', type=float, default=1.0,
+                        help="seconds to let a page settle before measuring")
+    parser.add_argument('--seconds', type=float, default=5.0,
+                        help="seconds of idle CPU measured per page")
+    parser.add_argument('--json', help="also write results to this file")
+    args = parser.parse_args()
+
+    app = BenchApp(args.settle, args.seconds)
+    app.run()
+    results = app.results
+
+    print(f"boot to first frame: {results['boot_to_first_frame_ms']} ms")
+    for name, values in results["pages"].items():
+        print(f"{name}:")
+        for key, value in values.items():
+            print(f"  {key:<18}{value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
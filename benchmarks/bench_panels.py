@@ -0,0 +1,133 @@
+"""Canvas instructions and layout cost of device rows, per-widget vs batched.
+
+Builds a column of DeviceRow widgets twice: once drawing each row's and
+each button's background with its own Color and RoundedRectangle (how
+rows were drawn before PanelBatch), and once with every panel in one
+shared PanelBatch. Reports the canvas instructions and vertex
+instructions (draw calls) in the column, the time for a layout pass after
+a resize, and the time to render the column into an offscreen buffer.
+
+Needs a GL context but no visible window.
+
+Usage: python -m benchmarks.bench_panels [--rows N] [--passes N] [--json PATH]
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import argparse
+import json
+import time
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Fbo, RoundedRectangle
+from kivy.graphics.instructions import VertexInstruction
+from kivy.uix.boxlayout import BoxLayout
+
+from pages.music_page import DeviceRow
+from ui.panel_batch import PanelBatch
+from ui.perf_monitor import percentile
+from ui.theme import Theme
+
+WIDTHS = (600, 640)  # the column alternates between these on each pass
+
+
+class LegacyRow(DeviceRow):
+    """ DeviceRow drawing its panels the way rows did before PanelBatch. """
+    def join_batch(self, panel_batch):
+        self.panel_batch = panel_batch
+        self.action_button.panel_batch.remove(self.action_button)
+        for widget, color, radius in ((self, Theme.BACKGROUND_COLOR, 6),
+                                      (self.action_button, Theme.SIDEBAR_COLOR, 8)):
+            with widget.canvas.before:
+                Color(*color)
+                rect = RoundedRectangle(pos=widget.pos, size=widget.size, radius=[radius])
+            widget.bind(pos=lambda w, value, rect=rect: setattr(rect, 'pos', value),
+                        size=lambda w, value, rect=rect: setattr(rect, 'size', value))
+
+
+def count_instructions(canvas):
+    total = vertex = 0
+    for instruction in canvas.children:
+        total += 1
+        if isinstance(instruction, VertexInstruction):
+            vertex += 1
+        children = getattr(instruction, 'children', None)
+        if children is not None:
+            sub_total, sub_vertex = count_instructions(instruction)
+            total += sub_total
+            vertex += sub_vertex
+    return total, vertex
+
+
+def build_column(row_class, rows):
+    column = BoxLayout(orientation='vertical', size=(WIDTHS[0], rows * Theme.LIST_ITEM_HEIGHT),
+                       size_hint=(None, None), spacing=Theme.SPACING_SMALL)
+    batch = PanelBatch(column)
+    for index in range(rows):
+        row = row_class()
+        row.join_batch(batch)
+        row.view.update({'name': f"Device {index}", 'status': "Available",
+                         'status_role': 'secondary', 'action': "Pair"})
+        column.add_widget(row)
+    Clock.tick()
+    return column
+
+
+def measure(row_class, rows, passes):
+    start = time.perf_counter()
+    column = build_column(row_class, rows)
+    build = time.perf_counter() - start
+
+    fbo = Fbo(size=(max(WIDTHS), int(column.height)))
+    fbo.add(column.canvas)
+
+    layouts = []
+    draws = []
+    for index in range(passes):
+        start = time.perf_counter()
+        column.width = WIDTHS[(index + 1) % len(WIDTHS)]
+        Clock.tick()  # layout, then the batch's rebuild, both run as triggers
+        layouts.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        fbo.draw()
+        draws.append(time.perf_counter() - start)
+
+    total, vertex = count_instructions(column.canvas)
+    return {
+        "instructions": total,
+        "vertex_instructions": vertex,
+        "build_ms": round(build * 1000, 2),
+        "layout_ms_p50": round(percentile(layouts, 0.50) * 1000, 3),
+        "layout_ms_p95": round(percentile(layouts, 0.95) * 1000, 3),
+        "draw_ms_p50": round(percentile(draws, 0.50) * 1000, 3),
+        "draw_ms_p95": round(percentile(draws, 0.95) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50, help="device rows in the column")
+    parser.add_argument('--passes', type=int, default=200, help="resize/layout passes measured")
+    parser.add_argument('--json', help="also write results to this file")
+    args = parser.parse_args()
+
+    results = {
+        "rows": args.rows,
+        "per_widget": measure(LegacyRow, args.rows, args.passes),
+        "batched": measure(DeviceRow, args.rows, args.passes),
+    }
+
+    print(f"rows: {args.rows}")
+    for name in ("per_widget", "batched"):
+        print(f"{name}:")
+        for key, value in results[name].items():
+            print(f"  {key:<20}{value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""Per-command latency of BluetoothController with and without the proxy cache.
+
+The controller runs against an in-process mocked BlueZ bus. Like dbus-python,
+a freshly created proxy pays one Introspect round trip on its first call, and
+every method call pays one regular round trip. The uncached run drops all
+proxies before each command, which is what the controller did before the
+cache existed.
+
+Usage: python -m benchmarks.bench_proxy_cache [--iterations N] [--round-trip-ms MS]
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+
+from bluetooth.controller import (
+    BluetoothController, DEVICE_INTERFACE, MEDIA_PLAYER_INTERFACE,
+)
+
+DEVICE_PATH = '/org/bluez/hci0/dev_00_11_22_33_44_55'
+PLAYER_PATH = DEVICE_PATH + '/player0'
+
+
+class MockProxy:
+    """ Stands in for dbus.proxies.ProxyObject on the mocked bus. """
+    def __init__(self, bus, path):
+        self.bus = bus
+        self.object_path = path
+        self.introspected = False
+
+    def get_dbus_method(self, member, dbus_interface=None):
+        def method(*args, reply_handler=None, error_handler=None, timeout=None):
+            if not self.introspected:
+                self.bus.round_trip()
+                self.introspected = True
+            self.bus.round_trip()
+            result = self.bus.handle(self.object_path, dbus_interface, member, args)
+            if reply_handler:
+                reply_handler()
+                return None
+            return result
+        return method
+
+
+class MockBus:
+    """ Minimal BlueZ stand-in with one paired device and its media player. """
+    def __init__(self, round_trip_ms):
+        self.round_trip_s = round_trip_ms / 1000
+        self.proxies_created = 0
+
+    def round_trip(self):
+        # Busy-wait: sleep() granularity is too coarse for sub-ms round trips
+        end = time.perf_counter() + self.round_trip_s
+        while time.perf_counter() < end:
+            pass
+
+    def get_object(self, service, path):
+        self.proxies_created += 1
+        return MockProxy(self, path)
+
+    def handle(self, path, interface, member, args):
+        if member == 'GetAll' and args[0] == MEDIA_PLAYER_INTERFACE:
+            return {
+                'Status': 'playing',
+                'Position': 0,
+                'Track': {'Title': 'Title', 'Artist': 'Artist', 'Album': 'Album',
+                          'Duration': 180000},
+            }
+        return None
+
+
+def make_controller(bus):
+    controller = BluetoothController()
+    controller.bus = bus
+    controller._objects = {DEVICE_PATH: {DEVICE_INTERFACE: {'Paired': True}}}
+    return controller
+
+
+def connect_to_player(controller):
+    # Forget the mirrored player so every run takes the GetAll path
+    controller._objects.pop(PLAYER_PATH, None)
+    controller.connect_to_player(PLAYER_PATH)
+
+
+COMMANDS = {
+    'connect_to_player': connect_to_player,
+    'pair_and_connect_device': lambda c: c.pair_and_connect_device(DEVICE_PATH),
+    'disconnect_device': lambda c: c.disconnect_device(DEVICE_PATH),
+}
+
+
+def measure(command, cached, iterations, round_trip_ms):
+    bus = MockBus(round_trip_ms)
+    controller = make_controller(bus)
+    samples = []
+    # Keep controller logging out of the timings
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(iterations):
+            if not cached:
+                controller.invalidate_proxies()
+            start = time.perf_counter()
+            command(controller)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), bus.proxies_created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--round-trip-ms', type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(f"{'command':<26}{'uncached ms':>13}{'cached ms':>11}{'speedup':>9}{'proxies':>13}")
+    for name, command in COMMANDS.items():
+        uncached, uncached_proxies = measure(command, False, args.iterations, args.round_trip_ms)
+        cached, cached_proxies = measure(command, True, args.iterations, args.round_trip_ms)
+        print(f"{name:<26}{uncached:>13.3f}{cached:>11.3f}{uncached / cached:>8.1f}x"
+              f"{uncached_proxies:>6} -> {cached_proxies}")
+
+
+if __name__ == '__main__':
+    main()
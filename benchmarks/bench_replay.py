@@ -0,0 +1,206 @@
+"""Input-to-frame latency of recorded touch sessions, replayed headless.
+
+Boots the dashboard the way bench_headless does (offscreen window,
+synthetic phone on the music page), goes to the page the session was
+recorded from and plays each session through a TouchReplay input
+provider. Taps press the real SidebarButton, TempControl and DeviceRow
+buttons, and drags scroll the real lists. For every replayed event it
+measures the time from when the touch was due to the buffer flip that
+shows its result. It also counts frames dropped while the UI is
+responding, meaning frame intervals over the frame budget within
+ACTIVE_SECONDS of a touch.
+
+Record sessions on the car with MINI_MATT_RECORD_TOUCHES=1 python main.py
+(saved to ~/.config/mini-matt/touches_<time>.json on exit). With no
+session given, the ones in benchmarks/sessions are replayed.
+
+Usage: python -m benchmarks.bench_replay [SESSION ...] [--settle S] [--speed F]
+       [--json PATH] [--baseline PATH] [--tolerance F]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_headless import SyntheticController, find_regressions
+from kivy.clock import Clock
+from kivy.config import Config
+from kivy.core.window import Window
+
+from main import CarDashboardApp, START_PAGE
+from pages.music_page import MusicPage
+from state_store import STATE_DIR_ENV
+from ui.perf_monitor import PerfMonitor, percentile
+from ui.touch_recorder import load_session
+from ui.touch_replay import TouchReplay
+
+SESSION_DIR = os.path.join(os.path.dirname(__file__), 'sessions')
+ACTIVE_SECONDS = 0.5  # after a touch, animations and scrolling are still its response
+TOP_CALLBACKS = 5
+
+# Metrics checked by --baseline, with absolute slack on top of --tolerance
+REGRESSION_SLACK = {
+    "latency_ms_p95": 5.0,
+    "latency_ms_max": 20.0,
+    "dropped_frames": 3,
+}
+
+
+class ReplayBenchApp(CarDashboardApp):
+    """ Dashboard app that replays each session in turn once startup has finished. """
+    def __init__(self, sessions, settle, speed, **kwargs):
+        super().__init__(**kwargs)
+        self.sessions = sessions  # [(name, session)]
+        self.settle = settle
+        self.speed = speed
+        self.monitor = PerfMonitor.shared()
+        self.results = {"sessions": {}}
+        self.budget = 1 / (Config.getint('graphics', 'maxfps') or 60)
+        self._replay = None
+        self._flips = []
+        self._latencies = []
+        self._answered = 0
+        self._poll = None
+
+    def on_start(self):
+        super().on_start()
+        Window.bind(on_flip=self._on_flip)
+
+    def on_startup_finished(self):
+        super().on_startup_finished()
+        self._next_session()
+
+    def _next_session(self, *args):
+        if not self.sessions:
+            self.stop()
+            return
+        name, session = self.sessions.pop(0)
+        self.navigate_to_page(session.get('page') or START_PAGE)
+        Clock.schedule_once(lambda dt: self._play(name, session), self.settle)
+
+    def _play(self, name, session):
+        self._flips = []
+        self._latencies = []
+        self._answered = 0
+        self.monitor.reset()
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        self._replay = TouchReplay(session, speed=self.speed)
+        self._replay.play()
+        self._poll = Clock.schedule_interval(lambda dt: self._check_done(name), 0.1)
+
+    def _on_flip(self, *args):
+        now = time.perf_counter()
+        self._flips.append(now)
+        if self._replay is None:
+            return
+        # Every event dispatched since the last flip is answered by this one
+        dispatched = self._replay.dispatched
+        for kind, due, _ in dispatched[self._answered:]:
+            self._latencies.append((kind, now - due))
+        self._answered = len(dispatched)
+
+    def _check_done(self, name):
+        replay = self._replay
+        if not replay.finished or not replay.dispatched:
+            return
+        if time.perf_counter() - replay.dispatched[-1][1] < ACTIVE_SECONDS:
+            return
+        self._poll.cancel()
+        replay.stop()
+        self.results["sessions"][name] = self._summarize(replay)
+        self._replay = None
+        self._next_session()
+
+    def _summarize(self, replay):
+        cpu = time.process_time() - self._cpu_start
+        wall = time.perf_counter() - self._wall_start
+        latencies = [seconds for _, seconds in self._latencies]
+        taps = [seconds for kind, seconds in self._latencies if kind != 'update']
+        drags = [seconds for kind, seconds in self._latencies if kind == 'update']
+        touch_times = [due for _, due, _ in replay.dispatched]
+
+        # Frames missed while a touch was still being answered
+        dropped = 0
+        touch = 0
+        for start, end in zip(self._flips, self._flips[1:]):
+            while touch < len(touch_times) - 1 and touch_times[touch + 1] <= start:
+                touch += 1
+            if touch_times and touch_times[touch] <= start < touch_times[touch] + ACTIVE_SECONDS:
+                dropped += max(0, round((end - start) / self.budget) - 1)
+
+        return {
+            "events": len(replay.dispatched),
+            "unanswered": len(replay.dispatched) - self._answered,
+            "latency_ms_p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "latency_ms_p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "latency_ms_p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "latency_ms_max": round(max(latencies, default=0.0) * 1000, 2),
+            "tap_latency_ms_p95": round(percentile(taps, 0.95) * 1000, 2),
+            "drag_latency_ms_p95": round(percentile(drags, 0.95) * 1000, 2),
+            "dispatch_lag_ms_max": round(max((sent - due for _, due, sent in replay.dispatched),
+                                             default=0.0) * 1000, 2),
+            "frames_drawn": len(self._flips),
+            "dropped_frames": dropped,
+            "cpu_percent": round(cpu / wall * 100, 2),
+            "top_callbacks": [
+                {key: stats[key] for key in ("name", "calls", "total_ms", "p95_ms")}
+                for stats in self.monitor.callback_stats(TOP_CALLBACKS)
+            ],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sessions', nargs='*',
+                        help="recorded sessions (default: benchmarks/sessions/*.json)")
+    parser.add_argument('--settle', type=float, default=1.0,
+                        help="seconds to let the start page settle before replaying")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="replay speed; 2 plays the touches twice as fast")
+    parser.add_argument('--json', help="also write results to this file")
+    parser.add_argument('--baseline', help="earlier --json output to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="relative worsening allowed against the baseline")
+    args = parser.parse_args()
+
+    paths = args.sessions or sorted(glob.glob(os.path.join(SESSION_DIR, '*.json')))
+    if not paths:
+        parser.error("no sessions to replay")
+    sessions = [(os.path.splitext(os.path.basename(path))[0], load_session(path)) for path in paths]
+
+    MusicPage.controller_class = SyntheticController
+    # Sessions were recorded against the default settings and setpoints
+    os.environ[STATE_DIR_ENV] = tempfile.mkdtemp(prefix='bench-replay-state-')
+
+    app = ReplayBenchApp(sessions, args.settle, args.speed)
+    app.run()
+    results = app.results
+
+    for name, values in results["sessions"].items():
+        print(f"{name}:")
+        for key, value in values.items():
+            if key != "top_callbacks":
+                print(f"  {key:<22}{value}")
+        for stats in values["top_callbacks"]:
+            print(f"  {stats['name'][-40:]:<42}{stats['calls']:>6} calls {stats['total_ms']:>9} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance,
+                                           REGRESSION_SLACK, section="sessions")
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
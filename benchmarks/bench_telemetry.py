@@ -0,0 +1,133 @@
+"""Telemetry decode and query throughput, vectorized vs per frame.
+
+Builds a DBC with a mix of Intel and Motorola, signed and unsigned
+signals, and a batch of random frames for it. The batch is decoded once
+with BatchDecoder and once the way a per-frame decoder works (one Python
+loop iteration per frame and signal), and the two results are checked
+against each other. It then times storing the samples in the ring
+buffers and the readers' queries. No CAN hardware or python-can needed.
+
+Usage: python -m benchmarks.bench_telemetry [--frames N] [--messages N] [--batch N]
+       [--json PATH]
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from telemetry.dbc import parse_dbc
+from telemetry.store import TelemetryStore
+from ui.perf_monitor import percentile
+
+SIGNAL_LAYOUTS = (
+    # start|length@order sign, (factor, offset)
+    ("0|16@1+", "(0.25,0)"),  # Intel unsigned
+    ("16|12@1-", "(0.1,-40)"),  # Intel signed
+    ("39|16@0+", "(0.125,0)"),  # Motorola unsigned
+    ("55|8@0-", "(1,0)"),  # Motorola signed
+    ("28|1@1+", "(1,0)"),  # single-bit flag
+)
+
+
+def build_dbc(messages):
+    lines = ['VERSION ""', '']
+    for index in range(messages):
+        lines.append(f"BO_ {0x100 + index} Message{index}: 8 ECU")
+        for number, (layout, scaling) in enumerate(SIGNAL_LAYOUTS):
+            lines.append(f' SG_ Signal{index}_{number} : {layout} {scaling} [0|0] "" Vector__XXX')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def decode_per_frame(messages, timestamps, ids, data):
+    """ The straightforward decoder: Python integer work per frame and signal. """
+    decoded = {}
+    for timestamp, frame_id, payload in zip(timestamps.tolist(), ids.tolist(), data.tolist()):
+        message = messages.get(frame_id)
+        if message is None:
+            continue
+        little = int.from_bytes(bytes(payload), 'little')
+        big = int.from_bytes(bytes(payload), 'big')
+        for signal in message.signals:
+            if signal.little_endian:
+                raw = (little >> signal.start) & ((1 << signal.length) - 1)
+            else:
+                msb = (signal.start // 8) * 8 + (7 - signal.start % 8)
+                raw = (big >> (64 - msb - signal.length)) & ((1 << signal.length) - 1)
+            if signal.signed and raw >= 1 << (signal.length - 1):
+                raw -= 1 << signal.length
+            times, values = decoded.setdefault(signal.name, ([], []))
+            times.append(timestamp)
+            values.append(raw * signal.factor + signal.offset)
+    return decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200000, help="frames decoded")
+    parser.add_argument('--messages', type=int, default=40, help="message ids in the DBC")
+    parser.add_argument('--batch', type=int, default=4096, help="frames per ingested batch")
+    parser.add_argument('--json', help="also write results to this file")
+    args = parser.parse_args()
+
+    messages = parse_dbc(build_dbc(args.messages))
+    rng = np.random.default_rng(1)
+    ids = (0x100 + rng.integers(0, args.messages + 4, args.frames)).astype(np.uint32)  # some unknown
+    data = rng.integers(0, 256, (args.frames, 8), dtype=np.uint8)
+    timestamps = time.time() - 10 + np.linspace(0, 10, args.frames)
+
+    store = TelemetryStore(messages)
+    start = time.perf_counter()
+    vectorized = store.decoder.decode(timestamps, ids, data)
+    vectorized_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = decode_per_frame(messages, timestamps, ids, data)
+    per_frame_s = time.perf_counter() - start
+
+    mismatches = [name for name, (_, values) in reference.items()
+                  if not np.allclose(vectorized[name][1], values)]
+
+    batch_times = []
+    for offset in range(0, args.frames, args.batch):
+        rows = slice(offset, offset + args.batch)
+        start = time.perf_counter()
+        store.ingest(timestamps[rows], ids[rows], data[rows])
+        batch_times.append(time.perf_counter() - start)
+
+    names = store.signal_names
+    queries = {}
+    for label, query in (("latest", lambda name: store.latest(name)),
+                         ("window_1s", lambda name: store.window(name, seconds=1.0)),
+                         ("stats_5s", lambda name: store.stats(name, 5.0))):
+        start = time.perf_counter()
+        for name in names:
+            query(name)
+        queries[f"{label}_us"] = round((time.perf_counter() - start) / len(names) * 1e6, 2)
+
+    results = {
+        "frames": args.frames,
+        "signals": len(names),
+        "mismatched_signals": mismatches,
+        "vectorized_frames_per_s": round(args.frames / vectorized_s),
+        "per_frame_frames_per_s": round(args.frames / per_frame_s),
+        "speedup": round(per_frame_s / vectorized_s, 1),
+        "ingest_batch_ms_p50": round(percentile(batch_times, 0.50) * 1000, 3),
+        "ingest_batch_ms_p95": round(percentile(batch_times, 0.95) * 1000, 3),
+        "ingest_frames_per_s": round(args.frames / sum(batch_times)),
+        **queries,
+    }
+    for key, value in results.items():
+        print(f"{key:<28}{value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Tap-to-audible-change latency of the transport controls under the mock BlueZ.
+
+A tap is simulated the way MusicPage sends one: player_command queued onto
+the D-Bus thread with GLib.idle_add. For each tap the benchmark records when
+the mock phone received the command (the audible change) and when the
+controller published the confirmed state back to the Kivy thread. A burst
+of Next taps shows how many commands actually reach the phone.
+
+Usage: python -m benchmarks.bench_transport [--taps N] [--burst N] [--json PATH]
+"""
+import os
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+
+from gi.repository import GLib
+
+from bluetooth.controller import BluetoothController
+from benchmarks.bench_bluetooth import pump, percentile
+from benchmarks.mock_bluez import MockBlueZ
+
+
+def tap(controller, command):
+    start = time.monotonic()
+    GLib.idle_add(controller.player_command, command)
+    return start
+
+
+def run_play_pause(mock, controller, taps, timeout):
+    audible, confirmed = [], []
+    mock.control.TakeCommandLog()
+    for i in range(taps):
+        command, status = ('Pause', 'paused') if i % 2 == 0 else ('Play', 'playing')
+        start = tap(controller, command)
+        if not pump(lambda: controller.playback['status'] == status, timeout):
+            continue
+        confirmed.append((time.monotonic() - start) * 1000)
+        for name, received in mock.control.TakeCommandLog():
+            if name == command:
+                audible.append((float(received) - start) * 1000)
+    return {
+        "taps": taps,
+        "audible_p50_ms": round(percentile(audible, 0.5), 3),
+        "audible_p95_ms": round(percentile(audible, 0.95), 3),
+        "confirmed_p50_ms": round(percentile(confirmed, 0.5), 3),
+        "confirmed_p95_ms": round(percentile(confirmed, 0.95), 3),
+    }
+
+
+def run_next_burst(mock, controller, burst, interval, settle):
+    mock.control.TakeCommandLog()
+    for _ in range(burst):
+        tap(controller, 'Next')
+        pump(lambda: False, interval)
+    pump(lambda: False, settle)
+    sent = [name for name, _ in mock.control.TakeCommandLog() if name == 'Next']
+    return {"taps": burst, "interval_s": interval, "commands_received": len(sent)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--taps', type=int, default=40)
+    parser.add_argument('--burst', type=int, default=5)
+    parser.add_argument('--burst-interval', type=float, default=0.05)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--json', help="also write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    with MockBlueZ(devices=10, connected=True) as mock, \
+            tempfile.TemporaryDirectory() as state_dir, \
+            contextlib.redirect_stdout(io.StringIO()):
+        controller = BluetoothController(bus_address=mock.address, state_dir=state_dir)
+        controller.start()
+        if not pump(lambda: 'first_metadata' in controller.metrics, args.timeout):
+            raise RuntimeError("controller never attached to the mock player")
+
+        results["play_pause"] = run_play_pause(mock, controller, args.taps, args.timeout)
+        results["next_burst"] = run_next_burst(
+            mock, controller, args.burst, args.burst_interval, settle=1.0)
+
+        if controller.mainloop:
+            controller.mainloop.quit()
+
+    for name, values in results.items():
+        print(f"{name}:")
+        for key, value in values.items():
+            print(f"  {key:<20}{value}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,547 @@
+"""Fake org.bluez service on a private D-Bus bus.
+
+Exports adapters, devices and a media player with the same object paths,
+interfaces and signals BluetoothController uses, plus a control interface
+(org.minimatt.MockBlueZ1 on '/') that benchmarks call to trigger signal
+storms, track changes and phone connects.
+
+The service runs in its own process so it does not compete with the
+controller for the GIL. Use MockBlueZ as a context manager:
+
+    with MockBlueZ(devices=300) as mock:
+        controller = BluetoothController(bus_address=mock.address)
+
+Or run it by hand: python -m benchmarks.mock_bluez --address ADDRESS
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+import dbus
+import dbus.bus
+import dbus.mainloop.glib
+import dbus.service
+from gi.repository import GLib
+
+from bluetooth.controller import (
+    BLUEZ_SERVICE, ADAPTER_INTERFACE, DEVICE_INTERFACE, MEDIA_PLAYER_INTERFACE,
+    MEDIA_FOLDER_INTERFACE,
+    DBUS_PROPERTIES_INTERFACE, DBUS_OBJECT_MANAGER_INTERFACE,
+    AUDIO_SOURCE_UUID, AVRCP_TARGET_UUID,
+)
+
+MOCK_CONTROL_INTERFACE = 'org.minimatt.MockBlueZ1'
+PHONE_ADDRESS = '00:11:22:33:44:55'
+CALL_LATENCY_MS = 20  # simulated radio time for Pair/Connect/Disconnect and browsing
+LIBRARY_TRACKS = 20000  # tracks in the phone's "All Tracks" folder
+FAVOURITE_TRACKS = 25
+
+
+def device_path(adapter_path, address):
+    return f"{adapter_path}/dev_{address.replace(':', '_')}"
+
+
+class MockObject(dbus.service.Object):
+    """ A BlueZ object with per-interface properties and PropertiesChanged. """
+    def __init__(self, service, path, props):
+        super().__init__(service.bus_name, path)
+        self.service = service
+        self.path = path
+        self.props = props  # {interface: dbus.Dictionary}
+
+    @dbus.service.method(DBUS_PROPERTIES_INTERFACE, in_signature='ss', out_signature='v')
+    def Get(self, interface, name):
+        return self.props[interface][name]
+
+    @dbus.service.method(DBUS_PROPERTIES_INTERFACE, in_signature='s', out_signature='a{sv}')
+    def GetAll(self, interface):
+        return self.props.get(interface, {})
+
+    @dbus.service.method(DBUS_PROPERTIES_INTERFACE, in_signature='ssv')
+    def Set(self, interface, name, value):
+        self.set_properties(interface, **{name: value})
+
+    @dbus.service.signal(DBUS_PROPERTIES_INTERFACE, signature='sa{sv}as')
+    def PropertiesChanged(self, interface, changed, invalidated):
+        pass
+
+    def _later(self, callback):
+        """ Runs callback after the simulated radio latency. """
+        def run():
+            callback()
+            return False
+        GLib.timeout_add(self.service.call_latency_ms, run)
+
+    def set_properties(self, interface, **changed):
+        self.props[interface].update(changed)
+        self.PropertiesChanged(
+            interface,
+            dbus.Dictionary(changed, signature='sv'),
+            dbus.Array([], signature='s')
+        )
+
+
+class MockAdapter(MockObject):
+    def __init__(self, service, path, index):
+        super().__init__(service, path, {
+            ADAPTER_INTERFACE: dbus.Dictionary({
+                'Address': f'AA:AA:AA:AA:AA:{index:02X}',
+                'Powered': True,
+                'Discoverable': False,
+                'DiscoverableTimeout': dbus.UInt32(180),
+                'Discovering': False,
+            }, signature='sv'),
+        })
+        self.discovery_filter = {}
+
+    @dbus.service.method(ADAPTER_INTERFACE)
+    def StartDiscovery(self):
+        self.set_properties(ADAPTER_INTERFACE, Discovering=True)
+
+    @dbus.service.method(ADAPTER_INTERFACE)
+    def StopDiscovery(self):
+        self.set_properties(ADAPTER_INTERFACE, Discovering=False)
+
+    @dbus.service.method(ADAPTER_INTERFACE, in_signature='a{sv}')
+    def SetDiscoveryFilter(self, discovery_filter):
+        self.discovery_filter = dict(discovery_filter)
+
+    @dbus.service.method(ADAPTER_INTERFACE, in_signature='o')
+    def RemoveDevice(self, path):
+        self.service.remove_device(str(path))
+
+
+class MockDevice(MockObject):
+    def __init__(self, service, adapter_path, address, name, paired=False, rssi=-70, audio=False):
+        uuids = [AUDIO_SOURCE_UUID, AVRCP_TARGET_UUID] if audio else []
+        super().__init__(service, device_path(adapter_path, address), {
+            DEVICE_INTERFACE: dbus.Dictionary({
+                'Address': address,
+                'Name': name,
+                'Adapter': dbus.ObjectPath(adapter_path),
+                'Paired': paired,
+                'Trusted': paired,
+                'Connected': False,
+                'RSSI': dbus.Int16(rssi),
+                'UUIDs': dbus.Array(uuids, signature='s'),
+            }, signature='sv'),
+        })
+        self.player = None
+
+    @dbus.service.method(DEVICE_INTERFACE, async_callbacks=('reply', 'error'))
+    def Pair(self, reply, error):
+        if self.props[DEVICE_INTERFACE]['Paired']:
+            error(dbus.DBusException('Already paired', name='org.bluez.Error.AlreadyExists'))
+            return
+
+        def done():
+            self.set_properties(DEVICE_INTERFACE, Paired=True, Trusted=True)
+            reply()
+        self._later(done)
+
+    @dbus.service.method(DEVICE_INTERFACE)
+    def CancelPairing(self):
+        pass
+
+    @dbus.service.method(DEVICE_INTERFACE, async_callbacks=('reply', 'error'))
+    def Connect(self, reply, error):
+        if self.props[DEVICE_INTERFACE]['Connected']:
+            error(dbus.DBusException('Already connected', name='org.bluez.Error.AlreadyConnected'))
+            return
+
+        def done():
+            self.connect()
+            reply()
+        self._later(done)
+
+    @dbus.service.method(DEVICE_INTERFACE, async_callbacks=('reply', 'error'))
+    def Disconnect(self, reply, error):
+        def done():
+            self.disconnect()
+            reply()
+        self._later(done)
+
+    def connect(self):
+        """ Simulates the phone link coming up, including its AVRCP player. """
+        self.set_properties(DEVICE_INTERFACE, Connected=True)
+        if self.player is None:
+            self.player = MockPlayer(self.service, self.path + '/player0', self.path)
+            self.service.add_object(self.player)
+
+    def disconnect(self):
+        if self.player is not None:
+            self.service.remove_object(self.player)
+            self.player = None
+        self.set_properties(DEVICE_INTERFACE, Connected=False)
+
+
+class MockPlayer(MockObject):
+    def __init__(self, service, path, device):
+        super().__init__(service, path, {
+            MEDIA_PLAYER_INTERFACE: dbus.Dictionary({
+                'Name': 'Music',
+                'Device': dbus.ObjectPath(device),
+                'Status': 'playing',
+                'Position': dbus.UInt32(0),
+                'Track': self.track('Mock Track'),
+                'Browsable': True,
+            }, signature='sv'),
+            MEDIA_FOLDER_INTERFACE: dbus.Dictionary({
+                'Name': 'Filesystem',
+                'NumberOfItems': dbus.UInt32(2),
+            }, signature='sv'),
+        })
+        # Root folder with "All Tracks" and "Favourites" below it
+        root = path + '/Filesystem'
+        self.folders = {
+            root: ('Filesystem', None),
+            root + '/item1': ('All Tracks', service.library_tracks),
+            root + '/item2': ('Favourites', FAVOURITE_TRACKS),
+        }
+        self.folder = root
+
+    @staticmethod
+    def track(title, duration=180000):
+        return dbus.Dictionary({
+            'Title': title,
+            'Artist': 'Mock Artist',
+            'Album': 'Mock Album',
+            'Duration': dbus.UInt32(duration),
+        }, signature='sv')
+
+    def _set_status(self, status):
+        self.set_properties(MEDIA_PLAYER_INTERFACE, Status=status)
+
+    def _log(self, command):
+        # The phone acting on a command is where the driver hears the change
+        self.service.command_log.append((command, time.monotonic()))
+
+    @dbus.service.method(MEDIA_PLAYER_INTERFACE)
+    def Play(self):
+        self._log('Play')
+        self._set_status('playing')
+
+    @dbus.service.method(MEDIA_PLAYER_INTERFACE)
+    def Pause(self):
+        self._log('Pause')
+        self._set_status('paused')
+
+    @dbus.service.method(MEDIA_PLAYER_INTERFACE)
+    def Stop(self):
+        self._log('Stop')
+        self._set_status('stopped')
+
+    @dbus.service.method(MEDIA_PLAYER_INTERFACE)
+    def Next(self):
+        self._log('Next')
+        self.service.track_number += 1
+        self.set_properties(
+            MEDIA_PLAYER_INTERFACE,
+            Track=self.track(f'Track {self.service.track_number}'),
+            Position=dbus.UInt32(0)
+        )
+
+    def _folder_size(self, folder):
+        name, tracks = self.folders[folder]
+        return len(self.folders) - 1 if tracks is None else tracks
+
+    def _item(self, folder, index):
+        item_path = f'{folder}/item{index + 1}'
+        if item_path in self.folders:
+            return item_path, dbus.Dictionary({
+                'Player': dbus.ObjectPath(self.path),
+                'Name': self.folders[item_path][0],
+                'Type': 'folder',
+                'FolderType': 'titles',
+                'Playable': False,
+            }, signature='sv')
+        title = f'Song {index + 1:05d}'
+        return item_path, dbus.Dictionary({
+            'Player': dbus.ObjectPath(self.path),
+            'Name': title,
+            'Type': 'audio',
+            'Playable': True,
+            'Metadata': dbus.Dictionary({
+                'Title': title,
+                'Artist': f'Artist {index % 97}',
+                'Duration': dbus.UInt32(180000 + index % 120 * 1000),
+            }, signature='sv'),
+        }, signature='sv')
+
+    @dbus.service.method(MEDIA_FOLDER_INTERFACE, in_signature='o',
+                         async_callbacks=('reply', 'error'))
+    def ChangeFolder(self, folder, reply, error):
+        folder = str(folder)
+        if folder not in self.folders:
+            error(dbus.DBusException('No such folder', name='org.bluez.Error.InvalidArguments'))
+            return
+
+        def done():
+            # Like BlueZ, NumberOfItems is signalled before the reply
+            self.folder = folder
+            self.set_properties(
+                MEDIA_FOLDER_INTERFACE,
+                Name=self.folders[folder][0],
+                NumberOfItems=dbus.UInt32(self._folder_size(folder))
+            )
+            reply()
+        self._later(done)
+
+    @dbus.service.method(MEDIA_FOLDER_INTERFACE, in_signature='a{sv}', out_signature='a{oa{sv}}',
+                         async_callbacks=('reply', 'error'))
+    def ListItems(self, item_filter, reply, error):
+        self._log('ListItems')
+        size = self._folder_size(self.folder)
+        start = int(item_filter.get('Start', 0))
+        end = min(int(item_filter.get('End', size - 1)), size - 1)
+        items = dbus.Dictionary(
+            dict(self._item(self.folder, index) for index in range(start, end + 1)),
+            signature='oa{sv}'
+        )
+        self._later(lambda: reply(items))
+
+    @dbus.service.method(MEDIA_PLAYER_INTERFACE)
+    def Previous(self):
+        self._log('Previous')
+        self.service.track_number = max(0, self.service.track_number - 1)
+        self.set_properties(
+            MEDIA_PLAYER_INTERFACE,
+            Track=self.track(f'Track {self.service.track_number}'),
+            Position=dbus.UInt32(0)
+        )
+
+
+class MockRoot(dbus.service.Object):
+    """ ObjectManager at '/' plus the benchmark control interface. """
+    def __init__(self, service):
+        super().__init__(service.bus_name, '/')
+        self.service = service
+
+    @dbus.service.method(DBUS_OBJECT_MANAGER_INTERFACE, out_signature='a{oa{sa{sv}}}')
+    def GetManagedObjects(self):
+        return {path: obj.props for path, obj in self.service.objects.items()}
+
+    @dbus.service.signal(DBUS_OBJECT_MANAGER_INTERFACE, signature='oa{sa{sv}}')
+    def InterfacesAdded(self, path, interfaces):
+        pass
+
+    @dbus.service.signal(DBUS_OBJECT_MANAGER_INTERFACE, signature='oas')
+    def InterfacesRemoved(self, path, interfaces):
+        pass
+
+    # --- Control interface ---
+    @dbus.service.method(MOCK_CONTROL_INTERFACE, in_signature='u', out_signature='d')
+    def RssiStorm(self, count):
+        """ Emits count RSSI changes round-robin over all devices; returns seconds spent. """
+        start = time.perf_counter()
+        devices = self.service.devices
+        for i in range(count):
+            device = devices[i % len(devices)]
+            device.set_properties(DEVICE_INTERFACE, RSSI=dbus.Int16(random.randint(-95, -40)))
+        return time.perf_counter() - start
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE, in_signature='u', out_signature='d')
+    def PositionStorm(self, count):
+        """ Emits count Position updates from the phone's player. """
+        start = time.perf_counter()
+        player = self.service.phone.player
+        for i in range(count):
+            player.set_properties(MEDIA_PLAYER_INTERFACE, Position=dbus.UInt32(i * 100))
+        return time.perf_counter() - start
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE, in_signature='s', out_signature='d')
+    def SetTrack(self, title):
+        """ Changes the playing track; returns the monotonic time of the signal. """
+        self.service.phone.player.set_properties(
+            MEDIA_PLAYER_INTERFACE, Track=MockPlayer.track(title), Position=dbus.UInt32(0)
+        )
+        return time.monotonic()
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE)
+    def ConnectPhone(self):
+        self.service.phone.connect()
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE)
+    def DisconnectPhone(self):
+        self.service.phone.disconnect()
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE, in_signature='u')
+    def AddDevices(self, count):
+        self.service.add_devices(count)
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE, in_signature='u')
+    def RemoveDevices(self, count):
+        for device in self.service.devices[-count:]:
+            self.service.remove_device(device.path)
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE, out_signature='a(sd)')
+    def TakeCommandLog(self):
+        """ Returns and clears (command, monotonic time) for player commands received. """
+        log, self.service.command_log = self.service.command_log, []
+        return dbus.Array(log, signature='(sd)')
+
+    @dbus.service.method(MOCK_CONTROL_INTERFACE, in_signature='u')
+    def SetCallLatency(self, latency_ms):
+        self.service.call_latency_ms = latency_ms
+
+
+class MockBlueZService:
+    """ Owns org.bluez on a bus and every mocked object below '/'. """
+    def __init__(self, bus, adapters=1, devices=50, connected=False, library=LIBRARY_TRACKS):
+        self.bus = bus
+        self.bus_name = dbus.service.BusName(BLUEZ_SERVICE, bus)
+        self.call_latency_ms = CALL_LATENCY_MS
+        self.library_tracks = library
+        self.track_number = 0
+        self.command_log = []
+        self.objects = {}
+        self.devices = []
+        self.root = MockRoot(self)
+
+        self.adapters = [
+            MockAdapter(self, f'/org/bluez/hci{index}', index) for index in range(adapters)
+        ]
+        for adapter in self.adapters:
+            self.objects[adapter.path] = adapter
+
+        self.phone = MockDevice(
+            self, self.adapters[0].path, PHONE_ADDRESS, 'Test Phone',
+            paired=True, rssi=-50, audio=True
+        )
+        self.objects[self.phone.path] = self.phone
+        self.add_devices(devices, announce=False)
+        if connected:
+            self.phone.connect()
+
+    def add_devices(self, count, announce=True):
+        adapter_path = self.adapters[0].path
+        start = len(self.devices)
+        for i in range(start, start + count):
+            address = f'02:00:00:{(i >> 16) & 0xFF:02X}:{(i >> 8) & 0xFF:02X}:{i & 0xFF:02X}'
+            device = MockDevice(
+                self, adapter_path, address, f'Device {i}',
+                rssi=random.randint(-95, -40), audio=(i % 4 == 0)
+            )
+            self.devices.append(device)
+            if announce:
+                self.add_object(device)
+            else:
+                self.objects[device.path] = device
+
+    def add_object(self, obj):
+        self.objects[obj.path] = obj
+        self.root.InterfacesAdded(obj.path, obj.props)
+
+    def remove_object(self, obj):
+        self.objects.pop(obj.path, None)
+        obj.remove_from_connection()
+        self.root.InterfacesRemoved(obj.path, dbus.Array(list(obj.props), signature='s'))
+
+    def remove_device(self, path):
+        device = self.objects.get(path)
+        if isinstance(device, MockDevice) and device is not self.phone:
+            if device.player is not None:
+                self.remove_object(device.player)
+            self.devices.remove(device)
+            self.remove_object(device)
+
+
+def start_private_bus():
+    """ Starts a throwaway dbus-daemon; returns (process, address). """
+    process = subprocess.Popen(
+        ['dbus-daemon', '--session', '--nofork', '--print-address=1',
+         '--address=unix:tmpdir=/tmp'],
+        stdout=subprocess.PIPE, text=True
+    )
+    address = process.stdout.readline().strip()
+    if not address:
+        process.kill()
+        raise RuntimeError("dbus-daemon did not report an address")
+    return process, address
+
+
+def wait_for_name(address, name=BLUEZ_SERVICE, timeout=10.0):
+    """ Blocks until name is owned on the bus at address. """
+    bus = dbus.bus.BusConnection(address)
+    try:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if bus.name_has_owner(name):
+                return
+            time.sleep(0.02)
+        raise RuntimeError(f"{name} did not appear on {address}")
+    finally:
+        bus.close()
+
+
+class MockBlueZ:
+    """ Private bus plus mock service process, torn down on exit. """
+    def __init__(self, adapters=1, devices=50, connected=False, library=LIBRARY_TRACKS):
+        self.adapters = adapters
+        self.devices = devices
+        self.connected = connected
+        self.library = library
+        self.address = None
+        self._bus_process = None
+        self._service_process = None
+        self._control_bus = None
+
+    def __enter__(self):
+        self._bus_process, self.address = start_private_bus()
+        command = [
+            sys.executable, '-m', 'benchmarks.mock_bluez',
+            '--address', self.address,
+            '--adapters', str(self.adapters),
+            '--devices', str(self.devices),
+            '--library', str(self.library),
+        ]
+        if self.connected:
+            command.append('--connected')
+        self._service_process = subprocess.Popen(
+            command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        wait_for_name(self.address)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._control_bus is not None:
+            self._control_bus.close()
+        for process in (self._service_process, self._bus_process):
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=5)
+
+    @property
+    def control(self):
+        """ Blocking proxy for the control interface, for use from benchmarks. """
+        if self._control_bus is None:
+            self._control_bus = dbus.bus.BusConnection(self.address)
+        return dbus.Interface(
+            self._control_bus.get_object(BLUEZ_SERVICE, '/'),
+            MOCK_CONTROL_INTERFACE
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake org.bluez service")
+    parser.add_argument('--address', required=True, help="D-Bus address to serve on")
+    parser.add_argument('--adapters', type=int, default=1)
+    parser.add_argument('--devices', type=int, default=50)
+    parser.add_argument('--library', type=int, default=LIBRARY_TRACKS,
+                        help="tracks in the phone's All Tracks folder")
+    parser.add_argument('--connected', action='store_true',
+                        help="start with the test phone connected and playing")
+    args = parser.parse_args()
+
+    dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+    bus = dbus.bus.BusConnection(args.address)
+    service = MockBlueZService(bus, args.adapters, args.devices, args.connected, args.library)
+    print(f"[MOCK_BLUEZ] Serving {len(service.objects)} objects on {args.address}")
+    GLib.MainLoop().run()
+
+
+if __name__ == '__main__':
+    main()
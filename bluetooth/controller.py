@@ -1,26 +1,272 @@
 import threading
+import json
+import os
+from collections import deque
 import dbus
+import dbus.bus
 import dbus.mainloop.glib
 from gi.repository import GLib
 import time
 
+from .device_registry import DeviceRegistry, DEVICE_REGISTRY_MAX, DEVICE_MAX_AGE
+from .known_devices import KnownDevices
+from .media_library import LibraryCache, parse_item, root_folder
+from state_store import default_state_dir
+from subscription import Subscription
+
 
 # --- D-Bus Constants ---
 BLUEZ_SERVICE = 'org.bluez'
 ADAPTER_INTERFACE = f'{BLUEZ_SERVICE}.Adapter1'
 DEVICE_INTERFACE = f'{BLUEZ_SERVICE}.Device1'
 MEDIA_PLAYER_INTERFACE = f'{BLUEZ_SERVICE}.MediaPlayer1'
+MEDIA_FOLDER_INTERFACE = f'{BLUEZ_SERVICE}.MediaFolder1'
+MEDIA_ITEM_INTERFACE = f'{BLUEZ_SERVICE}.MediaItem1'
 DBUS_PROPERTIES_INTERFACE = 'org.freedesktop.DBus.Properties'
 DBUS_OBJECT_MANAGER_INTERFACE = 'org.freedesktop.DBus.ObjectManager'
 
+# --- State fields published to subscribers ---
+STATE_FIELDS = (
+    'status', 'metadata', 'connected_device',
+    'discovered_devices', 'is_scanning', 'last_error', 'command_error', 'jobs', 'playback',
+    'metrics', 'library_root', 'library',
+)
+
+EMPTY_PLAYBACK = {"status": "stopped", "position": 0, "duration": 0, "timestamp": 0.0}
+
+
+def playback_position(playback, now=None):
+    """ Interpolates the track position in ms from a published playback dict.
+
+    Position is only sampled when BlueZ reports it, so while playing the
+    elapsed monotonic time since the sample is added on top.
+    """
+    position = playback["position"]
+    if playback["status"] == "playing":
+        if now is None:
+            now = time.monotonic()
+        position += int((now - playback["timestamp"]) * 1000)
+    if playback["duration"]:
+        position = min(position, playback["duration"])
+    return max(position, 0)
+
+# --- Discovery settings ---
+AUDIO_SOURCE_UUID = '0000110a-0000-1000-8000-00805f9b34fb'
+AVRCP_TARGET_UUID = '0000110c-0000-1000-8000-00805f9b34fb'
+HANDSFREE_GATEWAY_UUID = '0000111f-0000-1000-8000-00805f9b34fb'
+
+# SetDiscoveryFilter arguments per profile; an empty filter reports everything
+DISCOVERY_PROFILES = {
+    'audio': {
+        'Transport': 'bredr',
+        'UUIDs': [AUDIO_SOURCE_UUID, AVRCP_TARGET_UUID, HANDSFREE_GATEWAY_UUID],
+        'RSSI': -85,
+        'DuplicateData': False,
+    },
+    'nearby': {
+        'Transport': 'bredr',
+        'RSSI': -70,
+        'DuplicateData': False,
+    },
+    'all': {},
+}
+DEFAULT_DISCOVERY_PROFILE = 'audio'
+
+# Device PropertiesChanged bursts are applied at most once per frame
+DEVICE_COALESCE_MS = 16
+
+# --- Transport control settings ---
+PLAYER_COMMANDS = ('Play', 'Pause', 'Stop', 'Next', 'Previous')
+PLAYER_COMMAND_TIMEOUT = 5  # seconds
+PLAYER_COMMAND_COALESCE_MS = 300  # repeats of the last command inside this window are dropped
+
+# --- Library browsing settings ---
+BROWSE_TIMEOUT = 10  # seconds per ChangeFolder/ListItems call
+BROWSE_QUEUE_MAX = 8  # pending page loads; the oldest are dropped while scrolling fast
+
+# --- Reconnect settings ---
+RECONNECT_ATTEMPTS = 2  # per known device before moving to the next one
+METRICS_FILE = 'reconnect_metrics.jsonl'
+
+# Startup milestones, in the order a driver experiences them
+METRIC_MILESTONES = ('adapter_ready', 'device_connected', 'player_attached', 'first_metadata')
+
+# --- Device job settings ---
+JOB_STEP_TIMEOUT = 30  # seconds allowed for each D-Bus call
+JOB_MAX_ATTEMPTS = 3  # attempts per step before the job fails
+JOB_RETRY_DELAY_MS = 1500
+
+JOB_STEP_METHODS = {
+    'pair': 'Pair',
+    'connect': 'Connect',
+    'disconnect': 'Disconnect',
+}
+
+# Errors meaning the step's goal is already reached
+JOB_BENIGN_ERRORS = {
+    'pair': ('org.bluez.Error.AlreadyExists',),
+    'connect': ('org.bluez.Error.AlreadyConnected',),
+    'disconnect': ('org.bluez.Error.NotConnected',),
+}
+
+# Errors that retrying will not fix
+JOB_FATAL_ERRORS = (
+    'org.bluez.Error.AuthenticationCanceled',
+    'org.bluez.Error.AuthenticationRejected',
+    'org.bluez.Error.DoesNotExist',
+    'org.freedesktop.DBus.Error.UnknownObject',
+)
+
+
+class DeviceJob:
+    """ A sequence of Device1 calls for one device, driven by async D-Bus replies.
+
+    Runs entirely on the D-Bus thread. Each step has its own timeout and
+    retry budget; replies arriving after a cancel or retry are ignored.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, controller, device_path, steps, max_attempts=JOB_MAX_ATTEMPTS):
+        self.controller = controller
+        self.device_path = device_path
+        self.steps = tuple(steps)
+        self.max_attempts = max_attempts
+        self.state = DeviceJob.QUEUED
+        self.step_index = 0
+        self.attempt = 0
+        self.error = None
+        self._call_id = 0
+        self._retry_source = None
+
+    @property
+    def step(self):
+        if self.step_index < len(self.steps):
+            return self.steps[self.step_index]
+        return None
+
+    @property
+    def finished(self):
+        return self.state in (DeviceJob.DONE, DeviceJob.FAILED, DeviceJob.CANCELLED)
+
+    def describe(self):
+        """ Returns the progress dict published to the UI. """
+        return {
+            "steps": self.steps,
+            "step": self.step,
+            "attempt": self.attempt,
+            "state": self.state,
+            "error": self.error,
+        }
+
+    def start(self):
+        self.state = DeviceJob.RUNNING
+        self._run_step()
+
+    def _run_step(self):
+        self._retry_source = None
+        if self.state != DeviceJob.RUNNING:
+            return False
+
+        step = self.step
+        if step is None:
+            self._finish(DeviceJob.DONE)
+            return False
+        if step == 'pair' and self.controller.is_device_paired(self.device_path):
+            self._advance()
+            return False
+
+        self.attempt += 1
+        self._call_id += 1
+        call_id = self._call_id
+        print(f"[BT_CTRL] Job {step} {self.device_path} (attempt {self.attempt})")
+        self.controller._job_progress(self)
+
+        try:
+            device = self.controller.get_interface(self.device_path, DEVICE_INTERFACE)
+            getattr(device, JOB_STEP_METHODS[step])(
+                reply_handler=lambda *args: self._on_reply(call_id),
+                error_handler=lambda error: self._on_error(call_id, error),
+                timeout=JOB_STEP_TIMEOUT
+            )
+        except Exception as e:
+            self._on_error(call_id, e)
+        return False
+
+    def _advance(self):
+        self.step_index += 1
+        self.attempt = 0
+        self.error = None
+        self._run_step()
+
+    def _on_reply(self, call_id):
+        if call_id != self._call_id or self.state != DeviceJob.RUNNING:
+            return
+        self._advance()
+
+    def _on_error(self, call_id, error):
+        if call_id != self._call_id or self.state != DeviceJob.RUNNING:
+            return
+
+        step = self.step
+        name = error.get_dbus_name() if hasattr(error, 'get_dbus_name') else None
+        if name in JOB_BENIGN_ERRORS.get(step, ()):
+            self._advance()
+            return
+
+        self.error = str(error)
+        if name in JOB_FATAL_ERRORS or self.attempt >= self.max_attempts:
+            self._finish(DeviceJob.FAILED)
+            return
+
+        print(f"[BT_CTRL] Job {step} {self.device_path} failed, retrying: {error}")
+        self.controller._job_progress(self)
+        self._retry_source = GLib.timeout_add(JOB_RETRY_DELAY_MS, self._run_step)
+
+    def cancel(self):
+        """ Abandons the job, aborting an in-flight pairing if there is one. """
+        if self.finished:
+            return
+
+        if self._retry_source:
+            GLib.source_remove(self._retry_source)
+            self._retry_source = None
+        # Any reply still in flight now belongs to a stale call
+        self._call_id += 1
+
+        if self.state == DeviceJob.RUNNING and self.step == 'pair':
+            try:
+                device = self.controller.get_interface(self.device_path, DEVICE_INTERFACE)
+                device.CancelPairing(
+                    reply_handler=lambda *args: None,
+                    error_handler=lambda error: None
+                )
+            except Exception as e:
+                print(f"[BT_CTRL] Error cancelling pairing: {e}")
+
+        self._finish(DeviceJob.CANCELLED)
+
+    def _finish(self, state):
+        self.state = state
+        print(f"[BT_CTRL] Job for {self.device_path} {state}")
+        self.controller._job_finished(self)
+
+
 class BluetoothController(threading.Thread):
     """ Manages all Bluetooth communication in a separate thread. """
-    def __init__(self):
+    def __init__(self, max_devices=DEVICE_REGISTRY_MAX, device_max_age=DEVICE_MAX_AGE,
+                 discovery_profile=DEFAULT_DISCOVERY_PROFILE, state_dir=None,
+                 bus_address=None):
         super().__init__()
         self.daemon = True
+        self.bus_address = bus_address  # None means the system bus
         self.bus = None
         self.mainloop = None
         self.player_iface = None
+        self.player_path = None
         self.adapter = None
         self.adapter_props = None
         
@@ -28,9 +274,95 @@ class BluetoothController(threading.Thread):
         self._status = "Initializing..."
         self._metadata = {}
         self._connected_device = {"name": "None", "path": None}
-        self._discovered_devices = {}
+        self._discovered_devices = DeviceRegistry(max_devices, device_max_age)
         self._is_scanning = False
         self._last_error = None
+        self._command_error = None  # last failed (or unsendable) player command
+        self._jobs = {}
+        self._playback = dict(EMPTY_PLAYBACK)
+        self._metrics = {}
+        self._library = LibraryCache()
+        self._library_player = None  # browsable player whose listings are published
+        self._version = 0
+        self._subscriptions = []
+
+        # Pair/connect jobs, run one at a time on the D-Bus thread
+        self._job_queue = deque()
+        self._active_job = None
+
+        # Mirror of the BlueZ object tree: path -> {interface: {property: value}}.
+        # Only touched from the D-Bus thread, so it needs no locking.
+        self._objects = {}
+
+        # Proxy cache: path -> proxy object, (path, interface) -> dbus.Interface.
+        # D-Bus thread only, like the mirror.
+        self._proxy_objects = {}
+        self._interfaces = {}
+
+        # Device property changes waiting for the next coalesced flush
+        self.discovery_profile = discovery_profile
+        self._pending_device_changes = {}
+        self._device_flush_source = None
+
+        # Reconnect engine: known phones to try, most recent first
+        # Follows MINI_MATT_STATE_DIR unless a directory is given
+        self.state_dir = state_dir or default_state_dir()
+        self.known_devices = KnownDevices(self.state_dir)
+        self._reconnect_queue = deque()
+        self._reconnect_path = None
+        self._start_time = time.monotonic()
+
+        # Transport commands: one in flight, the latest tap queued behind it
+        self._command_in_flight = None
+        self._queued_command = None
+        self._last_command = None
+        self._last_command_time = 0.0
+
+        # Library browsing: one ListItems call at a time, visible pages first
+        self._browse_queue = deque()
+        self._browse_in_flight = None
+        self._browse_folder = None  # BlueZ's current folder for the player
+
+    # --- Change subscriptions ---
+    def subscribe(self, callback, fields=None):
+        """ Call ``callback(StateChange)`` on the Kivy thread when state changes.
+
+        ``fields`` limits delivery to a subset of STATE_FIELDS. The current
+        state is delivered once on the next frame so views can sync up.
+        """
+        subscription = Subscription(self, callback, fields)
+        with self.lock:
+            self._subscriptions.append(subscription)
+            subscription._queue(STATE_FIELDS, self._version)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def _changed(self, *fields):
+        """ Publish a state change; the caller must hold the lock. """
+        self._version += 1
+        for subscription in self._subscriptions:
+            subscription._queue(fields, self._version)
+
+    def snapshot(self):
+        """ Returns a consistent copy of all published state in one lock pass. """
+        with self.lock:
+            return {
+                "version": self._version,
+                "status": self._status,
+                "metadata": self._metadata.copy(),
+                "connected_device": self._connected_device.copy(),
+                "is_scanning": self._is_scanning,
+                "last_error": self._last_error,
+                "command_error": self._command_error,
+                "jobs": self._jobs.copy(),
+                "playback": self._playback.copy(),
+                "metrics": self._metrics.copy(),
+                "library_root": self._library_root(),
+            }
 
     # --- Thread-safe property accessors ---
     @property
@@ -51,7 +383,12 @@ class BluetoothController(threading.Thread):
     @property
     def discovered_devices(self):
         with self.lock: 
-            return self._discovered_devices.copy()
+            return self._discovered_devices.as_dict()
+
+    def ranked_devices(self, limit=None):
+        """ Returns (path, device) pairs ordered connected, paired, then by RSSI. """
+        with self.lock:
+            return self._discovered_devices.ranked(limit)
     
     @property
     def is_scanning(self):
@@ -63,42 +400,100 @@ class BluetoothController(threading.Thread):
         with self.lock:
             return self._last_error
 
+    @property
+    def jobs(self):
+        with self.lock:
+            return self._jobs.copy()
+
+    @property
+    def playback(self):
+        with self.lock:
+            return self._playback.copy()
+
+    @property
+    def metrics(self):
+        with self.lock:
+            return self._metrics.copy()
+
+    @property
+    def library_root(self):
+        """ Root folder of the connected phone's library, or None if it cannot browse. """
+        with self.lock:
+            return self._library_root()
+
+    def _library_root(self):
+        return root_folder(self._library_player) if self._library_player else None
+
+    def library_page(self, folder, page):
+        """ Returns a cached page of a folder listing, or None if it is not loaded. """
+        with self.lock:
+            if not self._library_player:
+                return None
+            return self._library.get(self._library_player, folder, page)
+
+    def library_size(self, folder):
+        """ Returns the number of items in a folder, or None if not known yet. """
+        with self.lock:
+            if not self._library_player:
+                return None
+            return self._library.size(self._library_player, folder)
+
     def _update_status(self, new_status):
         with self.lock:
             if self._status != new_status:
                 print(f"[BT_CTRL] Status -> {new_status}")
                 self._status = new_status
+                self._changed('status')
     
     def _set_error(self, error_msg):
         with self.lock:
             self._last_error = error_msg
             print(f"[BT_CTRL] Error: {error_msg}")
+            self._changed('last_error')
     
+    def _command_failed(self, command, reason):
+        """ Publishes a player command that failed; views showing it optimistically revert. """
+        error_msg = f"Player command {command} failed: {reason}"
+        with self.lock:
+            self._last_error = self._command_error = error_msg
+            print(f"[BT_CTRL] Error: {error_msg}")
+            self._changed('last_error', 'command_error')
+
+    def _mark(self, milestone):
+        """ Records the first time a startup milestone is reached. """
+        with self.lock:
+            if milestone in self._metrics:
+                return
+            elapsed = time.monotonic() - self._start_time
+            self._metrics[milestone] = elapsed
+            self._changed('metrics')
+            metrics = self._metrics.copy()
+        print(f"[BT_CTRL] {milestone} after {elapsed:.2f}s")
+        if milestone == 'first_metadata':
+            self._log_metrics(metrics)
+
+    def _log_metrics(self, metrics):
+        """ Appends one startup's milestones to the metrics log. """
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            record = {"time": time.time()}
+            record.update({name: round(value, 3) for name, value in metrics.items()})
+            with open(os.path.join(self.state_dir, METRICS_FILE), 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        except Exception as e:
+            print(f"[BT_CTRL] Error writing metrics: {e}")
+
     def run(self):
         """ The main loop for the D-Bus thread. """
         try:
             dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
-            self.bus = dbus.SystemBus()
+            if self.bus_address:
+                self.bus = dbus.bus.BusConnection(self.bus_address)
+            else:
+                self.bus = dbus.SystemBus()
 
-            # Find and configure adapter
-            adapter_path = self.find_adapter_path()
-            if not adapter_path:
-                self._update_status("Error: No Bluetooth Adapter Found")
-                return
-
-            self.adapter = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, adapter_path), 
-                ADAPTER_INTERFACE
-            )
-            self.adapter_props = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, adapter_path),
-                DBUS_PROPERTIES_INTERFACE
-            )
-            
-            # Configure adapter for audio
-            self.configure_adapter()
-            
-            # Set up signal receivers
+            # Set up signal receivers before the initial dump so no change
+            # between the dump and the first signal is lost
             self.bus.add_signal_receiver(
                 self.properties_changed,
                 bus_name=BLUEZ_SERVICE,
@@ -112,6 +507,28 @@ class BluetoothController(threading.Thread):
                 signal_name='InterfacesAdded',
                 dbus_interface=DBUS_OBJECT_MANAGER_INTERFACE
             )
+            self.bus.add_signal_receiver(
+                self.interfaces_removed,
+                bus_name=BLUEZ_SERVICE,
+                signal_name='InterfacesRemoved',
+                dbus_interface=DBUS_OBJECT_MANAGER_INTERFACE
+            )
+            
+            # Mirror the object tree once; signals keep it current afterwards
+            self.load_object_tree()
+
+            # Find and configure adapter
+            adapter_path = self.find_adapter_path()
+            if not adapter_path:
+                self._update_status("Error: No Bluetooth Adapter Found")
+                return
+
+            self.adapter = self.get_interface(adapter_path, ADAPTER_INTERFACE)
+            self.adapter_props = self.get_interface(adapter_path, DBUS_PROPERTIES_INTERFACE)
+            
+            # Configure adapter for audio
+            self.configure_adapter()
+            self._mark('adapter_ready')
             
             # Initial scans
             self.scan_existing_devices()
@@ -119,7 +536,11 @@ class BluetoothController(threading.Thread):
             # Set up periodic tasks
             GLib.timeout_add_seconds(2, self.periodic_check)
             
-            self._update_status("Ready - No Device Connected")
+            if self.connected_device["path"]:
+                self._update_status("Connected")
+            else:
+                self._update_status("Ready - No Device Connected")
+                self.reconnect_known_devices()
             
             # Start main loop
             self.mainloop = GLib.MainLoop()
@@ -142,227 +563,699 @@ class BluetoothController(threading.Thread):
         except Exception as e:
             print(f"[BT_CTRL] Error configuring adapter: {e}")
 
+    # --- Proxy cache ---
+    def get_interface(self, path, interface):
+        """ Returns a cached dbus.Interface, creating the proxy on first use.
+
+        A fresh proxy introspects its object on the first call, so reusing
+        proxies saves a round trip per command on top of the allocation.
+        """
+        key = (path, interface)
+        iface = self._interfaces.get(key)
+        if iface is None:
+            proxy = self._proxy_objects.get(path)
+            if proxy is None:
+                proxy = self.bus.get_object(BLUEZ_SERVICE, path)
+                self._proxy_objects[path] = proxy
+            iface = dbus.Interface(proxy, interface)
+            self._interfaces[key] = iface
+        return iface
+
+    def invalidate_proxies(self, path=None):
+        """ Drops cached proxies for path and its children, or all of them. """
+        if path is None:
+            self._proxy_objects.clear()
+            self._interfaces.clear()
+            return
+        prefix = path.rstrip('/') + '/'
+        for cached in [p for p in self._proxy_objects if p == path or p.startswith(prefix)]:
+            del self._proxy_objects[cached]
+        for key in [k for k in self._interfaces if k[0] == path or k[0].startswith(prefix)]:
+            del self._interfaces[key]
+
+    # --- Object tree mirror ---
+    def load_object_tree(self):
+        """ Builds the local mirror with a single GetManagedObjects call. """
+        try:
+            manager = self.get_interface('/', DBUS_OBJECT_MANAGER_INTERFACE)
+            objects = manager.GetManagedObjects()
+            self._objects = {
+                str(path): {
+                    str(interface): dict(props)
+                    for interface, props in interfaces.items()
+                }
+                for path, interfaces in objects.items()
+            }
+            print(f"[BT_CTRL] Mirrored {len(self._objects)} BlueZ objects")
+        except Exception as e:
+            print(f"[BT_CTRL] Error loading object tree: {e}")
+            self._objects = {}
+
+    def find_objects(self, interface):
+        """ Returns (path, properties) for every mirrored object implementing interface. """
+        return [
+            (path, interfaces[interface])
+            for path, interfaces in self._objects.items()
+            if interface in interfaces
+        ]
+
+    def get_object_properties(self, path, interface):
+        """ Returns the mirrored properties of path for interface, or None. """
+        return self._objects.get(path, {}).get(interface)
+
+    def _mirrored_device_fields(self, path):
+        """ Registry fields for path from the object mirror, for devices not in the registry. """
+        props = self.get_object_properties(path, DEVICE_INTERFACE) or {}
+        rssi = props.get("RSSI")
+        return {
+            "name": str(props.get("Name", props.get("Alias", "Unknown Device"))),
+            "paired": bool(props.get("Paired", False)),
+            "connected": bool(props.get("Connected", False)),
+            "rssi": int(rssi) if rssi is not None else None,
+        }
+
     def scan_existing_devices(self):
         """ Scan for already paired/known devices. """
+        connected_devices = []
         try:
-            manager = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, '/'),
-                DBUS_OBJECT_MANAGER_INTERFACE
-            )
-            objects = manager.GetManagedObjects()
-            
             with self.lock:
-                for path, interfaces in objects.items():
+                for path, interfaces in self._objects.items():
                     if DEVICE_INTERFACE in interfaces:
                         props = interfaces[DEVICE_INTERFACE]
-                        name = props.get("Name", "Unknown Device")
-                        paired = props.get("Paired", False)
-                        connected = props.get("Connected", False)
+                        name = str(props.get("Name", "Unknown Device"))
+                        paired = bool(props.get("Paired", False))
+                        connected = bool(props.get("Connected", False))
+                        rssi = props.get("RSSI")
                         
-                        self._discovered_devices[path] = {
-                            "name": name,
-                            "paired": paired,
-                            "connected": connected
-                        }
+                        self._discovered_devices.update(
+                            path,
+                            name=name,
+                            paired=paired,
+                            connected=connected,
+                            rssi=int(rssi) if rssi is not None else None
+                        )
                         
                         if connected:
                             self._connected_device = {"name": name, "path": path}
                             print(f"[BT_CTRL] Found connected device: {name}")
+                            self._changed('connected_device')
+                            connected_devices.append((props.get("Address"), name))
                             
                     if MEDIA_PLAYER_INTERFACE in interfaces:
                         print(f"[BT_CTRL] Found media player at {path}")
                         GLib.idle_add(self.connect_to_player, path)
+
+                self._changed('discovered_devices')
                         
         except Exception as e:
             print(f"[BT_CTRL] Error scanning existing devices: {e}")
 
+        for address, name in connected_devices:
+            self._mark('device_connected')
+            if address:
+                self.known_devices.record_connection(address, name)
+
     def periodic_check(self):
         """ Regular maintenance tasks. """
         if not self.player_iface:
             self.find_player()
+        with self.lock:
+            evicted = self._discovered_devices.evict()
+            if evicted:
+                print(f"[BT_CTRL] Evicted {evicted} stale device(s)")
+                self._changed('discovered_devices')
         return True
 
     def find_adapter_path(self):
         """ Finds the path of the first Bluetooth adapter. """
-        try:
-            manager = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, '/'),
-                DBUS_OBJECT_MANAGER_INTERFACE
-            )
-            objects = manager.GetManagedObjects()
-            for path, interfaces in objects.items():
-                if ADAPTER_INTERFACE in interfaces:
-                    print(f"[BT_CTRL] Found adapter at {path}")
-                    return path
-        except Exception as e:
-            print(f"[BT_CTRL] Error finding adapter: {e}")
+        for path, _ in self.find_objects(ADAPTER_INTERFACE):
+            print(f"[BT_CTRL] Found adapter at {path}")
+            return path
         return None
 
+    def set_discovery_profile(self, profile):
+        """ Selects the discovery filter used the next time scanning starts. """
+        if profile not in DISCOVERY_PROFILES:
+            raise ValueError(f"Unknown discovery profile: {profile}")
+        self.discovery_profile = profile
+
+    def apply_discovery_filter(self):
+        """ Asks BlueZ to drop devices outside the active profile before signalling. """
+        profile = DISCOVERY_PROFILES[self.discovery_profile]
+        discovery_filter = {}
+        if 'Transport' in profile:
+            discovery_filter['Transport'] = dbus.String(profile['Transport'])
+        if 'UUIDs' in profile:
+            discovery_filter['UUIDs'] = dbus.Array(profile['UUIDs'], signature='s')
+        if 'RSSI' in profile:
+            discovery_filter['RSSI'] = dbus.Int16(profile['RSSI'])
+        if 'DuplicateData' in profile:
+            discovery_filter['DuplicateData'] = dbus.Boolean(profile['DuplicateData'])
+        self.adapter.SetDiscoveryFilter(dbus.Dictionary(discovery_filter, signature='sv'))
+
     def toggle_discovery(self):
         """ Starts or stops scanning for devices. """
         if not self.adapter:
             return
             
         try:
+            if self.is_scanning:
+                print("[BT_CTRL] Stopping discovery...")
+                self.adapter.StopDiscovery()
+                scanning = False
+            else:
+                print(f"[BT_CTRL] Starting discovery ({self.discovery_profile})...")
+                self.apply_discovery_filter()
+                self.adapter.StartDiscovery()
+                scanning = True
             with self.lock:
-                if self._is_scanning:
-                    print("[BT_CTRL] Stopping discovery...")
-                    self.adapter.StopDiscovery()
-                    self._is_scanning = False
-                else:
-                    print("[BT_CTRL] Starting discovery...")
-                    self.adapter.StartDiscovery()
-                    self._is_scanning = True
+                self._is_scanning = scanning
+                self._changed('is_scanning')
         except Exception as e:
             print(f"[BT_CTRL] Discovery toggle error: {e}")
             with self.lock:
-                self._is_scanning = False
+                if self._is_scanning:
+                    self._is_scanning = False
+                    self._changed('is_scanning')
     
+    # --- Device jobs (D-Bus thread only) ---
     def pair_and_connect_device(self, device_path):
-        """ Pair with a device and then connect to it. """
+        """ Queue pairing (when needed) followed by connecting to a device. """
+        self.enqueue_job(device_path, ('pair', 'connect'))
+    
+    def disconnect_device(self, device_path):
+        """ Queue disconnecting from a device. """
+        self.enqueue_job(device_path, ('disconnect',))
+
+    def enqueue_job(self, device_path, steps, max_attempts=JOB_MAX_ATTEMPTS):
+        """ Queue a job for a device, replacing any job already pending for it. """
+        self.cancel_job(device_path)
+        job = DeviceJob(self, device_path, steps, max_attempts)
+        self._job_queue.append(job)
+        self._job_progress(job)
+        self._start_next_job()
+
+    def cancel_job(self, device_path):
+        """ Cancel the queued or running job for a device, if any. """
+        for job in list(self._job_queue):
+            if job.device_path == device_path:
+                self._job_queue.remove(job)
+                job.cancel()
+        if self._active_job and self._active_job.device_path == device_path:
+            self._active_job.cancel()
+
+    def is_device_paired(self, device_path):
+        props = self.get_object_properties(device_path, DEVICE_INTERFACE)
+        return bool(props and props.get("Paired", False))
+
+    def _start_next_job(self):
+        if self._active_job or not self._job_queue:
+            return
+        self._active_job = self._job_queue.popleft()
+        self._active_job.start()
+
+    def _job_progress(self, job):
+        with self.lock:
+            self._jobs[job.device_path] = job.describe()
+            self._changed('jobs')
+
+    def _job_finished(self, job):
+        with self.lock:
+            if job.state == DeviceJob.FAILED:
+                # Keep failures visible until the next job for the device
+                self._jobs[job.device_path] = job.describe()
+            else:
+                self._jobs.pop(job.device_path, None)
+            self._changed('jobs')
+
+        if job.state == DeviceJob.FAILED:
+            self._set_error(f"Failed to {job.step} {job.device_path}: {job.error}")
+
+        if job is self._active_job:
+            self._active_job = None
+            self._start_next_job()
+
+        if job.device_path == self._reconnect_path:
+            self._reconnect_path = None
+            if job.state == DeviceJob.FAILED:
+                self._reconnect_next()
+            else:
+                self._reconnect_queue.clear()
+                if job.state == DeviceJob.DONE and not self.player_iface:
+                    self.find_player()
+
+    # --- Reconnect engine (D-Bus thread only) ---
+    def reconnect_known_devices(self):
+        """ Connects to the most recently used phone that BlueZ still has paired. """
+        paired = {}
+        for path, props in self.find_objects(DEVICE_INTERFACE):
+            if props.get("Paired", False) and props.get("Address"):
+                paired[str(props["Address"])] = path
+
+        self._reconnect_queue = deque(
+            paired[device["address"]]
+            for device in self.known_devices.priority()
+            if device["address"] in paired
+        )
+        self._reconnect_next()
+
+    def _reconnect_next(self):
+        if not self._reconnect_queue:
+            return
+        with self.lock:
+            if self._connected_device["path"]:
+                self._reconnect_queue.clear()
+                return
+        path = self._reconnect_queue.popleft()
+        print(f"[BT_CTRL] Reconnecting to {path}")
+        self._reconnect_path = path
+        self.enqueue_job(path, ('connect',), max_attempts=RECONNECT_ATTEMPTS)
+
+    # --- Transport controls (D-Bus thread only) ---
+    def player_command(self, command):
+        """ Sends a transport command to the phone, collapsing rapid repeats.
+
+        Only one command is in flight at a time. Taps arriving meanwhile
+        replace each other, and a repeat of the command just sent within
+        PLAYER_COMMAND_COALESCE_MS is dropped, so a burst of Next taps
+        reaches the phone as a single Next.
+        """
+        if command not in PLAYER_COMMANDS:
+            raise ValueError(f"Unknown player command: {command}")
+        if not self.player_iface:
+            # Nothing will confirm the tap, so say so now rather than after the rollback timeout
+            self._command_failed(command, "no media player")
+            return
+
+        if self._command_in_flight:
+            self._queued_command = command
+            return
+
+        now = time.monotonic()
+        if (command == self._last_command
+                and (now - self._last_command_time) * 1000 < PLAYER_COMMAND_COALESCE_MS):
+            print(f"[BT_CTRL] Coalesced repeated {command}")
+            return
+
+        self._command_in_flight = command
+        self._last_command = command
+        self._last_command_time = now
+        getattr(self.player_iface, command)(
+            reply_handler=lambda *args: self._player_command_done(command),
+            error_handler=lambda error: self._player_command_done(command, error),
+            timeout=PLAYER_COMMAND_TIMEOUT
+        )
+
+    def _player_command_done(self, command, error=None):
+        self._command_in_flight = None
+        if error is not None:
+            self._command_failed(command, error)
+
+        queued, self._queued_command = self._queued_command, None
+        if queued and queued != command:
+            self.player_command(queued)
+
+    # --- Library browsing (D-Bus thread only) ---
+    def browse(self, folder, page):
+        """ Loads one page of a folder listing, then prefetches the page after it.
+
+        Pages are served from the LRU cache when possible. Requests for what
+        is on screen jump the queue; prefetches wait behind them and are the
+        first to go when scrolling outruns the phone.
+        """
+        if not self.player_path:
+            return
+        self._request_page((self.player_path, folder, page), urgent=True)
+        self._request_page((self.player_path, folder, page + 1), urgent=False)
+        self._browse_next()
+
+    def _request_page(self, key, urgent):
+        with self.lock:
+            if key in self._library or self._library.past_end(*key):
+                return
+        if key == self._browse_in_flight:
+            return
+        if key in self._browse_queue:
+            if not urgent:
+                return
+            self._browse_queue.remove(key)
+
+        if urgent:
+            self._browse_queue.appendleft(key)
+            while len(self._browse_queue) > BROWSE_QUEUE_MAX:
+                self._browse_queue.pop()
+        elif len(self._browse_queue) < BROWSE_QUEUE_MAX:
+            self._browse_queue.append(key)
+
+    def _browse_next(self):
+        if self._browse_in_flight:
+            return
+        while self._browse_queue:
+            key = self._browse_queue.popleft()
+            with self.lock:
+                done = key in self._library or self._library.past_end(*key)
+            if key[0] == self.player_path and not done:
+                break
+        else:
+            return
+
+        self._browse_in_flight = key
+        player, folder, page = key
+        if folder == self._browse_folder:
+            self._list_page(key)
+            return
+
+        # ListItems always lists BlueZ's current folder, so move there first
         try:
-            device = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, device_path),
-                DEVICE_INTERFACE
+            self.get_interface(player, MEDIA_FOLDER_INTERFACE).ChangeFolder(
+                dbus.ObjectPath(folder),
+                reply_handler=lambda *args: self._folder_changed(key),
+                error_handler=lambda error: self._browse_failed(key, error),
+                timeout=BROWSE_TIMEOUT
             )
-            
-            # Check if already paired
-            device_props = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, device_path),
-                DBUS_PROPERTIES_INTERFACE
-            )
-            
-            is_paired = device_props.Get(DEVICE_INTERFACE, "Paired")
-            
-            if not is_paired:
-                print(f"[BT_CTRL] Pairing with device at {device_path}")
-                device.Pair()
-                time.sleep(2)  # Give pairing time to complete
-            
-            print(f"[BT_CTRL] Connecting to device at {device_path}")
-            device.Connect()
-            
         except Exception as e:
-            self._set_error(f"Failed to pair/connect: {e}")
-    
-    def disconnect_device(self, device_path):
-        """ Disconnect from a device. """
+            self._browse_failed(key, e)
+
+    def _folder_changed(self, key):
+        if key != self._browse_in_flight:
+            return
+        player, folder, page = key
+        self._browse_folder = folder
+        # BlueZ updates NumberOfItems before replying, so the mirror is current
+        props = self.get_object_properties(player, MEDIA_FOLDER_INTERFACE) or {}
+        if 'NumberOfItems' in props:
+            with self.lock:
+                if self._library.set_size(player, folder, int(props['NumberOfItems'])):
+                    self._changed('library')
+        self._list_page(key)
+
+    def _list_page(self, key):
+        player, folder, page = key
+        start = page * self._library.page_size
         try:
-            device = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, device_path),
-                DEVICE_INTERFACE
+            self.get_interface(player, MEDIA_FOLDER_INTERFACE).ListItems(
+                dbus.Dictionary({
+                    'Start': dbus.UInt32(start),
+                    'End': dbus.UInt32(start + self._library.page_size - 1),
+                }, signature='sv'),
+                reply_handler=lambda objects: self._page_listed(key, objects),
+                error_handler=lambda error: self._browse_failed(key, error),
+                timeout=BROWSE_TIMEOUT
             )
-            print(f"[BT_CTRL] Disconnecting from {device_path}")
-            device.Disconnect()
         except Exception as e:
-            self._set_error(f"Failed to disconnect: {e}")
+            self._browse_failed(key, e)
 
-    def find_player(self):
-        """ Finds any existing media player interface. """
+    def _page_listed(self, key, objects):
+        if key != self._browse_in_flight:
+            return
+        self._browse_in_flight = None
+        player, folder, page = key
+        items = [parse_item(path, props) for path, props in objects.items()]
+        with self.lock:
+            self._library.put(player, folder, page, items)
+            if len(items) < self._library.page_size:
+                # A short page is the end of the folder, whatever NumberOfItems said
+                self._library.set_size(player, folder, page * self._library.page_size + len(items))
+            self._changed('library')
+        self._browse_next()
+
+    def _browse_failed(self, key, error):
+        if key != self._browse_in_flight:
+            return
+        self._browse_in_flight = None
+        # The phone may or may not have changed folder before failing
+        self._browse_folder = None
+        self._set_error(f"Failed to list {key[1]}: {error}")
+        self._browse_next()
+
+    def _reset_browsing(self):
+        self._browse_queue.clear()
+        self._browse_in_flight = None
+        self._browse_folder = None
+
+    def _forget_library(self, player):
+        """ Drops a departed player's listings; the caller must hold the lock. """
+        if self._library.drop_player(player):
+            self._changed('library')
+        if self._library_player == player:
+            self._library_player = None
+            self._changed('library_root')
+
+    def play_item(self, item_path):
+        """ Starts playing a track picked from the library. """
         try:
-            manager = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, '/'),
-                DBUS_OBJECT_MANAGER_INTERFACE
+            self.get_interface(item_path, MEDIA_ITEM_INTERFACE).Play(
+                reply_handler=lambda *args: None,
+                error_handler=lambda error: self._set_error(f"Failed to play {item_path}: {error}"),
+                timeout=PLAYER_COMMAND_TIMEOUT
             )
-            objects = manager.GetManagedObjects()
-            for path, interfaces in objects.items():
-                if MEDIA_PLAYER_INTERFACE in interfaces:
-                    self.connect_to_player(path)
-                    return
         except Exception as e:
-            print(f"[BT_CTRL] Error finding player: {e}")
+            self._set_error(f"Failed to play {item_path}: {e}")
+
+    def find_player(self):
+        """ Finds any existing media player interface. """
+        for path, _ in self.find_objects(MEDIA_PLAYER_INTERFACE):
+            self.connect_to_player(path)
+            return
 
     def connect_to_player(self, path):
         """ Establishes an interface with a media player. """
         try:
-            self.player_iface = dbus.Interface(
-                self.bus.get_object(BLUEZ_SERVICE, path),
-                MEDIA_PLAYER_INTERFACE
-            )
+            self.player_iface = self.get_interface(path, MEDIA_PLAYER_INTERFACE)
+            self.player_path = path
+            self._reset_browsing()
             print(f"[BT_CTRL] Connected to media player at {path}")
+            self._mark('player_attached')
             self.get_player_properties()
         except Exception as e:
             print(f"[BT_CTRL] Failed to connect to player: {e}")
             self.player_iface = None
+            self.player_path = None
 
     def get_player_properties(self):
-        """ Retrieves track info and status from the media player. """
+        """ Loads track info and status, from the mirror when BlueZ announced them. """
         if not self.player_iface:
             return
-            
+
+        props = self.get_object_properties(self.player_path, MEDIA_PLAYER_INTERFACE)
+        if props:
+            self._apply_player_properties(props)
+            return
+
         try:
-            props_iface = dbus.Interface(
-                self.player_iface.proxy_object,
-                DBUS_PROPERTIES_INTERFACE
-            )
-            props = props_iface.GetAll(MEDIA_PLAYER_INTERFACE)
-            
+            props_iface = self.get_interface(self.player_path, DBUS_PROPERTIES_INTERFACE)
+            props = dict(props_iface.GetAll(MEDIA_PLAYER_INTERFACE))
+            self._objects.setdefault(self.player_path, {})[MEDIA_PLAYER_INTERFACE] = props
+            self._apply_player_properties(props)
+        except Exception as e:
+            print(f"[BT_CTRL] Error getting player properties: {e}")
+            self.player_iface = None
+            self.player_path = None
             with self.lock:
-                self._status = props.get('Status', 'Connected')
-                track_info = props.get('Track', {})
-                self._metadata = {
+                self._status = "Connected - No Media Info"
+                self._changed('status')
+
+    def _apply_player_properties(self, props):
+        """ Applies a full or partial MediaPlayer1 property set to published state. """
+        now = time.monotonic()
+        first_metadata = False
+        with self.lock:
+            fields = []
+            playback = self._playback.copy()
+
+            if 'Status' in props:
+                status = str(props['Status'])
+                # Re-anchor so interpolation neither jumps nor keeps running
+                playback["position"] = playback_position(playback, now)
+                playback["timestamp"] = now
+                playback["status"] = status
+                if self._status != status:
+                    self._status = status
+                    fields.append('status')
+
+            if 'Track' in props:
+                track_info = props['Track']
+                metadata = {
                     "Title": str(track_info.get('Title', 'No Track')),
                     "Artist": str(track_info.get('Artist', 'Unknown Artist')),
                     "Album": str(track_info.get('Album', 'Unknown Album')),
                     "ArtUrl": str(track_info.get('mpris:artUrl', '')),
                 }
-        except Exception as e:
-            print(f"[BT_CTRL] Error getting player properties: {e}")
-            self.player_iface = None
-            with self.lock:
-                self._status = "Connected - No Media Info"
+                playback["duration"] = int(track_info.get('Duration', 0))
+                if self._metadata != metadata:
+                    self._metadata = metadata
+                    fields.append('metadata')
+                    if metadata["Title"] not in ('No Track', ''):
+                        first_metadata = True
+                    # A new track starts from zero unless BlueZ says otherwise
+                    playback["position"] = 0
+                    playback["timestamp"] = now
+
+            if 'Position' in props:
+                playback["position"] = int(props['Position'])
+                playback["timestamp"] = now
+
+            if 'Browsable' in props:
+                library_player = self.player_path if props['Browsable'] else None
+                if self._library_player != library_player:
+                    self._library_player = library_player
+                    fields.append('library_root')
+
+            if playback != self._playback:
+                self._playback = playback
+                fields.append('playback')
+            if fields:
+                self._changed(*fields)
+
+        if first_metadata:
+            self._mark('first_metadata')
 
     def properties_changed(self, interface, changed_properties, invalidated_properties, path):
         """ Handles property changes for devices and players. """
+        props = self.get_object_properties(path, interface)
+        if props is not None:
+            props.update(changed_properties)
+            for name in invalidated_properties:
+                props.pop(name, None)
+
         if interface == DEVICE_INTERFACE:
-            with self.lock:
+            self._queue_device_change(path, changed_properties)
+
+        elif interface == MEDIA_PLAYER_INTERFACE:
+            if path == self.player_path:
+                self._apply_player_properties(changed_properties)
+
+    def _queue_device_change(self, path, changed_properties):
+        """ Merges a device delta into the pending batch and schedules a flush. """
+        pending = self._pending_device_changes.setdefault(path, {})
+        pending.update(changed_properties)
+        if self._device_flush_source is None:
+            self._device_flush_source = GLib.timeout_add(
+                DEVICE_COALESCE_MS, self._flush_device_changes
+            )
+
+    def _flush_device_changes(self):
+        """ Applies all pending device deltas under a single lock acquisition. """
+        self._device_flush_source = None
+        batch = self._pending_device_changes
+        self._pending_device_changes = {}
+
+        connected_devices = []
+        with self.lock:
+            devices_changed = False
+            for path, changed_properties in batch.items():
                 # Update device info
+                fields = {}
                 if path not in self._discovered_devices:
-                    self._discovered_devices[path] = {"name": "Unknown", "paired": False, "connected": False}
-                
+                    # Aged out but still known to BlueZ, which sends no new InterfacesAdded:
+                    # start from the mirror rather than an RSSI-only delta
+                    fields.update(self._mirrored_device_fields(path))
                 if "Name" in changed_properties:
-                    self._discovered_devices[path]["name"] = str(changed_properties["Name"])
+                    fields["name"] = str(changed_properties["Name"])
                 
                 if "Paired" in changed_properties:
-                    self._discovered_devices[path]["paired"] = bool(changed_properties["Paired"])
+                    fields["paired"] = bool(changed_properties["Paired"])
+                
+                if "RSSI" in changed_properties:
+                    fields["rssi"] = int(changed_properties["RSSI"])
                 
                 if "Connected" in changed_properties:
-                    is_connected = bool(changed_properties["Connected"])
-                    self._discovered_devices[path]["connected"] = is_connected
+                    fields["connected"] = bool(changed_properties["Connected"])
+                
+                if self._discovered_devices.update(path, **fields):
+                    devices_changed = True
+                device = self._discovered_devices.get(path)
+                
+                if "Connected" in changed_properties and device is not None:
+                    is_connected = device["connected"]
                     
                     if is_connected:
-                        name = self._discovered_devices[path]["name"]
+                        name = device["name"]
                         print(f"[BT_CTRL] Device connected: {name}")
                         self._connected_device = {"name": name, "path": path}
                         self._status = "Connected"
+                        self._changed('connected_device', 'status')
+                        props = self.get_object_properties(path, DEVICE_INTERFACE) or {}
+                        connected_devices.append((props.get("Address"), name))
                     else:
+                        # Player objects under the device go away with the link
+                        self.invalidate_proxies(path)
                         if self._connected_device and path == self._connected_device["path"]:
                             print(f"[BT_CTRL] Device disconnected: {self._connected_device['name']}")
                             self._connected_device = {"name": "None", "path": None}
                             self._status = "Ready - No Device Connected"
                             self._metadata = {}
+                            self._playback = dict(EMPTY_PLAYBACK)
+                            if self.player_path:
+                                self._forget_library(self.player_path)
                             self.player_iface = None
-                            
-        elif interface == MEDIA_PLAYER_INTERFACE:
-            self.get_player_properties()
+                            self.player_path = None
+                            self._changed('connected_device', 'status', 'metadata', 'playback')
+
+            if devices_changed:
+                self._changed('discovered_devices')
+
+        # File I/O stays outside the lock
+        for address, name in connected_devices:
+            self._mark('device_connected')
+            if address:
+                self.known_devices.record_connection(address, name)
+        return False
 
     def interfaces_added(self, path, interfaces):
         """ Handles newly discovered devices and players. """
+        mirrored = self._objects.setdefault(str(path), {})
+        for interface, props in interfaces.items():
+            mirrored[str(interface)] = dict(props)
+
         if DEVICE_INTERFACE in interfaces:
             props = interfaces[DEVICE_INTERFACE]
             name = str(props.get("Name", "Unknown Device"))
             paired = bool(props.get("Paired", False))
             connected = bool(props.get("Connected", False))
+            rssi = props.get("RSSI")
             
             print(f"[BT_CTRL] Discovered: {name} at {path}")
             with self.lock:
-                self._discovered_devices[path] = {
-                    "name": name,
-                    "paired": paired,
-                    "connected": connected
-                }
+                self._discovered_devices.update(
+                    path,
+                    name=name,
+                    paired=paired,
+                    connected=connected,
+                    rssi=int(rssi) if rssi is not None else None
+                )
+                self._changed('discovered_devices')
         
         if MEDIA_PLAYER_INTERFACE in interfaces:
             print(f"[BT_CTRL] Media player interface added at {path}")
-            GLib.idle_add(self.connect_to_player, path)
+            # Attach right away; the properties came with the signal
+            self.connect_to_player(str(path))
+
+    def interfaces_removed(self, path, interfaces):
+        """ Handles devices and players that BlueZ has dropped. """
+        path = str(path)
+        self.invalidate_proxies(path)
+        mirrored = self._objects.get(path)
+        if mirrored is not None:
+            for interface in interfaces:
+                mirrored.pop(str(interface), None)
+            if not mirrored:
+                del self._objects[path]
+
+        if DEVICE_INTERFACE in interfaces:
+            self._pending_device_changes.pop(path, None)
+            self.cancel_job(path)
+            with self.lock:
+                if self._discovered_devices.remove(path):
+                    print(f"[BT_CTRL] Removed device at {path}")
+                    self._changed('discovered_devices')
+                if self._jobs.pop(path, None) is not None:
+                    self._changed('jobs')
 
+        if MEDIA_PLAYER_INTERFACE in interfaces:
+            with self.lock:
+                self._forget_library(path)
+            if path == self.player_path:
+                print(f"[BT_CTRL] Media player removed at {path}")
+                self.player_iface = None
+                self.player_path = None
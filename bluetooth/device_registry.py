@@ -0,0 +1,100 @@
+from collections import OrderedDict
+import time
+
+
+# --- Registry defaults ---
+DEVICE_REGISTRY_MAX = 64  # devices kept while scanning
+DEVICE_MAX_AGE = 120  # seconds an unseen, unpaired device is kept
+DEVICE_FIELDS = ("name", "paired", "connected", "rssi")
+
+
+class DeviceRegistry:
+    """ Bounded table of discovered devices with LRU and age-based eviction.
+
+    Entries are ordered by when they were last seen. Paired and connected
+    devices are pinned and never evicted; everything else ages out after
+    ``max_age`` seconds or when the table grows past ``max_devices``.
+    Not thread-safe: the controller guards it with its lock.
+    """
+    def __init__(self, max_devices=DEVICE_REGISTRY_MAX, max_age=DEVICE_MAX_AGE):
+        self.max_devices = max_devices
+        self.max_age = max_age
+        self._devices = OrderedDict()
+
+    def __contains__(self, path):
+        return path in self._devices
+
+    def __len__(self):
+        return len(self._devices)
+
+    def get(self, path):
+        return self._devices.get(path)
+
+    def update(self, path, **fields):
+        """ Adds or refreshes a device; returns True if a visible field changed. """
+        device = self._devices.get(path)
+        if device is None:
+            device = {"name": "Unknown", "paired": False, "connected": False, "rssi": None}
+            self._devices[path] = device
+            changed = True
+        else:
+            self._devices.move_to_end(path)
+            changed = False
+
+        for key, value in fields.items():
+            if device.get(key) != value:
+                device[key] = value
+                changed = True
+        device["last_seen"] = time.monotonic()
+
+        if len(self._devices) > self.max_devices:
+            changed = self._evict_oldest() or changed
+        return changed
+
+    def remove(self, path):
+        """ Drops a device; returns True if it was present. """
+        return self._devices.pop(path, None) is not None
+
+    def evict(self, now=None):
+        """ Drops devices unseen for max_age and trims to max_devices. """
+        if now is None:
+            now = time.monotonic()
+        stale = [
+            path for path, device in self._devices.items()
+            if not self._pinned(device) and now - device["last_seen"] > self.max_age
+        ]
+        for path in stale:
+            del self._devices[path]
+        evicted = len(stale)
+        while len(self._devices) > self.max_devices and self._evict_oldest():
+            evicted += 1
+        return evicted
+
+    def ranked(self, limit=None):
+        """ Returns (path, device) pairs: connected, then paired, then by RSSI. """
+        def rank(item):
+            device = item[1]
+            rssi = device["rssi"] if device["rssi"] is not None else -999
+            return (not device["connected"], not device["paired"], -rssi, device["name"])
+        items = sorted(self._devices.items(), key=rank)
+        if limit is not None:
+            items = items[:limit]
+        return [(path, {key: device[key] for key in DEVICE_FIELDS}) for path, device in items]
+
+    def as_dict(self):
+        """ Returns a copy of every device keyed by path. """
+        return {
+            path: {key: device[key] for key in DEVICE_FIELDS}
+            for path, device in self._devices.items()
+        }
+
+    @staticmethod
+    def _pinned(device):
+        return device["paired"] or device["connected"]
+
+    def _evict_oldest(self):
+        for path, device in self._devices.items():
+            if not self._pinned(device):
+                del self._devices[path]
+                return True
+        return False
@@ -0,0 +1,76 @@
+import json
+import os
+import time
+
+from state_store import StateStore
+
+
+# --- Persistence defaults ---
+KNOWN_DEVICES_KEY = 'bluetooth.known_devices'
+KNOWN_DEVICES_FILE = 'known_devices.json'  # where older versions kept the list
+MAX_KNOWN_DEVICES = 8
+
+
+class KnownDevices:
+    """ Persisted list of phones we have connected to, most recent first.
+
+    Entries are keyed by Bluetooth address so they survive adapter path
+    changes. The list lives in the StateStore of state_dir (by default
+    MINI_MATT_STATE_DIR or ~/.config/mini-matt), which writes changes in
+    coalesced batches.
+    """
+    def __init__(self, state_dir=None, max_devices=MAX_KNOWN_DEVICES):
+        self.store = StateStore.shared(state_dir)
+        self.max_devices = max_devices
+        self._devices = self._load()
+
+    def _load(self):
+        devices = self.store.get(KNOWN_DEVICES_KEY)
+        if devices is None:
+            devices = self._migrate()
+        return [d for d in devices if d.get("address")]
+
+    def _migrate(self):
+        """ Move a known_devices.json from before the state store into it. """
+        path = os.path.join(self.store.state_dir, KNOWN_DEVICES_FILE)
+        try:
+            with open(path) as f:
+                devices = json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"[BT_CTRL] Ignoring unreadable {path}: {e}")
+            return []
+        self.store.set(KNOWN_DEVICES_KEY, devices)
+        self.store.flush()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return devices
+
+    def _save(self):
+        self.store.set(KNOWN_DEVICES_KEY, self._devices)
+
+    def priority(self):
+        """ Returns known devices ordered from most to least recently connected. """
+        return [dict(device) for device in self._devices]
+
+    def record_connection(self, address, name):
+        """ Moves a device to the front of the list. """
+        address = str(address)
+        self._devices = [d for d in self._devices if d["address"] != address]
+        self._devices.insert(0, {
+            "address": address,
+            "name": str(name),
+            "last_connected": time.time(),
+        })
+        del self._devices[self.max_devices:]
+        self._save()
+
+    def forget(self, address):
+        address = str(address)
+        devices = [d for d in self._devices if d["address"] != address]
+        if len(devices) != len(self._devices):
+            self._devices = devices
+            self._save()
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+
+# --- Library cache defaults ---
+LIBRARY_PAGE_SIZE = 50  # items per ListItems call
+LIBRARY_CACHE_PAGES = 200  # listing pages kept across all folders and players
+
+
+def root_folder(player_path):
+    """ Returns the object path of a player's filesystem root folder. """
+    return player_path + '/Filesystem'
+
+
+def parse_item(path, props):
+    """ Flattens MediaItem1 properties into the dict kept in the cache. """
+    metadata = props.get("Metadata", {})
+    return {
+        "path": str(path),
+        "name": str(props.get("Name", metadata.get("Title", ""))),
+        "type": str(props.get("Type", "audio")),
+        "playable": bool(props.get("Playable", False)),
+        "artist": str(metadata.get("Artist", "")),
+        "duration": int(metadata.get("Duration", 0)),
+    }
+
+
+class LibraryCache:
+    """ LRU of AVRCP folder listings, one entry per page.
+
+    Pages are keyed by (player path, folder path, page number) so listings
+    from a previous phone never leak into the current one. Folder sizes are
+    kept beside the pages, letting views lay out a whole folder before most
+    of it is loaded. Not thread-safe: the controller guards it with its lock.
+    """
+    def __init__(self, max_pages=LIBRARY_CACHE_PAGES, page_size=LIBRARY_PAGE_SIZE):
+        self.max_pages = max_pages
+        self.page_size = page_size
+        self._pages = OrderedDict()
+        self._sizes = {}
+
+    def __contains__(self, key):
+        return key in self._pages
+
+    def __len__(self):
+        return len(self._pages)
+
+    def get(self, player, folder, page):
+        """ Returns a cached page and marks it recently used, or None. """
+        key = (player, folder, page)
+        items = self._pages.get(key)
+        if items is not None:
+            self._pages.move_to_end(key)
+        return items
+
+    def put(self, player, folder, page, items):
+        """ Stores a page, evicting the least recently used ones past max_pages. """
+        key = (player, folder, page)
+        self._pages[key] = items
+        self._pages.move_to_end(key)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def size(self, player, folder):
+        """ Returns the number of items in a folder, or None if not known yet. """
+        return self._sizes.get((player, folder))
+
+    def set_size(self, player, folder, size):
+        """ Records a folder's item count; returns True if it changed. """
+        key = (player, folder)
+        if self._sizes.get(key) == size:
+            return False
+        self._sizes[key] = size
+        return True
+
+    def past_end(self, player, folder, page):
+        """ True if page starts beyond the known end of the folder. """
+        size = self._sizes.get((player, folder))
+        return page < 0 or (size is not None and page * self.page_size >= size)
+
+    def drop_player(self, player):
+        """ Forgets every listing from a player; returns True if any were cached. """
+        stale = [key for key in self._pages if key[0] == player]
+        for key in stale:
+            del self._pages[key]
+        for key in [key for key in self._sizes if key[0] == player]:
+            del self._sizes[key]
+        return bool(stale)
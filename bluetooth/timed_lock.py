@@ -0,0 +1,41 @@
+import threading
+import time
+from collections import deque
+
+
+# --- Lock instrumentation defaults ---
+LOCK_WAIT_SAMPLES = 4096  # most recent waits kept; None keeps all of them
+
+
+class TimedLock:
+    """ threading.Lock stand-in that records how long each acquire waited.
+
+    Drop-in for the controller lock when hunting contention: the
+    performance overlay and the Bluetooth benchmark swap it in before the
+    controller thread starts.
+    """
+    def __init__(self, max_samples=LOCK_WAIT_SAMPLES):
+        self._lock = threading.Lock()
+        self.waits = deque(maxlen=max_samples)
+        self.acquisitions = 0
+
+    def acquire(self, blocking=True, timeout=-1):
+        start = time.perf_counter()
+        acquired = self._lock.acquire(blocking, timeout)
+        self.waits.append(time.perf_counter() - start)
+        if acquired:
+            self.acquisitions += 1
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
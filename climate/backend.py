@@ -0,0 +1,308 @@
+import os
+import threading
+import time
+
+from subscription import Subscription
+
+
+# --- Climate model ---
+SIDES = ('left', 'right')
+TEMPERATURE_RANGE = (60, 90)  # °F
+FAN_RANGE = (0, 5)
+DEFAULT_SETPOINT = {"temperature": 70, "fan_speed": 1}
+
+# --- State fields published to subscribers ---
+STATE_FIELDS = ('status', 'setpoints', 'cabin')
+
+# --- Persistence ---
+SETPOINTS_KEY = 'climate.setpoints'  # StateStore key of the last setpoints
+
+# --- Setpoint coalescing ---
+SETPOINT_COALESCE_MS = 400  # quiet time after the last tap before a setpoint is sent
+SETPOINT_MAX_DELAY_MS = 1000  # ... but a held button still sends at least this often
+POLL_INTERVAL = 0.05  # longest the backend thread waits on the bus at a time
+BUS_RETRY_DELAY = 1.0  # seconds to wait after a bus error
+
+# --- Feedback ---
+STATUS_TIMEOUT = 2.0  # seconds without a status report before the HVAC counts as silent
+ECHO_GRACE = 1.0  # seconds after sending in which reported setpoints may predate it
+
+# --- Simulated HVAC ---
+SIMULATED_START_TEMPERATURE = 78.0  # °F, a car parked in the sun
+SIMULATED_STATUS_PERIOD = 0.5  # seconds between simulated status reports
+SIMULATED_RATE = 0.1  # °F per second per fan step the cabin moves towards the setpoint
+
+
+def clamp(value, limits):
+    low, high = limits
+    return max(low, min(high, value))
+
+
+def approach(cabin, setpoint, fan_speed, seconds):
+    """ Cabin temperature after `seconds` of the fan pushing it towards setpoint. """
+    step = SIMULATED_RATE * fan_speed * seconds
+    if cabin < setpoint:
+        return min(setpoint, cabin + step)
+    return max(setpoint, cabin - step)
+
+
+def create_backend(store=None):
+    """ The SocketCAN backend when MINI_MATT_CAN names an interface, else the simulation. """
+    from .socketcan import CAN_ENV, SocketCANBackend
+    interface = os.environ.get(CAN_ENV)
+    if interface:
+        return SocketCANBackend(interface, store=store)
+    return SimulatedBackend(store=store)
+
+
+class ClimateBackend(threading.Thread):
+    """ Talks to the HVAC on its own thread: setpoints out, cabin state back.
+
+    The UI calls set_temperature() and set_fan() on the Kivy thread. A new
+    setpoint is published at once, so the controls respond on the next
+    frame. It is only sent once no change has been made for
+    SETPOINT_COALESCE_MS, so a burst of + taps produces one frame carrying
+    the final value rather than one frame per tap. What the HVAC reports
+    back (its setpoints, the temperature in each zone) is published through
+    the same change subscriptions as the BluetoothController.
+
+    With a StateStore the setpoints survive a restart: the saved ones are
+    shown from the first frame and sent once the bus is open.
+
+    Subclasses implement open(), close(), send(setpoints) and
+    receive(timeout), which waits at most timeout seconds for the bus and
+    passes what it read to _report().
+    """
+    name = "HVAC"
+    reporting_status = "Connected"  # status while the HVAC reports
+
+    def __init__(self, store=None):
+        super().__init__()
+        self.daemon = True
+        self.lock = threading.Lock()
+        self.store = store
+        self._status = "Connecting..."
+        self._setpoints = {side: dict(DEFAULT_SETPOINT) for side in SIDES}
+        self._cabin = {side: None for side in SIDES}
+        self._version = 0
+        self._subscriptions = []
+        self._running = True
+
+        # Coalescing: the first and the latest change not sent yet
+        self._unsent_since = None
+        self._changed_at = None
+        self._sent_at = 0.0
+        self._reported_at = None
+        self.frames_sent = 0
+        self._restore()
+
+    # --- Persistence ---
+    def _restore(self):
+        """ Start from the saved setpoints, queued to be sent like a tap. """
+        saved = self.store.get(SETPOINTS_KEY) if self.store else None
+        if not isinstance(saved, dict):
+            return
+        for side in SIDES:
+            values = saved.get(side) or {}
+            for key, limits in (("temperature", TEMPERATURE_RANGE), ("fan_speed", FAN_RANGE)):
+                if isinstance(values.get(key), (int, float)):
+                    self._setpoints[side][key] = clamp(values[key], limits)
+        if self._setpoints != {side: DEFAULT_SETPOINT for side in SIDES}:
+            self._unsent_since = self._changed_at = time.monotonic()
+
+    def _save(self, setpoints):
+        if self.store:
+            self.store.set(SETPOINTS_KEY, setpoints)
+
+    # --- Change subscriptions ---
+    def subscribe(self, callback, fields=None):
+        """ Call ``callback(StateChange)`` on the Kivy thread when state changes.
+
+        ``fields`` limits delivery to a subset of STATE_FIELDS. The current
+        state is delivered once on the next frame so views can sync up.
+        """
+        subscription = Subscription(self, callback, fields)
+        with self.lock:
+            self._subscriptions.append(subscription)
+            subscription._queue(STATE_FIELDS, self._version)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def _changed(self, *fields):
+        """ Publish a state change; the caller must hold the lock. """
+        self._version += 1
+        for subscription in self._subscriptions:
+            subscription._queue(fields, self._version)
+
+    def snapshot(self):
+        """ Returns a consistent copy of all published state in one lock pass. """
+        with self.lock:
+            return {
+                "version": self._version,
+                "status": self._status,
+                "setpoints": {side: values.copy() for side, values in self._setpoints.items()},
+                "cabin": self._cabin.copy(),
+            }
+
+    # --- Setpoints (Kivy thread) ---
+    def set_temperature(self, side, temperature):
+        self._set(side, "temperature", clamp(temperature, TEMPERATURE_RANGE))
+
+    def set_fan(self, side, fan_speed):
+        self._set(side, "fan_speed", clamp(fan_speed, FAN_RANGE))
+
+    def _set(self, side, key, value):
+        now = time.monotonic()
+        with self.lock:
+            if self._setpoints[side][key] == value:
+                return
+            self._setpoints[side][key] = value
+            if self._unsent_since is None:
+                self._unsent_since = now
+            self._changed_at = now
+            self._changed('setpoints')
+            setpoints = {side: values.copy() for side, values in self._setpoints.items()}
+        self._save(setpoints)
+
+    # --- Backend thread ---
+    def run(self):
+        try:
+            self.open()
+        except Exception as e:
+            print(f"[CLIMATE] {self.name} unavailable: {e}")
+            self._set_status(f"{self.name} unavailable")
+            return
+        self._set_status(f"Waiting for {self.name}...")
+        while self._running:
+            try:
+                self.receive(self._wait_time())
+            except OSError as e:
+                # Bus down (interface removed, buffer full, ...); keep trying
+                print(f"[CLIMATE] Reading from {self.name} failed: {e}")
+                self._set_status(f"{self.name} error")
+                time.sleep(BUS_RETRY_DELAY)
+            self._flush()
+            self._check_silence()
+        self.close()
+
+    def stop(self):
+        self._running = False
+
+    def _wait_time(self):
+        with self.lock:
+            if self._unsent_since is None:
+                return POLL_INTERVAL
+            due = min(self._changed_at + SETPOINT_COALESCE_MS / 1000,
+                      self._unsent_since + SETPOINT_MAX_DELAY_MS / 1000)
+        return min(POLL_INTERVAL, max(0.0, due - time.monotonic()))
+
+    def _flush(self):
+        """ Send the setpoints once the taps have settled. """
+        now = time.monotonic()
+        with self.lock:
+            if self._unsent_since is None:
+                return
+            if (now - self._changed_at < SETPOINT_COALESCE_MS / 1000
+                    and now - self._unsent_since < SETPOINT_MAX_DELAY_MS / 1000):
+                return
+            setpoints = {side: values.copy() for side, values in self._setpoints.items()}
+            self._unsent_since = self._changed_at = None
+            self._sent_at = now
+        try:
+            self.send(setpoints)
+            self.frames_sent += 1
+        except Exception as e:
+            print(f"[CLIMATE] Sending setpoints failed: {e}")
+            self._set_status(f"{self.name} error")
+            with self.lock:
+                # Try again with whatever is current after the next quiet period
+                if self._unsent_since is None:
+                    self._unsent_since = self._changed_at = time.monotonic()
+
+    def _report(self, setpoints=None, cabin=None):
+        """ Publish what the HVAC reported; called from receive(). """
+        now = time.monotonic()
+        with self.lock:
+            fields = []
+            self._reported_at = now
+            if self._status != self.reporting_status:
+                self._status = self.reporting_status
+                fields.append('status')
+            if cabin is not None and cabin != self._cabin:
+                self._cabin = dict(cabin)
+                fields.append('cabin')
+            # Adopt the HVAC's setpoints (changed at the dash, say) unless ours are on their way
+            if (setpoints is not None and self._unsent_since is None
+                    and now - self._sent_at > ECHO_GRACE and setpoints != self._setpoints):
+                self._setpoints = {side: dict(values) for side, values in setpoints.items()}
+                fields.append('setpoints')
+            if fields:
+                self._changed(*fields)
+            adopted = ({side: values.copy() for side, values in self._setpoints.items()}
+                       if 'setpoints' in fields else None)
+        if adopted:
+            self._save(adopted)
+
+    def _check_silence(self):
+        with self.lock:
+            reported_at = self._reported_at
+            connected = self._status == self.reporting_status
+        if connected and time.monotonic() - reported_at > STATUS_TIMEOUT:
+            print(f"[CLIMATE] No status from {self.name} for {STATUS_TIMEOUT}s")
+            self._set_status(f"No response from {self.name}")
+
+    def _set_status(self, status):
+        with self.lock:
+            if self._status != status:
+                self._status = status
+                self._changed('status')
+
+    # --- Bus access, implemented by subclasses ---
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send(self, setpoints):
+        raise NotImplementedError
+
+    def receive(self, timeout):
+        raise NotImplementedError
+
+
+class SimulatedBackend(ClimateBackend):
+    """ HVAC stand-in for cars (and desks) without a bus.
+
+    Accepts setpoints like the real unit and reports a cabin that warms or
+    cools towards them, faster at higher fan speeds, so the UI exercises
+    the same coalescing and feedback path. Its status says it is simulated,
+    so the made-up cabin is never taken for a real car's.
+    """
+    name = "Simulated HVAC"
+    reporting_status = "Simulated (no CAN bus)"
+
+    def open(self):
+        self._unit = {side: dict(DEFAULT_SETPOINT) for side in SIDES}
+        self._zones = {side: SIMULATED_START_TEMPERATURE for side in SIDES}
+        self._last_step = time.monotonic()
+
+    def send(self, setpoints):
+        self._unit = setpoints
+
+    def receive(self, timeout):
+        time.sleep(timeout)
+        now = time.monotonic()
+        elapsed = now - self._last_step
+        if elapsed < SIMULATED_STATUS_PERIOD:
+            return
+        self._last_step = now
+        for side, setpoint in self._unit.items():
+            self._zones[side] = approach(self._zones[side], setpoint["temperature"],
+                                         setpoint["fan_speed"], elapsed)
+        self._report(setpoints=self._unit,
+                     cabin={side: round(value, 1) for side, value in self._zones.items()})
@@ -0,0 +1,88 @@
+import socket
+import struct
+
+from .backend import SIDES, ClimateBackend
+
+CAN_ENV = 'MINI_MATT_CAN'  # interface name, e.g. can0 or vcan0
+
+# --- Frames ---
+# Setpoint command (sent): left °F, right °F, left fan, right fan, rolling counter.
+# Status (received): the unit's setpoints in the same four bytes, then the left
+# and right zone temperatures as little-endian int16 tenths of a °F.
+SETPOINT_FRAME_ID = 0x3E0
+STATUS_FRAME_ID = 0x3E1
+CAN_FRAME = struct.Struct('=IB3x8s')  # struct can_frame: id, length, padding, data
+STATUS_ZONES = struct.Struct('<hh')
+
+
+def to_byte(value):
+    """ A setpoint as one data byte; restored state may hold floats. """
+    return max(0, min(0xFF, int(round(value))))
+
+
+def encode_setpoints(setpoints, counter):
+    left, right = setpoints['left'], setpoints['right']
+    return bytes((to_byte(left['temperature']), to_byte(right['temperature']),
+                  to_byte(left['fan_speed']), to_byte(right['fan_speed']),
+                  counter & 0xFF, 0, 0, 0))
+
+
+def decode_status(data):
+    """ (setpoints, cabin) from a status frame's data, or None if it is too short. """
+    if len(data) < 8:
+        return None
+    setpoints = {side: {"temperature": data[index], "fan_speed": data[index + 2]}
+                 for index, side in enumerate(SIDES)}
+    zones = STATUS_ZONES.unpack_from(data, 4)
+    cabin = {side: zone / 10 for side, zone in zip(SIDES, zones)}
+    return setpoints, cabin
+
+
+class SocketCANBackend(ClimateBackend):
+    """ HVAC on a CAN bus through Linux SocketCAN (a vcan interface works too).
+
+    Uses a raw CAN socket from the standard library, filtered in the kernel
+    to the status frame, so the thread only wakes for frames it decodes.
+    """
+    name = "HVAC"
+
+    def __init__(self, interface, setpoint_id=SETPOINT_FRAME_ID, status_id=STATUS_FRAME_ID,
+                 store=None):
+        super().__init__(store=store)
+        self.interface = interface
+        self.setpoint_id = setpoint_id
+        self.status_id = status_id
+        self.sock = None
+        self._counter = 0
+
+    def open(self):
+        self.sock = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+        # Match the flags too, so extended and remote frames sharing the low 11 bits stay out
+        mask = socket.CAN_EFF_FLAG | socket.CAN_RTR_FLAG | socket.CAN_SFF_MASK
+        self.sock.setsockopt(socket.SOL_CAN_RAW, socket.CAN_RAW_FILTER,
+                             struct.pack('=II', self.status_id, mask))
+        self.sock.bind((self.interface,))
+        print(f"[CLIMATE] Listening on {self.interface}")
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def send(self, setpoints):
+        self._counter += 1
+        data = encode_setpoints(setpoints, self._counter)
+        self.sock.send(CAN_FRAME.pack(self.setpoint_id, len(data), data))
+
+    def receive(self, timeout):
+        self.sock.settimeout(timeout)
+        try:
+            frame = self.sock.recv(CAN_FRAME.size)
+        except (socket.timeout, BlockingIOError):  # a zero timeout does not block
+            return
+        can_id, length, data = CAN_FRAME.unpack(frame)
+        if can_id != self.status_id:
+            return
+        decoded = decode_status(data[:length])
+        if decoded:
+            self._report(*decoded)
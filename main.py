@@ -1,21 +1,47 @@
+from startup_profiler import profiler  # first, so it sees every import
+
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.core.window import Window
 from kivy.clock import Clock
+from kivy.uix.label import Label
 
+from ui.perf_monitor import PerfMonitor
+from ui.perf_overlay import PerfOverlay
 from ui.sidebar import SidebarNavigation
-from pages.music_page import MusicPage
-from pages.maps_page import MapsPage
-from pages.climate_page import ClimatePage
-from pages.settings_page import SettingsPage
-from pages.mini_matt_page import MiniMattPage
+from ui.page_registry import PageRegistry
+from ui.render_scale_layout import RenderScaleLayout
 from ui.theme import Theme
+from ui.touch_recorder import TouchRecorder
+from state_store import StateStore
+
+# Pages are imported and built on first navigation
+PAGES = {
+    'music': ('pages.music_page', 'MusicPage'),
+    'maps': ('pages.maps_page', 'MapsPage'),
+    'climate': ('pages.climate_page', 'ClimatePage'),
+    'settings': ('pages.settings_page', 'SettingsPage'),
+    'mini-matt': ('pages.mini_matt_page', 'MiniMattPage'),
+}
+START_PAGE = 'music'
+
+# Show a first frame before importing the start page (D-Bus, GLib, ...)
+STAGED_STARTUP = True
+
+KEY_F12 = 293  # toggles the performance overlay
+
+# Time Clock callbacks from before any page exists
+if PerfMonitor.enabled_by_env():
+    PerfMonitor.shared().install()
 
 class CarDashboardApp(App):
     def build(self):
+        profiler.mark('build')
         # Configure window for car dashboard (vertical orientation)
         Window.size = (640, 1024)  # 20% smaller portrait orientation
-        Window.clearcolor = Theme.BACKGROUND_COLOR
+        # Saved settings apply before anything is drawn
+        Theme.apply_dark_mode(bool(StateStore.shared().get(Theme.DARK_MODE_KEY, False)))
+        Theme.paint(Window, 'background', 'clearcolor')
         
         # Main layout
         self.main_layout = BoxLayout(orientation='horizontal')
@@ -24,17 +50,20 @@ class CarDashboardApp(App):
         self.sidebar = SidebarNavigation()
         self.sidebar.bind_navigation(self.navigate_to_page)
         
-        # Create pages
-        self.pages = {
-            'music': MusicPage(),
-            'maps': MapsPage(),
-            'climate': ClimatePage(),
-            'settings': SettingsPage(),
-            'mini-matt': MiniMattPage(),
-        }
+        # Page registry; only the start page is built during boot
+        self.pages = PageRegistry(PAGES)
+        self.touch_recorder = None  # set in on_start when recording
+        self.telemetry = None  # set once startup finished, when configured
         
-        # Current page container
-        self.content_area = BoxLayout()
+        # Current page container, drawn at reduced resolution when asked for.
+        # Unset, pages and their text are drawn at native resolution; below 1
+        # the page text is upscaled along with the rest of the page.
+        render_scale = RenderScaleLayout.from_env()
+        if render_scale:
+            scale, adaptive = render_scale
+            self.content_area = RenderScaleLayout(scale=scale, adaptive=adaptive)
+        else:
+            self.content_area = BoxLayout()
         
         # Add components to main layout
         self.main_layout.add_widget(self.sidebar)
@@ -42,19 +71,78 @@ class CarDashboardApp(App):
         
         # Start with music page
         self.current_page = None
-        self.navigate_to_page('music')
+        if STAGED_STARTUP:
+            # A placeholder is on screen while the start page loads in the background
+            self.current_page = Label(
+                text="Starting...",
+                font_size=Theme.FONT_SIZE_MEDIUM
+            )
+            Theme.paint(self.current_page, 'secondary')
+            self.content_area.add_widget(self.current_page)
+        else:
+            self.navigate_to_page(START_PAGE)
+        Window.bind(on_flip=self.on_first_frame)
+        Window.bind(on_key_down=self.on_key_down)
         
         return self.main_layout
     
+    def on_start(self):
+        # MINI_MATT_RECORD_TOUCHES=1 records a session for benchmarks.bench_replay
+        if TouchRecorder.enabled_by_env():
+            self.touch_recorder = TouchRecorder()
+            self.touch_recorder.start(page=START_PAGE)
+    
+    def on_first_frame(self, *args):
+        """Load pages once something is on screen"""
+        Window.unbind(on_flip=self.on_first_frame)
+        profiler.mark('first_frame')
+        self.pages.preload([START_PAGE], self.show_start_page)
+    
+    def show_start_page(self):
+        # Leave the user where they are if they navigated meanwhile
+        if not self.pages.built():
+            self.navigate_to_page(START_PAGE)
+        profiler.mark('start_page_ready')
+        
+        # Warm the other pages so first visits are quick too
+        others = [name for name in PAGES if name != START_PAGE]
+        self.pages.preload(others, self.on_startup_finished)
+    
+    def on_key_down(self, window, key, *args):
+        if key == KEY_F12:
+            PerfOverlay.toggle()
+            return True
+        return False
+    
+    def on_startup_finished(self):
+        profiler.mark('pages_preloaded')
+        profiler.write_report()
+        self.telemetry = self.start_telemetry()
+    
+    def start_telemetry(self):
+        """Decode vehicle signals when MINI_MATT_DBC and MINI_MATT_TELEMETRY are set"""
+        try:
+            from telemetry.store import TelemetryStore
+        except ImportError as e:  # NumPy is only needed for telemetry
+            print(f"[TELEMETRY] Unavailable: {e}")
+            return None
+        return TelemetryStore.shared()
+    
     def navigate_to_page(self, page_name):
         """Navigate to a specific page"""
         if page_name in self.pages:
-            # Remove current page
+            page = self.pages.get(page_name)
+            if page is self.current_page:
+                return
+            
+            # Remove current page and let it pause its Clock events
             if self.current_page:
+                if hasattr(self.current_page, 'on_page_exit'):
+                    self.current_page.on_page_exit()
                 self.content_area.remove_widget(self.current_page)
             
             # Add new page
-            self.current_page = self.pages[page_name]
+            self.current_page = page
             self.content_area.add_widget(self.current_page)
             
             # Update sidebar selection
@@ -66,9 +154,19 @@ class CarDashboardApp(App):
     
     def on_stop(self):
         """Clean up when app closes"""
-        for page in self.pages.values():
-            if hasattr(page, 'on_page_exit'):
+        if self.touch_recorder:
+            self.touch_recorder.stop()
+            self.touch_recorder.save()
+            self.touch_recorder = None
+        for name, page in self.pages.built():
+            if hasattr(page, 'on_page_destroy'):
+                page.on_page_destroy()
+            elif hasattr(page, 'on_page_exit'):
                 page.on_page_exit()
+        if self.telemetry:
+            self.telemetry.stop()
+        # Pending settings and setpoints would otherwise wait out their coalescing delay
+        StateStore.flush_all()
 
 if __name__ == '__main__':
     CarDashboardApp().run()
@@ -1,42 +1,54 @@
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
-from kivy.uix.button import Button
 
+from climate.backend import FAN_RANGE, TEMPERATURE_RANGE, clamp, create_backend
+from ui.repeat_button import RepeatButton
+from ui.telemetry_panel import TelemetryPanel
 from ui.theme import Theme
+from ui.view_binding import ViewBinding
+from state_store import StateStore
 
 class TempControl(BoxLayout):
     """Temperature and fan speed controls for a single side."""
-    def __init__(self, side_name: str, **kwargs):
+    def __init__(self, side_name: str, side=None, backend=None, **kwargs):
         super().__init__(orientation='vertical', spacing=Theme.SPACING_MEDIUM, **kwargs)
         self.side_name = side_name
+        self.side = side or side_name.lower()
+        self.backend = backend
         self.temperature = 70
         self.fan_speed = 1
+        self.cabin = None
 
         self.title = Label(text=side_name, font_size=Theme.FONT_SIZE_MEDIUM,
-                           color=Theme.PRIMARY_COLOR, size_hint_y=None,
-                           height=Theme.HEADER_HEIGHT)
+                           size_hint_y=None, height=Theme.HEADER_HEIGHT)
+        Theme.paint(self.title, 'primary')
         self.add_widget(self.title)
 
-        self.temp_label = Label(text=f"{self.temperature}°F", font_size=Theme.FONT_SIZE_LARGE,
-                                color=Theme.ACCENT_COLOR)
+        self.temp_label = Label(text=f"{self.temperature}°F", font_size=Theme.FONT_SIZE_LARGE)
+        Theme.paint(self.temp_label, 'accent')
+        self.cabin_label = Label(font_size=Theme.FONT_SIZE_SMALL, size_hint_y=None,
+                                 height=Theme.BUTTON_HEIGHT / 2)
+        Theme.paint(self.cabin_label, 'secondary')
         temp_controls = BoxLayout(size_hint_y=None, height=Theme.BUTTON_HEIGHT,
                                   spacing=Theme.SPACING_SMALL)
-        btn_up = Button(text="＋")
-        btn_down = Button(text="－")
+        # Held buttons repeat; the backend sends a setpoint each second while held and once let go
+        btn_up = RepeatButton(text="＋")
+        btn_down = RepeatButton(text="－")
         btn_up.bind(on_press=lambda *_: self.change_temp(1))
         btn_down.bind(on_press=lambda *_: self.change_temp(-1))
         temp_controls.add_widget(btn_down)
         temp_controls.add_widget(btn_up)
 
         self.add_widget(self.temp_label)
+        self.add_widget(self.cabin_label)
         self.add_widget(temp_controls)
 
-        self.fan_label = Label(text=f"Fan {self.fan_speed}", font_size=Theme.FONT_SIZE_NORMAL,
-                               color=Theme.PRIMARY_COLOR)
+        self.fan_label = Label(text=f"Fan {self.fan_speed}", font_size=Theme.FONT_SIZE_NORMAL)
+        Theme.paint(self.fan_label, 'primary')
         fan_controls = BoxLayout(size_hint_y=None, height=Theme.BUTTON_HEIGHT,
                                  spacing=Theme.SPACING_SMALL)
-        fan_up = Button(text="＋")
-        fan_down = Button(text="－")
+        fan_up = RepeatButton(text="＋")
+        fan_down = RepeatButton(text="－")
         fan_up.bind(on_press=lambda *_: self.change_fan(1))
         fan_down.bind(on_press=lambda *_: self.change_fan(-1))
         fan_controls.add_widget(fan_down)
@@ -45,22 +57,107 @@ class TempControl(BoxLayout):
         self.add_widget(self.fan_label)
         self.add_widget(fan_controls)
 
+        self.view = ViewBinding()
+        self.view.bind('temperature', self.temp_label, convert=lambda t: f"{t}°F")
+        self.view.bind('fan_speed', self.fan_label, convert=lambda f: f"Fan {f}")
+        self.view.bind('cabin', self.cabin_label,
+                       convert=lambda c: "Cabin --" if c is None else f"Cabin {c:.1f}°F")
+        self.update_view()
+
     def change_temp(self, delta):
-        self.temperature = max(60, min(90, self.temperature + delta))
-        self.temp_label.text = f"{self.temperature}°F"
+        self.temperature = clamp(self.temperature + delta, TEMPERATURE_RANGE)
+        self.update_view()
+        if self.backend:
+            self.backend.set_temperature(self.side, self.temperature)
 
     def change_fan(self, delta):
-        self.fan_speed = max(0, min(5, self.fan_speed + delta))
-        self.fan_label.text = f"Fan {self.fan_speed}"
+        self.fan_speed = clamp(self.fan_speed + delta, FAN_RANGE)
+        self.update_view()
+        if self.backend:
+            self.backend.set_fan(self.side, self.fan_speed)
+
+    def apply_state(self, setpoint, cabin):
+        """Show the backend's setpoint and measured temperature for this side."""
+        self.temperature = setpoint['temperature']
+        self.fan_speed = setpoint['fan_speed']
+        self.cabin = cabin
+        self.update_view()
+
+    def update_view(self):
+        # Presses at the limits leave the labels untouched
+        self.view.update({'temperature': self.temperature, 'fan_speed': self.fan_speed,
+                          'cabin': self.cabin})
 
 
 class ClimatePage(BoxLayout):
     """Climate control page with left and right controls."""
     def __init__(self, **kwargs):
-        super().__init__(orientation='horizontal', padding=Theme.PADDING_LARGE,
+        super().__init__(orientation='vertical', padding=Theme.PADDING_LARGE,
                          spacing=Theme.SPACING_LARGE, **kwargs)
-        self.left = TempControl("Left")
-        self.right = TempControl("Right")
-        self.add_widget(self.left)
-        self.add_widget(self.right)
+        self.backend = None
+        self.subscription = None
+        self.telemetry_panel = None
+        self.setup_backend()
+
+        self.status_label = Label(text="Climate: Connecting...", font_size=Theme.FONT_SIZE_SMALL,
+                                  size_hint_y=None, height=Theme.BUTTON_HEIGHT / 2)
+        Theme.paint(self.status_label, 'secondary')
+        if not self.backend:
+            self.status_label.text = "Climate: Unavailable"
+        self.add_widget(self.status_label)
+
+        controls = BoxLayout(orientation='horizontal', spacing=Theme.SPACING_LARGE)
+        # Not self.left/self.right: those are Widget position properties
+        self.left_control = TempControl("Left", backend=self.backend)
+        self.right_control = TempControl("Right", backend=self.backend)
+        controls.add_widget(self.left_control)
+        controls.add_widget(self.right_control)
+        self.add_widget(controls)
+
+        self.view = ViewBinding().bind('status', self.status_label,
+                                       convert=lambda s: f"Climate: {s}")
+        if self.backend:
+            # Saved setpoints are on screen from the page's first frame
+            self.update_climate(None)
+
+    def setup_backend(self):
+        """Start the HVAC backend (SocketCAN when configured, else simulated)"""
+        try:
+            self.backend = create_backend(StateStore.shared())
+            self.backend.start()
+        except Exception as e:
+            print(f"[CLIMATE] Failed to start the climate backend: {e}")
+            self.backend = None
+
+    def update_climate(self, change):
+        """Apply the backend's state; one call per frame however many reports arrived"""
+        state = self.backend.snapshot()
+        self.view.update({'status': state['status']})
+        for control in (self.left_control, self.right_control):
+            control.apply_state(state['setpoints'][control.side], state['cabin'][control.side])
+
+    def on_page_enter(self):
+        """Follow the backend while shown; the first delivery catches the page up"""
+        if self.backend and not self.subscription:
+            self.subscription = self.backend.subscribe(self.update_climate)
+        # Vehicle signals (outside temperature, ...) once telemetry has started
+        if not self.telemetry_panel:
+            self.telemetry_panel = TelemetryPanel.for_app('climate')
+            if self.telemetry_panel:
+                self.add_widget(self.telemetry_panel)
+        if self.telemetry_panel:
+            self.telemetry_panel.start()
+
+    def on_page_exit(self):
+        """The backend keeps running and sending; the page stops following it"""
+        if self.subscription:
+            self.subscription.cancel()
+            self.subscription = None
+        if self.telemetry_panel:
+            self.telemetry_panel.stop()
 
+    def on_page_destroy(self):
+        """Called when the app closes"""
+        self.on_page_exit()
+        if self.backend:
+            self.backend.stop()
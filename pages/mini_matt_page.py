@@ -1,15 +1,28 @@
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 
+from ui.telemetry_panel import TelemetryPanel
 from ui.theme import Theme
 
 
 class MiniMattPage(BoxLayout):
-    """Placeholder page for future AI assistant functionality."""
+    """Placeholder page for the future AI assistant, with the vehicle signals it will read."""
     def __init__(self, **kwargs):
         super().__init__(orientation='vertical', padding=Theme.PADDING_LARGE,
                          spacing=Theme.SPACING_LARGE, **kwargs)
-        self.add_widget(Label(text="mini-matt", font_size=Theme.FONT_SIZE_LARGE,
-                              color=Theme.PRIMARY_COLOR))
+        self.add_widget(Theme.paint(Label(text="mini-matt", font_size=Theme.FONT_SIZE_LARGE),
+                                    'primary'))
+        self.telemetry_panel = None
 
+    def on_page_enter(self):
+        """Show the app's telemetry once it has been started, and follow it while shown"""
+        if not self.telemetry_panel:
+            self.telemetry_panel = TelemetryPanel.for_app('mini_matt')
+            if self.telemetry_panel:
+                self.add_widget(self.telemetry_panel)
+        if self.telemetry_panel:
+            self.telemetry_panel.start()
 
+    def on_page_exit(self):
+        if self.telemetry_panel:
+            self.telemetry_panel.stop()
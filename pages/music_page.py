@@ -4,14 +4,37 @@ from kivy.uix.button import Button
 from kivy.uix.modalview import ModalView
 from kivy.uix.recycleview import RecycleView
 from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.progressbar import ProgressBar
 from ui.cover_image import CoverImage
 from kivy.properties import BooleanProperty
 from kivy.clock import Clock
-from kivy.graphics import Color, Rectangle, RoundedRectangle
 from gi.repository import GLib
+import time
 
 from ui.theme import Theme
-from bluetooth.controller import BluetoothController
+from ui.panel_batch import PanelBatch
+from ui.perf_monitor import PerfMonitor
+from ui.view_binding import ViewBinding
+from bluetooth.controller import BluetoothController, DeviceJob, playback_position
+from bluetooth.media_library import LIBRARY_PAGE_SIZE
+
+PROGRESS_FPS = 30
+OPTIMISTIC_TIMEOUT = 1.5  # seconds before an unconfirmed tap is rolled back
+LIBRARY_ROW_HEIGHT = 60
+
+
+def format_time(ms):
+    """Format milliseconds as m:ss"""
+    seconds = int(ms // 1000)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+JOB_STEP_LABELS = {
+    'pair': "Pairing...",
+    'connect': "Connecting...",
+    'disconnect': "Disconnecting...",
+}
 
 class ModernButton(Button):
     """Modern styled button for the car dashboard"""
@@ -19,28 +42,24 @@ class ModernButton(Button):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.background_color = (0, 0, 0, 0)  # Transparent
-        self.color = Theme.PRIMARY_COLOR
-        
-        with self.canvas.before:
-            Color(*Theme.SIDEBAR_COLOR)
-            self.bg_rect = RoundedRectangle(
-                pos=self.pos,
-                size=self.size,
-                radius=[8]
-            )
+        Theme.paint(self, 'primary')
         
-        self.bind(pos=self.update_bg, size=self.update_bg)
+        # Own background until a container batches it with its neighbours
+        self.panel_batch = PanelBatch(self)
+        self.panel_batch.add(self, 'sidebar', radius=8)
     
-    def update_bg(self, *args):
-        self.bg_rect.pos = self.pos
-        self.bg_rect.size = self.size
+    def join_batch(self, panel_batch, anchor=None):
+        """Draw the background in a container's batch instead of our own"""
+        self.panel_batch.remove(self)
+        self.panel_batch = panel_batch
+        panel_batch.add(self, 'sidebar', radius=8, anchor=anchor)
     
     def on_press(self):
         # Highlight effect
-        self.canvas.before.children[0].rgba = Theme.SIDEBAR_SELECTED_COLOR
+        self.panel_batch.set_role(self, 'sidebar_selected')
     
     def on_release(self):
-        self.canvas.before.children[0].rgba = Theme.SIDEBAR_COLOR
+        self.panel_batch.set_role(self, 'sidebar')
 
 class DeviceRow(RecycleDataViewBehavior, BoxLayout):
     """Modern device row for the car interface"""
@@ -56,35 +75,27 @@ class DeviceRow(RecycleDataViewBehavior, BoxLayout):
         self.size_hint_y = None
         self.height = Theme.LIST_ITEM_HEIGHT
         
-        # Background
-        with self.canvas.before:
-            Color(*Theme.BACKGROUND_COLOR)
-            self.bg_rect = RoundedRectangle(
-                pos=self.pos,
-                size=self.size,
-                radius=[6]
-            )
-        
-        self.bind(pos=self.update_bg, size=self.update_bg)
+        # Background joins the list's batch on the first refresh
+        self.panel_batch = None
         
         # Device info
         info_layout = BoxLayout(orientation='vertical', spacing=4)
         
         self.name_label = Label(
             font_size=Theme.FONT_SIZE_NORMAL,
-            color=Theme.PRIMARY_COLOR,
             text_size=(None, None),
             halign='left',
             valign='center'
         )
+        Theme.paint(self.name_label, 'primary')
         
         self.status_label = Label(
             font_size=Theme.FONT_SIZE_SMALL,
-            color=Theme.SECONDARY_COLOR,
             text_size=(None, None),
             halign='left',
             valign='center'
         )
+        Theme.paint(self.status_label, 'secondary')
         
         info_layout.add_widget(self.name_label)
         info_layout.add_widget(self.status_label)
@@ -99,31 +110,58 @@ class DeviceRow(RecycleDataViewBehavior, BoxLayout):
         
         self.add_widget(info_layout)
         self.add_widget(self.action_button)
+        
+        self.view = ViewBinding()
+        self.view.bind('name', self.name_label)
+        self.view.bind('status', self.status_label)
+        self.view.bind_role('status_role', self.status_label)
+        self.view.bind('action', self.action_button)
     
-    def update_bg(self, *args):
-        self.bg_rect.pos = self.pos
-        self.bg_rect.size = self.size
+    def join_batch(self, panel_batch):
+        """Draw this row's panels with the rest of the list while it is attached"""
+        self.panel_batch = panel_batch
+        panel_batch.add(self, 'background', radius=6, anchor=self)
+        self.action_button.join_batch(panel_batch, anchor=self)
     
     def refresh_view_attrs(self, rv, index, data):
+        if self.panel_batch is None:
+            self.join_batch(getattr(rv, 'panel_batch', None) or PanelBatch(self))
         self.index = index
         self.device_path = data.get('id', '')
-        self.name_label.text = data.get('name', 'Unknown Device')
+        model = {'name': data.get('name', 'Unknown Device')}
         
         paired = data.get('paired', False)
         connected = data.get('connected', False)
-        
-        if connected:
-            self.status_label.text = "Connected"
-            self.status_label.color = Theme.SUCCESS_COLOR
-            self.action_button.text = "Disconnect"
+        job = data.get('job')
+        
+        if job and job['state'] in (DeviceJob.QUEUED, DeviceJob.RUNNING):
+            if job['state'] == DeviceJob.QUEUED:
+                model['status'] = "Waiting..."
+            elif job['attempt'] > 1:
+                model['status'] = f"{JOB_STEP_LABELS[job['step']]} (try {job['attempt']})"
+            else:
+                model['status'] = JOB_STEP_LABELS[job['step']]
+            model['status_role'] = 'accent'
+            model['action'] = "Cancel"
+        elif job and job['state'] == DeviceJob.FAILED:
+            model['status'] = "Failed"
+            model['status_role'] = 'error'
+            model['action'] = "Connect" if paired else "Pair"
+        elif connected:
+            model['status'] = "Connected"
+            model['status_role'] = 'success'
+            model['action'] = "Disconnect"
         elif paired:
-            self.status_label.text = "Paired"
-            self.status_label.color = Theme.WARNING_COLOR
-            self.action_button.text = "Connect"
+            model['status'] = "Paired"
+            model['status_role'] = 'warning'
+            model['action'] = "Connect"
         else:
-            self.status_label.text = "Available"
-            self.status_label.color = Theme.SECONDARY_COLOR
-            self.action_button.text = "Pair"
+            model['status'] = "Available"
+            model['status_role'] = 'secondary'
+            model['action'] = "Pair"
+        
+        # Recycled rows keep their widgets, so unchanged values are skipped
+        self.view.update(model)
         
         return super().refresh_view_attrs(rv, index, data)
     
@@ -161,9 +199,9 @@ class DeviceManagerModal(ModalView):
         header_label = Label(
             text="Bluetooth Devices",
             font_size=Theme.FONT_SIZE_LARGE,
-            color=Theme.PRIMARY_COLOR,
             halign='left'
         )
+        Theme.paint(header_label, 'primary')
         header_label.bind(size=header_label.setter('text_size'))
         
         close_button = ModernButton(
@@ -191,58 +229,350 @@ class DeviceManagerModal(ModalView):
             font_size=Theme.FONT_SIZE_NORMAL
         )
         self.scan_button.bind(on_press=self.toggle_scan)
+        self.view = ViewBinding().bind('scan_text', self.scan_button)
         
         controls_layout.add_widget(self.scan_button)
         layout.add_widget(controls_layout)
         
         # Device list
         self.device_list = RecycleView()
+        device_layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, Theme.LIST_ITEM_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=Theme.SPACING_SMALL
+        )
+        device_layout.bind(minimum_height=device_layout.setter('height'))
+        self.device_list.add_widget(device_layout)
+        # viewclass lives on the layout manager, so set it once one is added
         self.device_list.viewclass = DeviceRow
+        # Rows draw their backgrounds and buttons here, one mesh per color
+        self.device_list.panel_batch = PanelBatch(device_layout)
         layout.add_widget(self.device_list)
         
         self.add_widget(layout)
         
-        # Update timer
-        Clock.schedule_interval(self.update_device_list, 1)
+        self.subscription = None
+    
+    def on_open(self):
+        # Only follow the controller while the list is on screen
+        if self.music_page.bt_controller and not self.subscription:
+            self.subscription = self.music_page.bt_controller.subscribe(
+                self.update_device_list,
+                fields=('discovered_devices', 'jobs', 'is_scanning')
+            )
+    
+    def on_dismiss(self):
+        if self.subscription:
+            self.subscription.cancel()
+            self.subscription = None
     
     def toggle_scan(self, instance):
         if self.music_page.bt_controller:
             GLib.idle_add(self.music_page.bt_controller.toggle_discovery)
     
-    def update_device_list(self, dt):
+    def update_device_list(self, change):
         if not self.music_page.bt_controller:
             return
             
-        devices = self.music_page.bt_controller.discovered_devices
+        devices = self.music_page.bt_controller.ranked_devices()
+        jobs = self.music_page.bt_controller.jobs
         is_scanning = self.music_page.bt_controller.is_scanning
         
-        self.scan_button.text = "Stop Scanning" if is_scanning else "Scan for Devices"
+        self.view.update({'scan_text': "Stop Scanning" if is_scanning else "Scan for Devices"})
         
-        self.device_list.data = [
+        self.apply_row_diff([
             {
                 'id': path,
                 'name': data['name'],
                 'paired': data['paired'],
                 'connected': data['connected'],
+                'job': jobs.get(path),
                 'height': Theme.LIST_ITEM_HEIGHT
             }
-            for path, data in devices.items()
-        ]
+            for path, data in devices
+        ])
+    
+    def apply_row_diff(self, rows):
+        """Turn the list into rows, refreshing only the rows that changed
+        
+        Any edit of the data list makes the layout invalidate every view, so
+        rows whose id and position hold are updated in place and only their
+        visible view is refreshed. Inserts, removes and moves fall back to one
+        assignment of the whole list.
+        """
+        data = self.device_list.data
+        if [item['id'] for item in data] != [row['id'] for row in rows]:
+            self.device_list.data = rows
+            return
+        
+        adapter = self.device_list.view_adapter
+        for index, row in enumerate(rows):
+            if data[index] == row:
+                continue
+            data[index].clear()
+            data[index].update(row)
+            view = adapter.get_visible_view(index)
+            if view is not None:
+                adapter.refresh_view_attrs(index, data[index], view)
     
     def handle_device_action(self, device_path, action):
         if not self.music_page.bt_controller:
             return
             
-        if action == "Disconnect":
+        if action == "Cancel":
+            GLib.idle_add(self.music_page.bt_controller.cancel_job, device_path)
+        elif action == "Disconnect":
             GLib.idle_add(self.music_page.bt_controller.disconnect_device, device_path)
         elif action == "Connect":
             GLib.idle_add(self.music_page.bt_controller.pair_and_connect_device, device_path)
         else:  # "Pair"
             GLib.idle_add(self.music_page.bt_controller.pair_and_connect_device, device_path)
 
+class LibraryRow(ButtonBehavior, RecycleDataViewBehavior, BoxLayout):
+    """Folder or track row in the library browser"""
+    index = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.padding = [Theme.PADDING_MEDIUM, Theme.PADDING_SMALL]
+        
+        self.name_label = Label(
+            font_size=Theme.FONT_SIZE_NORMAL,
+            halign='left',
+            valign='center',
+            shorten=True
+        )
+        Theme.paint(self.name_label, 'primary')
+        self.name_label.bind(size=self.name_label.setter('text_size'))
+        
+        self.detail_label = Label(
+            font_size=Theme.FONT_SIZE_SMALL,
+            halign='left',
+            valign='center',
+            shorten=True
+        )
+        Theme.paint(self.detail_label, 'secondary')
+        self.detail_label.bind(size=self.detail_label.setter('text_size'))
+        
+        self.add_widget(self.name_label)
+        self.add_widget(self.detail_label)
+        
+        self.view = ViewBinding()
+        self.view.bind('name', self.name_label)
+        self.view.bind_role('name_role', self.name_label)
+        self.view.bind('detail', self.detail_label)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        if data.get('loading'):
+            model = {'name': "Loading...", 'name_role': 'secondary', 'detail': ""}
+        elif data['type'] == 'folder':
+            model = {'name': data['name'], 'name_role': 'primary', 'detail': "Folder"}
+        else:
+            detail = data['artist']
+            if data['duration']:
+                detail = f"{detail}  {format_time(data['duration'])}".strip()
+            model = {'name': data['name'], 'name_role': 'primary', 'detail': detail}
+        self.view.update(model)
+        return super().refresh_view_attrs(rv, index, data)
+    
+    def on_release(self):
+        parent = self.parent
+        while parent and not hasattr(parent, 'handle_library_item'):
+            parent = parent.parent
+        if parent:
+            parent.handle_library_item(self.index)
+
+class LibraryModal(ModalView):
+    """Browse the phone's library, loading folder listings a page at a time"""
+    
+    def __init__(self, music_page, **kwargs):
+        super().__init__(**kwargs)
+        self.music_page = music_page
+        self.size_hint = (0.85, 0.8)
+        self.auto_dismiss = False
+        
+        self.subscription = None
+        self.root_folder = None
+        self.folders = []  # (path, name) from the root down to the open folder
+        self.loaded_pages = set()
+        self.load_trigger = Clock.create_trigger(self.load_visible_pages)
+        
+        layout = BoxLayout(
+            orientation='vertical',
+            padding=Theme.PADDING_LARGE,
+            spacing=Theme.SPACING_LARGE
+        )
+        
+        # Header
+        header_layout = BoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height=60,
+            spacing=Theme.SPACING_MEDIUM
+        )
+        
+        self.back_button = ModernButton(
+            text="Back",
+            size_hint_x=None,
+            width=100,
+            font_size=Theme.FONT_SIZE_NORMAL
+        )
+        self.back_button.bind(on_press=lambda *_: self.go_back())
+        
+        self.title_label = Label(
+            text="Library",
+            font_size=Theme.FONT_SIZE_LARGE,
+            halign='left',
+            shorten=True
+        )
+        Theme.paint(self.title_label, 'primary')
+        self.title_label.bind(size=self.title_label.setter('text_size'))
+        
+        close_button = ModernButton(
+            text="✕",
+            size_hint_x=None,
+            width=60,
+            font_size=Theme.FONT_SIZE_MEDIUM
+        )
+        close_button.bind(on_press=self.dismiss)
+        
+        header_layout.add_widget(self.back_button)
+        header_layout.add_widget(self.title_label)
+        header_layout.add_widget(close_button)
+        layout.add_widget(header_layout)
+        
+        # Only rows on screen get widgets; fixed heights keep layout O(1) per row
+        self.item_list = RecycleView()
+        item_layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, LIBRARY_ROW_HEIGHT),
+            default_size_hint=(1, None),
+            size_hint_y=None
+        )
+        item_layout.bind(minimum_height=item_layout.setter('height'))
+        self.item_list.add_widget(item_layout)
+        self.item_list.viewclass = LibraryRow
+        self.item_list.bind(scroll_y=lambda *_: self.load_trigger())
+        layout.add_widget(self.item_list)
+        
+        self.add_widget(layout)
+    
+    @property
+    def controller(self):
+        return self.music_page.bt_controller
+    
+    def on_open(self):
+        if self.controller and not self.subscription:
+            self.subscription = self.controller.subscribe(
+                self.update_library,
+                fields=('library_root', 'library')
+            )
+    
+    def on_dismiss(self):
+        if self.subscription:
+            self.subscription.cancel()
+            self.subscription = None
+        self.load_trigger.cancel()
+    
+    def open_folder(self, path, name):
+        self.folders.append((path, name))
+        self.show_folder()
+    
+    def go_back(self):
+        if len(self.folders) > 1:
+            self.folders.pop()
+            self.show_folder()
+    
+    def show_folder(self):
+        """Start the open folder from an empty list scrolled to the top"""
+        self.loaded_pages = set()
+        self.item_list.data = []
+        self.item_list.scroll_y = 1
+        if self.folders:
+            self.title_label.text = self.folders[-1][1]
+        else:
+            self.title_label.text = "Library unavailable"
+        self.back_button.disabled = len(self.folders) <= 1
+        self.update_library(None)
+    
+    def update_library(self, change):
+        """Lay the folder out at full length and fill in pages that have arrived"""
+        if not self.controller:
+            return
+        
+        root = self.controller.library_root
+        if root != self.root_folder:
+            # New phone, or the phone stopped offering browsing
+            self.root_folder = root
+            self.folders = [(root, "Library")] if root else []
+            self.show_folder()
+            return
+        if not self.folders:
+            return
+        
+        folder = self.folders[-1][0]
+        size = self.controller.library_size(folder)
+        if size is None:
+            size = (len(self.loaded_pages) + 1) * LIBRARY_PAGE_SIZE
+        
+        # Placeholder rows let the whole folder scroll before it is loaded
+        data = self.item_list.data
+        if len(data) < size:
+            data.extend({'loading': True} for _ in range(size - len(data)))
+        elif len(data) > size:
+            del data[size:]
+        
+        for page in self.visible_pages():
+            if page in self.loaded_pages:
+                continue
+            items = self.controller.library_page(folder, page)
+            if items is not None:
+                start = page * LIBRARY_PAGE_SIZE
+                data[start:start + len(items)] = items
+                self.loaded_pages.add(page)
+        self.load_trigger()
+    
+    def visible_pages(self):
+        """Pages overlapping the scrolled viewport"""
+        total = len(self.item_list.data)
+        if not total:
+            return range(0, 1)
+        viewport = self.item_list.height
+        hidden = max(total * LIBRARY_ROW_HEIGHT - viewport, 0)
+        top = (1 - self.item_list.scroll_y) * hidden
+        first = int(top // LIBRARY_ROW_HEIGHT)
+        last = min(int((top + viewport) // LIBRARY_ROW_HEIGHT), total - 1)
+        return range(first // LIBRARY_PAGE_SIZE, last // LIBRARY_PAGE_SIZE + 1)
+    
+    def load_visible_pages(self, dt):
+        """Ask the controller for on-screen pages that are still placeholders"""
+        if not self.controller or not self.folders:
+            return
+        folder = self.folders[-1][0]
+        for page in self.visible_pages():
+            if page not in self.loaded_pages:
+                GLib.idle_add(self.controller.browse, folder, page)
+    
+    def handle_library_item(self, index):
+        item = self.item_list.data[index]
+        if item.get('loading'):
+            return
+        if item['type'] == 'folder':
+            self.open_folder(item['path'], item['name'])
+        elif item['playable']:
+            GLib.idle_add(self.controller.play_item, item['path'])
+            self.dismiss()
+
 class MusicPage(BoxLayout):
     """Main music page with modern car dashboard styling"""
     
+    # The UI benchmarks swap in a controller fed with synthetic state
+    controller_class = BluetoothController
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.orientation = 'vertical'
@@ -250,9 +580,16 @@ class MusicPage(BoxLayout):
         self.spacing = Theme.SPACING_LARGE
         
         self.bt_controller = None
+        self.bt_subscription = None
         self.device_modal = None
+        self.library_modal = None
+        self.playback = None
+        self.progress_event = None
+        self.optimistic_status = None
+        self.optimistic_event = None
         
         self.setup_ui()
+        self.setup_bindings()
         self.setup_bluetooth()
     
     def setup_ui(self):
@@ -261,11 +598,11 @@ class MusicPage(BoxLayout):
         header = Label(
             text="Music Player",
             font_size=Theme.FONT_SIZE_LARGE,
-            color=Theme.PRIMARY_COLOR,
             size_hint_y=None,
             height=Theme.HEADER_HEIGHT,
             halign='left'
         )
+        Theme.paint(header, 'primary')
         header.bind(size=header.setter('text_size'))
         self.add_widget(header)
         
@@ -280,17 +617,17 @@ class MusicPage(BoxLayout):
         self.status_label = Label(
             text="Bluetooth: Initializing...",
             font_size=Theme.FONT_SIZE_NORMAL,
-            color=Theme.SECONDARY_COLOR,
             halign='left'
         )
+        Theme.paint(self.status_label, 'secondary')
         self.status_label.bind(size=self.status_label.setter('text_size'))
         
         self.device_label = Label(
             text="No device connected",
             font_size=Theme.FONT_SIZE_SMALL,
-            color=Theme.SECONDARY_COLOR,
             halign='left'
         )
+        Theme.paint(self.device_label, 'secondary')
         self.device_label.bind(size=self.device_label.setter('text_size'))
         
         self.connection_layout.add_widget(self.status_label)
@@ -319,36 +656,89 @@ class MusicPage(BoxLayout):
         self.title_label = Label(
             text="No track playing",
             font_size=Theme.FONT_SIZE_LARGE,
-            color=Theme.PRIMARY_COLOR,
             bold=True,
             halign='center'
         )
+        Theme.paint(self.title_label, 'primary')
         self.title_label.bind(size=self.title_label.setter('text_size'))
         
         self.artist_label = Label(
             text="",
             font_size=Theme.FONT_SIZE_MEDIUM,
-            color=Theme.SECONDARY_COLOR,
             halign='center'
         )
+        Theme.paint(self.artist_label, 'secondary')
         self.artist_label.bind(size=self.artist_label.setter('text_size'))
         
         self.album_label = Label(
             text="",
             font_size=Theme.FONT_SIZE_NORMAL,
-            color=Theme.SECONDARY_COLOR,
             halign='center'
         )
+        Theme.paint(self.album_label, 'secondary')
         self.album_label.bind(size=self.album_label.setter('text_size'))
         
         self.now_playing_layout.add_widget(self.title_label)
         self.now_playing_layout.add_widget(self.artist_label)
         self.now_playing_layout.add_widget(self.album_label)
+        
+        # Track progress, interpolated locally between Position updates
+        self.progress_bar = ProgressBar(
+            max=1,
+            value=0,
+            size_hint_y=None,
+            height=Theme.SPACING_LARGE
+        )
+        
+        time_layout = BoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height=Theme.SPACING_LARGE
+        )
+        self.elapsed_label = Label(
+            text="",
+            font_size=Theme.FONT_SIZE_SMALL,
+            halign='left'
+        )
+        Theme.paint(self.elapsed_label, 'secondary')
+        self.elapsed_label.bind(size=self.elapsed_label.setter('text_size'))
+        self.duration_label = Label(
+            text="",
+            font_size=Theme.FONT_SIZE_SMALL,
+            halign='right'
+        )
+        Theme.paint(self.duration_label, 'secondary')
+        self.duration_label.bind(size=self.duration_label.setter('text_size'))
+        time_layout.add_widget(self.elapsed_label)
+        time_layout.add_widget(self.duration_label)
+        
+        self.now_playing_layout.add_widget(self.progress_bar)
+        self.now_playing_layout.add_widget(time_layout)
         self.add_widget(self.now_playing_layout)
         
         # Spacer
         self.add_widget(BoxLayout())
         
+        # Transport controls
+        transport_layout = BoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height=Theme.BUTTON_HEIGHT,
+            spacing=Theme.SPACING_MEDIUM
+        )
+        
+        self.previous_button = ModernButton(text="⏮", font_size=Theme.FONT_SIZE_MEDIUM)
+        self.previous_button.bind(on_press=lambda *_: self.skip('Previous'))
+        self.play_pause_button = ModernButton(text="▶", font_size=Theme.FONT_SIZE_MEDIUM)
+        self.play_pause_button.bind(on_press=lambda *_: self.toggle_play_pause())
+        self.next_button = ModernButton(text="⏭", font_size=Theme.FONT_SIZE_MEDIUM)
+        self.next_button.bind(on_press=lambda *_: self.skip('Next'))
+        
+        transport_layout.add_widget(self.previous_button)
+        transport_layout.add_widget(self.play_pause_button)
+        transport_layout.add_widget(self.next_button)
+        self.add_widget(transport_layout)
+        
         # Controls
         controls_layout = BoxLayout(
             orientation='horizontal',
@@ -363,15 +753,41 @@ class MusicPage(BoxLayout):
         )
         self.manage_button.bind(on_press=self.open_device_manager)
         
+        self.browse_button = ModernButton(
+            text="Browse",
+            font_size=Theme.FONT_SIZE_NORMAL,
+            disabled=True
+        )
+        self.browse_button.bind(on_press=self.open_library)
+        
+        controls_layout.add_widget(self.browse_button)
         controls_layout.add_widget(self.manage_button)
         self.add_widget(controls_layout)
     
+    def setup_bindings(self):
+        """Map view-model fields to the widgets that show them"""
+        self.view = ViewBinding()
+        self.view.bind('status_text', self.status_label)
+        self.view.bind_role('status_role', self.status_label)
+        self.view.bind('device_text', self.device_label)
+        self.view.bind_role('device_role', self.device_label)
+        self.view.bind('browse_disabled', self.browse_button, 'disabled')
+        self.view.bind('title', self.title_label)
+        self.view.bind('artist', self.artist_label)
+        self.view.bind('album', self.album_label)
+        self.view.bind_call('art', self.cover_image.set_source)
+        self.view.bind('play_icon', self.play_pause_button)
+        self.view.bind('duration', self.progress_bar, 'max')
+        self.view.bind('position', self.progress_bar, 'value')
+        self.view.bind('elapsed', self.elapsed_label)
+        self.view.bind('total', self.duration_label)
+    
     def setup_bluetooth(self):
         """Initialize Bluetooth controller"""
         try:
-            self.bt_controller = BluetoothController()
+            self.bt_controller = self.controller_class()
+            PerfMonitor.shared().watch_lock('BluetoothController.lock', self.bt_controller)
             self.bt_controller.start()
-            Clock.schedule_interval(self.update_music_info, 0.5)
         except Exception as e:
             print(f"Failed to initialize Bluetooth: {e}")
             self.status_label.text = "Bluetooth: Error"
@@ -382,63 +798,181 @@ class MusicPage(BoxLayout):
             self.device_modal = DeviceManagerModal(self)
         self.device_modal.open()
     
+    def open_library(self, instance):
+        """Open the media library browser"""
+        if not self.library_modal:
+            self.library_modal = LibraryModal(self)
+        self.library_modal.open()
+    
     def handle_device_action(self, device_path, action):
         """Handle device actions from the modal"""
         if self.device_modal:
             self.device_modal.handle_device_action(device_path, action)
     
-    def update_music_info(self, dt):
-        """Update music information display"""
+    def update_music_info(self, change):
+        """Update music information display when controller state changes"""
         if not self.bt_controller:
             return
         
-        # Update connection status
-        status = self.bt_controller.status
+        state = self.bt_controller.snapshot()
+        self.view.update(self.music_view_model(state))
+        
+        # Keep an optimistic guess until the phone confirms or a player command fails;
+        # other errors (a failed pairing, say) say nothing about playback
+        self.playback = state['playback']
+        if (self.optimistic_status == self.playback['status']
+                or 'command_error' in change.fields):
+            self.clear_optimistic()
+        self.apply_playback()
+    
+    def music_view_model(self, state):
+        """Derive what the labels should show from a controller snapshot"""
+        model = {}
+        
+        # Connection status
+        status = state['status']
         if "Error" in status:
-            self.status_label.color = Theme.ERROR_COLOR
+            model['status_role'] = 'error'
         elif "Connected" in status:
-            self.status_label.color = Theme.SUCCESS_COLOR
+            model['status_role'] = 'success'
         else:
-            self.status_label.color = Theme.SECONDARY_COLOR
-        
-        self.status_label.text = f"Bluetooth: {status}"
+            model['status_role'] = 'secondary'
+        model['status_text'] = f"Bluetooth: {status}"
         
-        # Update device info
-        device = self.bt_controller.connected_device
+        # Device info
+        device = state['connected_device']
         if device['name'] != 'None':
-            self.device_label.text = f"Connected to: {device['name']}"
-            self.device_label.color = Theme.SUCCESS_COLOR
+            model['device_text'] = f"Connected to: {device['name']}"
+            model['device_role'] = 'success'
         else:
-            self.device_label.text = "No device connected"
-            self.device_label.color = Theme.SECONDARY_COLOR
+            model['device_text'] = "No device connected"
+            model['device_role'] = 'secondary'
         
-        # Update track info
-        metadata = self.bt_controller.metadata
+        # Browsing needs a phone that exposes its library over AVRCP
+        model['browse_disabled'] = not state['library_root']
+        
+        # Track info
+        metadata = state['metadata']
         title = metadata.get('Title', '')
         artist = metadata.get('Artist', '')
         album = metadata.get('Album', '')
-        art = metadata.get('ArtUrl', '')
         
         if title and title not in ['No Track', '---', '']:
-            self.title_label.text = title
-            self.artist_label.text = artist if artist and artist != '---' else ''
-            self.album_label.text = album if album and album != '---' else ''
+            model['title'] = title
+            model['artist'] = artist if artist and artist != '---' else ''
+            model['album'] = album if album and album != '---' else ''
         else:
-            self.title_label.text = "No track playing"
-            self.artist_label.text = ""
-            self.album_label.text = ""
-
-        if art:
-            self.cover_image.set_source(art)
+            model['title'] = "No track playing"
+            model['artist'] = ""
+            model['album'] = ""
+        model['art'] = metadata.get('ArtUrl', '')
+        return model
+    
+    def apply_playback(self):
+        """Render play state and progress, preferring an optimistic status"""
+        playback = self.playback
+        if self.optimistic_status:
+            playback = dict(playback, status=self.optimistic_status)
+        
+        playing = playback['status'] == 'playing'
+        self.view.update({'play_icon': "⏸" if playing else "▶"})
+        
+        # Update progress and only animate it while something is playing
+        self.update_progress(0)
+        if playing and playback['duration']:
+            if not self.progress_event:
+                self.progress_event = Clock.schedule_interval(self.update_progress, 1 / PROGRESS_FPS)
+        elif self.progress_event:
+            self.progress_event.cancel()
+            self.progress_event = None
+    
+    def update_progress(self, dt):
+        """Interpolate the progress bar from the last known position"""
+        duration = self.playback['duration'] if self.playback else 0
+        if not duration:
+            self.view.update({'position': 0, 'elapsed': "", 'total': ""})
+            return
+        
+        if self.optimistic_status == 'paused':
+            return
+        # Labels only re-render when the whole second or the track length changes;
+        # max goes first because the bar clamps value to it
+        position = playback_position(self.playback)
+        self.view.update({
+            'duration': duration,
+            'position': position,
+            'elapsed': format_time(position),
+            'total': format_time(duration),
+        })
+    
+    def send_command(self, command):
+        """Send a transport command on the D-Bus thread"""
+        if self.bt_controller:
+            GLib.idle_add(self.bt_controller.player_command, command)
+    
+    def skip(self, command):
+        """Restart progress locally right away; the new track's state replaces it"""
+        if self.playback and self.playback['duration']:
+            self.playback = dict(self.playback, position=0, timestamp=time.monotonic())
+            self.update_progress(0)
+        self.send_command(command)
+    
+    def toggle_play_pause(self):
+        """Flip play state immediately, then confirm with the phone"""
+        if not self.playback:
+            return
+        status = self.optimistic_status or self.playback['status']
+        if status == 'playing':
+            self.set_optimistic('paused')
+            self.send_command('Pause')
         else:
-            self.cover_image.set_source('')
+            self.set_optimistic('playing')
+            self.send_command('Play')
+    
+    def set_optimistic(self, status):
+        """Show status before the phone confirms it, rolling back on timeout"""
+        self.optimistic_status = status
+        if self.optimistic_event:
+            self.optimistic_event.cancel()
+        self.optimistic_event = Clock.schedule_once(
+            lambda dt: self.rollback_optimistic(), OPTIMISTIC_TIMEOUT)
+        self.apply_playback()
+    
+    def clear_optimistic(self):
+        self.optimistic_status = None
+        if self.optimistic_event:
+            self.optimistic_event.cancel()
+            self.optimistic_event = None
+    
+    def rollback_optimistic(self):
+        """The phone never confirmed the tap; show its real state again"""
+        self.optimistic_event = None
+        self.optimistic_status = None
+        self.apply_playback()
     
     def on_page_enter(self):
         """Called when page becomes active"""
-        pass
+        # The first delivery carries the full state, so the page catches up
+        if self.bt_controller and not self.bt_subscription:
+            self.bt_subscription = self.bt_controller.subscribe(
+                self.update_music_info,
+                fields=('status', 'connected_device', 'metadata', 'playback', 'command_error',
+                        'library_root')
+            )
     
     def on_page_exit(self):
-        """Called when leaving page"""
+        """Called when leaving page; Bluetooth keeps running, the UI stops following it"""
+        if self.bt_subscription:
+            self.bt_subscription.cancel()
+            self.bt_subscription = None
+        if self.progress_event:
+            self.progress_event.cancel()
+            self.progress_event = None
+        self.clear_optimistic()
+    
+    def on_page_destroy(self):
+        """Called when the app closes"""
+        self.on_page_exit()
         if self.bt_controller and hasattr(self.bt_controller, 'mainloop'):
             if self.bt_controller.mainloop:
                 self.bt_controller.mainloop.quit()
@@ -2,34 +2,54 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.switch import Switch
 from kivy.uix.anchorlayout import AnchorLayout
-from kivy.core.window import Window
 
+from ui.perf_overlay import PerfOverlay
 from ui.theme import Theme
+from state_store import StateStore
 
 
 class SettingsPage(BoxLayout):
-    """Settings page with dark mode toggle."""
+    """Settings page with dark mode and performance overlay toggles."""
     def __init__(self, **kwargs):
         super().__init__(orientation='vertical', padding=Theme.PADDING_LARGE,
                          spacing=Theme.SPACING_LARGE, **kwargs)
         header = Label(text="Settings", font_size=Theme.FONT_SIZE_LARGE,
-                       color=Theme.PRIMARY_COLOR, size_hint_y=None,
-                       height=Theme.HEADER_HEIGHT)
+                       size_hint_y=None, height=Theme.HEADER_HEIGHT)
+        Theme.paint(header, 'primary')
         self.add_widget(header)
 
         toggle_layout = AnchorLayout(anchor_x='left', anchor_y='top')
+        toggles = BoxLayout(orientation='vertical', size_hint_y=None,
+                            spacing=Theme.SPACING_MEDIUM)
+        toggles.bind(minimum_height=toggles.setter('height'))
         self.switch = Switch(active=Theme.DARK_MODE)
         self.switch.bind(active=self.on_dark_mode_toggle)
-        toggle_label = Label(text="Dark Mode", font_size=Theme.FONT_SIZE_NORMAL,
-                             color=Theme.PRIMARY_COLOR)
+        toggles.add_widget(self.toggle_row("Dark Mode", self.switch))
+        self.perf_switch = Switch(active=PerfOverlay.is_shown())
+        self.perf_switch.bind(active=self.on_perf_overlay_toggle)
+        toggles.add_widget(self.toggle_row("Performance Overlay", self.perf_switch))
+        toggle_layout.add_widget(toggles)
+        self.add_widget(toggle_layout)
+
+    def toggle_row(self, text, switch):
+        toggle_label = Label(text=text, font_size=Theme.FONT_SIZE_NORMAL)
+        Theme.paint(toggle_label, 'primary')
         box = BoxLayout(size_hint_y=None, height=Theme.BUTTON_HEIGHT,
                         spacing=Theme.SPACING_MEDIUM)
         box.add_widget(toggle_label)
-        box.add_widget(self.switch)
-        toggle_layout.add_widget(box)
-        self.add_widget(toggle_layout)
+        box.add_widget(switch)
+        return box
+
+    def on_page_enter(self):
+        # The overlay may have been toggled with F12 meanwhile
+        self.perf_switch.active = PerfOverlay.is_shown()
+
+    def on_perf_overlay_toggle(self, instance, value):
+        if value != PerfOverlay.is_shown():
+            PerfOverlay.toggle()
 
     def on_dark_mode_toggle(self, instance, value):
+        # Every painted widget and the window background follow in place
         Theme.apply_dark_mode(value)
-        Window.clearcolor = Theme.BACKGROUND_COLOR
+        StateStore.shared().set(Theme.DARK_MODE_KEY, value)
 
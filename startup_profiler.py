@@ -0,0 +1,190 @@
+"""Startup phase and import-time profiler for the dashboard.
+
+Import this before anything else in main.py. Phase marks are always
+recorded; with MINI_MATT_PROFILE=1 every module import is timed as well
+and a report is written once startup finishes:
+
+- startup_profile.json: phases and the slowest imports of the last boot
+- startup_history.jsonl: one line of phase times per profiled boot, for
+  spotting time-to-first-frame regressions
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV = 'MINI_MATT_PROFILE'
+PROFILE_DIR = os.path.expanduser('~/.config/mini-matt')
+REPORT_FILE = 'startup_profile.json'
+HISTORY_FILE = 'startup_history.jsonl'
+TOP_IMPORTS = 40  # slowest imports kept in the report
+
+
+def process_age():
+    """Seconds since this process was started, or 0.0 where /proc is unavailable."""
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the command name; starttime is field 22 of the full line
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class _TimedLoader:
+    """Wraps a module loader to time creating and executing the module."""
+
+    def __init__(self, loader, profiler, name):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        # Extension modules do their dlopen here
+        with self._profiler.timing(self._name):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._profiler.timing(self._name):
+            self._loader.exec_module(module)
+
+
+class _TimingFinder:
+    """Meta path entry that hands out timed loaders from the real finders."""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and not isinstance(spec.loader, _TimedLoader):
+                    spec.loader = _TimedLoader(spec.loader, self._profiler, name)
+                return spec
+        return None
+
+
+class _Timing:
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._profiler._enter(self._name)
+
+    def __exit__(self, *exc_info):
+        self._profiler._exit()
+
+
+class StartupProfiler:
+    """Collects startup phase times and, when enabled, per-module import times.
+
+    Times are measured from process start where the OS reports it, so the
+    interpreter's own startup is included. Imports are timed per thread,
+    so modules preloaded in the background are attributed correctly; self
+    time excludes the modules an import pulled in.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._origin = time.perf_counter() - process_age()
+        self.phases = []  # (name, seconds since process start)
+        self._imports = {}  # module -> [self seconds, total seconds, thread name]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._finder = None
+        self._written = False
+
+    def now(self):
+        return time.perf_counter() - self._origin
+
+    def mark(self, phase):
+        """Records that a startup phase was reached."""
+        self.phases.append((phase, self.now()))
+
+    def install_import_hook(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def remove_import_hook(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+
+    def timing(self, name):
+        return _Timing(self, name)
+
+    def _enter(self, name):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        name, start, children = self._local.stack.pop()
+        elapsed = time.perf_counter() - start
+        if self._local.stack:
+            self._local.stack[-1][2] += elapsed
+        with self._lock:
+            record = self._imports.setdefault(
+                name, [0.0, 0.0, threading.current_thread().name])
+            record[0] += elapsed - children
+            record[1] += elapsed
+
+    def report(self):
+        """Returns the phases and slowest imports as a JSON-ready dict."""
+        with self._lock:
+            imports = sorted(self._imports.items(), key=lambda item: item[1][0], reverse=True)
+            total_import = sum(record[0] for _, record in imports)
+        return {
+            "time": time.time(),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases},
+            "imports": {
+                "count": len(imports),
+                "total_ms": round(total_import * 1000, 1),
+                "slowest": [
+                    {
+                        "module": name,
+                        "self_ms": round(self_time * 1000, 2),
+                        "total_ms": round(total * 1000, 2),
+                        "thread": thread,
+                    }
+                    for name, (self_time, total, thread) in imports[:TOP_IMPORTS]
+                ],
+            },
+        }
+
+    def write_report(self, directory=PROFILE_DIR):
+        """Writes the report and appends to the history, once, if profiling is enabled."""
+        if not self.enabled or self._written:
+            return
+        self._written = True
+        self.remove_import_hook()
+        report = self.report()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = os.path.join(directory, REPORT_FILE + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(report, f, indent=2)
+            os.replace(tmp_path, os.path.join(directory, REPORT_FILE))
+            with open(os.path.join(directory, HISTORY_FILE), 'a') as f:
+                f.write(json.dumps({"time": report["time"], **report["phases_ms"]}) + '\n')
+            print(f"[STARTUP] Profile written to {directory}")
+        except Exception as e:
+            print(f"[STARTUP] Error writing profile: {e}")
+
+
+profiler = StartupProfiler(enabled=os.environ.get(PROFILE_ENV) == '1')
+profiler.mark('profiler_imported')
+if profiler.enabled:
+    profiler.install_import_hook()
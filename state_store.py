@@ -0,0 +1,218 @@
+"""Persistent key/value state for settings, climate setpoints and known devices.
+
+The dashboard runs from an SD card and can lose power at any moment, so
+state is kept in an append-only log (state.log, one JSON line per change)
+rather than rewritten in place:
+
+- set() only updates memory. Changes are written together once
+  FLUSH_DELAY seconds have passed since the first unsaved one, with a
+  single append and fsync, so a burst of climate taps costs one write.
+- Only the final value of each key is written per flush.
+- Once the log holds many more lines than live keys it is compacted: a
+  snapshot is written to a temporary file and swapped in with os.replace.
+- Loading replays the log; a line torn by a power cut is skipped.
+
+Set MINI_MATT_STATE_DIR to keep the state somewhere other than
+~/.config/mini-matt (the benchmarks use a temporary directory).
+"""
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+
+STATE_DIR_ENV = 'MINI_MATT_STATE_DIR'
+STATE_DIR = os.path.expanduser('~/.config/mini-matt')
+LOG_FILE = 'state.log'
+
+FLUSH_DELAY = 5.0  # seconds from the first unsaved change to the write
+COMPACT_MIN_LINES = 256  # never compact a log shorter than this
+COMPACT_RATIO = 4  # ... and only once it has this many lines per live key
+
+
+def default_state_dir():
+    return os.environ.get(STATE_DIR_ENV) or STATE_DIR
+
+
+def _fsync_dir(path):
+    """Make a created or replaced file's directory entry durable."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StateStore:
+    """JSON values by dotted key ('settings.dark_mode'), persisted to one log file.
+
+    Safe to use from any thread. Values must be JSON serializable; get()
+    and set() copy them, so callers may keep and change what they hold.
+    """
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, state_dir=None):
+        """The store for a state directory (MINI_MATT_STATE_DIR or ~/.config/mini-matt)."""
+        state_dir = os.path.abspath(state_dir or default_state_dir())
+        with cls._shared_lock:
+            if not cls._shared:
+                atexit.register(cls.flush_all)
+            store = cls._shared.get(state_dir)
+            if store is None:
+                store = cls._shared[state_dir] = cls(state_dir)
+            return store
+
+    @classmethod
+    def flush_all(cls):
+        """Write every shared store's pending changes now, e.g. when the app stops."""
+        with cls._shared_lock:
+            stores = list(cls._shared.values())
+        for store in stores:
+            store.flush()
+
+    def __init__(self, state_dir, flush_delay=FLUSH_DELAY):
+        self.state_dir = state_dir
+        self.path = os.path.join(state_dir, LOG_FILE)
+        self.flush_delay = flush_delay
+        self.lock = threading.Lock()
+        self._write_lock = threading.Lock()  # one flush or compaction at a time
+        self._values = {}
+        self._pending = {}  # key -> encoded log line, in change order
+        self._timer = None
+        self._torn = False  # the log ends mid-line; the next append starts a new one
+        self.lines = 0  # lines in the log file
+        self.writes = 0  # appends and compactions, each one fsync
+        self.compactions = 0
+        self._load()
+
+    def _load(self):
+        start = time.perf_counter()
+        skipped = 0
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    self.lines += 1
+                    self._torn = not line.endswith('\n')
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                        key = entry[0]
+                    except (ValueError, IndexError, TypeError):
+                        skipped += 1  # torn by a power cut mid-append
+                        continue
+                    if len(entry) > 1:
+                        self._values[key] = entry[1]
+                    else:
+                        self._values.pop(key, None)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"[STATE] Could not read {self.path}: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"[STATE] Loaded {len(self._values)} keys from {self.lines} lines "
+              f"in {elapsed_ms:.1f}ms" + (f", skipped {skipped} damaged" if skipped else ""))
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self._values:
+                return default
+            return copy.deepcopy(self._values[key])
+
+    def set(self, key, value):
+        """Change a value; it is written within flush_delay seconds."""
+        line = json.dumps([key, value], separators=(',', ':'))
+        value = json.loads(line)[1]  # our own copy, exactly as it will be read back
+        with self.lock:
+            if key in self._values and self._values[key] == value:
+                return
+            self._values[key] = value
+            self._queue(key, line)
+
+    def delete(self, key):
+        with self.lock:
+            if key not in self._values:
+                return
+            del self._values[key]
+            self._queue(key, json.dumps([key]))
+
+    def _queue(self, key, line):
+        """Remember a change for the next flush; the caller must hold the lock."""
+        self._pending.pop(key, None)  # only the latest value is written
+        self._pending[key] = line
+        self._schedule()
+
+    def _schedule(self):
+        """Start the flush timer unless it runs already; the caller must hold the lock."""
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Append pending changes with one write and one fsync."""
+        with self._write_lock:
+            with self.lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+                live_keys = len(self._values)
+            if not pending:
+                return
+            try:
+                os.makedirs(self.state_dir, exist_ok=True)
+                created = not os.path.exists(self.path)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    if self._torn:
+                        f.write('\n')
+                    f.write(''.join(line + '\n' for line in pending.values()))
+                    f.flush()
+                    os.fsync(f.fileno())
+                if created:
+                    _fsync_dir(self.state_dir)
+            except OSError as e:
+                print(f"[STATE] Error saving state: {e}")
+                self._torn = True  # the append may have stopped mid-line
+                with self.lock:
+                    # Keep newer changes made meanwhile and try again later
+                    for key, line in pending.items():
+                        self._pending.setdefault(key, line)
+                    self._schedule()
+                return
+            self._torn = False
+            self.lines += len(pending)
+            self.writes += 1
+            if self.lines > max(COMPACT_MIN_LINES, COMPACT_RATIO * live_keys):
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the log as one line per live key; the caller holds the write lock."""
+        with self.lock:
+            lines = [json.dumps([key, value], separators=(',', ':'))
+                     for key, value in self._values.items()]
+            # Changes queued meanwhile are in _values, so the next flush rewrites them harmlessly
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(line + '\n' for line in lines))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            _fsync_dir(self.state_dir)
+        except OSError as e:
+            print(f"[STATE] Error compacting {self.path}: {e}")
+            return
+        print(f"[STATE] Compacted {self.lines} lines to {len(lines)}")
+        self.lines = len(lines)
+        self.writes += 1
+        self.compactions += 1
@@ -0,0 +1,52 @@
+from collections import namedtuple
+
+from kivy.clock import Clock
+
+
+StateChange = namedtuple('StateChange', ['version', 'fields'])
+
+
+class Subscription:
+    """Delivers coalesced controller changes to a callback on the Kivy thread.
+
+    Changes are queued from the controller's thread and flushed by a Clock
+    trigger, so any number of changes between two frames results in a single
+    callback. The controller (the BluetoothController, a ClimateBackend)
+    provides ``lock`` and ``unsubscribe()``.
+    """
+    def __init__(self, controller, callback, fields=None):
+        self.controller = controller
+        self.callback = callback
+        self.fields = frozenset(fields) if fields else None
+        self._pending = set()
+        self._version = 0
+        self._trigger = Clock.create_trigger(self._deliver)
+
+    @property
+    def perf_label(self):
+        """Name deliveries are timed under by the performance overlay."""
+        name = getattr(self.callback, '__qualname__', type(self.callback).__name__)
+        return f"Subscription({name})"
+
+    def _queue(self, fields, version):
+        """Record changed fields; the controller lock must be held."""
+        if self.fields is not None:
+            fields = self.fields.intersection(fields)
+        if not fields:
+            return
+        self._pending.update(fields)
+        self._version = version
+        self._trigger()
+
+    def _deliver(self, dt):
+        with self.controller.lock:
+            fields = frozenset(self._pending)
+            version = self._version
+            self._pending.clear()
+        if fields:
+            self.callback(StateChange(version, fields))
+
+    def cancel(self):
+        """Stop receiving change events."""
+        self._trigger.cancel()
+        self.controller.unsubscribe(self)
@@ -0,0 +1,71 @@
+import re
+from collections import namedtuple
+
+# --- DBC subset ---
+# BO_ <id> <name>: <length> <sender>
+MESSAGE_RE = re.compile(r'^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)')
+# SG_ <name> [M|m<n>] : <start>|<length>@<order><sign> (<factor>,<offset>) [<min>|<max>] "<unit>"
+SIGNAL_RE = re.compile(
+    r'^SG_\s+(\w+)\s*(M|m\d+)?\s*:\s*(\d+)\|(\d+)@([01])([+-])\s*'
+    r'\(([^,]+),([^)]+)\)\s*\[([^|]*)\|([^\]]*)\]\s*"([^"]*)"'
+)
+# DBC files mark 29-bit identifiers with bit 31, as SocketCAN's CAN_EFF_FLAG does. It is
+# kept in every frame id, so a standard 0x100 and an extended 0x100 stay different messages.
+EXTENDED_ID_FLAG = 0x80000000
+
+Signal = namedtuple('Signal', ['name', 'start', 'length', 'little_endian', 'signed',
+                               'factor', 'offset', 'minimum', 'maximum', 'unit'])
+Message = namedtuple('Message', ['frame_id', 'name', 'length', 'signals'])
+
+
+def parse_dbc(text):
+    """ Messages in DBC text, keyed by frame id (with EXTENDED_ID_FLAG for 29-bit ids).
+
+    Reads the parts decoding needs: messages and their plain integer
+    signals. Multiplexed signals are skipped, since their meaning depends
+    on another signal's value; so are float signals (SIG_VALTYPE_).
+    """
+    messages = {}
+    message = None
+    float_signals = set()
+    for line in text.splitlines():
+        line = line.strip()
+        match = MESSAGE_RE.match(line)
+        if match:
+            frame_id = int(match.group(1))
+            message = Message(frame_id, match.group(2), int(match.group(3)), [])
+            messages[frame_id] = message
+            continue
+        match = SIGNAL_RE.match(line)
+        if match and message is not None:
+            (name, multiplex, start, length, order, sign,
+             factor, offset, minimum, maximum, unit) = match.groups()
+            if multiplex and multiplex != 'M':
+                continue
+            message.signals.append(Signal(
+                name, int(start), int(length), order == '1', sign == '-',
+                float(factor), float(offset), _number(minimum), _number(maximum), unit))
+            continue
+        if line.startswith('SIG_VALTYPE_'):
+            parts = line.rstrip(';').split()
+            if len(parts) >= 3:
+                float_signals.add((int(parts[1]), parts[2]))
+        if not line.startswith('SG_'):
+            message = None  # a message's signals follow it directly
+
+    for frame_id, message in messages.items():
+        message.signals[:] = [signal for signal in message.signals
+                              if (frame_id, signal.name) not in float_signals]
+    return messages
+
+
+def load_dbc(path):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return parse_dbc(f.read())
+
+
+def _number(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
@@ -0,0 +1,65 @@
+import numpy as np
+
+
+class RingBuffer:
+    """ Fixed-size, preallocated history of one signal: timestamps and values.
+
+    Every sample is written twice, at its slot and at slot + capacity, so
+    the most recent n samples are always one contiguous slice. Windows are
+    therefore returned as NumPy views, never copies; a view stays valid
+    until capacity - n further samples have been written.
+    """
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = capacity
+        self._times = np.zeros(capacity * 2, dtype=np.float64)
+        self._values = np.zeros(capacity * 2, dtype=dtype)
+        self._end = 0  # slot after the newest sample
+        self.count = 0  # samples held, up to capacity
+        self.total = 0  # samples ever written
+
+    def extend(self, times, values):
+        """ Append a batch of samples (oldest first). """
+        n = len(values)
+        if n > self.capacity:
+            times, values = times[-self.capacity:], values[-self.capacity:]
+            n = self.capacity
+        capacity = self.capacity
+        first = min(n, capacity - self._end)
+        for start, source in ((self._end, slice(0, first)), (0, slice(first, n))):
+            length = source.stop - source.start
+            if not length:
+                continue
+            for array, batch in ((self._times, times), (self._values, values)):
+                array[start:start + length] = batch[source]
+                array[start + capacity:start + capacity + length] = batch[source]
+        self._end = (self._end + n) % capacity
+        self.count = min(capacity, self.count + n)
+        self.total += n
+
+    def append(self, timestamp, value):
+        end, capacity = self._end, self.capacity
+        self._times[end] = self._times[end + capacity] = timestamp
+        self._values[end] = self._values[end + capacity] = value
+        self._end = (end + 1) % capacity
+        self.count = min(capacity, self.count + 1)
+        self.total += 1
+
+    def latest(self):
+        """ (timestamp, value) of the newest sample, or None when empty. """
+        if not self.count:
+            return None
+        index = self._end + self.capacity - 1
+        return float(self._times[index]), self._values[index].item()
+
+    def last(self, n=None):
+        """ Views of the newest n samples (all held samples by default), oldest first. """
+        n = self.count if n is None else min(n, self.count)
+        stop = self._end + self.capacity
+        return self._times[stop - n:stop], self._values[stop - n:stop]
+
+    def since(self, timestamp):
+        """ Views of the samples taken at or after timestamp. """
+        times, values = self.last()
+        start = int(np.searchsorted(times, timestamp, side='left'))
+        return times[start:], values[start:]
@@ -0,0 +1,121 @@
+import re
+import time
+
+import numpy as np
+
+from .dbc import EXTENDED_ID_FLAG
+from .decoder import FRAME_BYTES, frame_batch
+
+# (1436509052.249713) vcan0 044#2A366C2BBA; extended ids are written with 8 digits
+CANDUMP_LINE_RE = re.compile(r'^\((\d+\.\d+)\)\s+\S+\s+([0-9A-Fa-f]{1,8})#([0-9A-Fa-f]*)\s*$')
+
+
+def read_candump(path):
+    """ (timestamps, ids, data) arrays for the classic data frames of a `candump -l` log.
+
+    Remote (#R) and CAN FD (##) frames do not match and are skipped.
+    Extended ids carry EXTENDED_ID_FLAG, like the DBC's.
+    """
+    times = []
+    frames = []
+    with open(path) as f:
+        for line in f:
+            match = CANDUMP_LINE_RE.match(line)
+            if not match or len(match.group(3)) % 2:
+                continue
+            times.append(float(match.group(1)))
+            frame_id = int(match.group(2), 16)
+            if len(match.group(2)) == 8:
+                frame_id |= EXTENDED_ID_FLAG
+            frames.append((frame_id, bytes.fromhex(match.group(3))))
+    ids, data = frame_batch(frames)
+    return np.array(times, dtype=np.float64), ids, data
+
+
+class CandumpSource:
+    """ Replays a candump log in batches, optionally at the pace it was recorded.
+
+    Timestamps are shifted so the log starts now, which keeps windowed
+    queries ("the last 10 s") meaningful during a replay.
+    """
+
+    def __init__(self, path, realtime=True, loop=False):
+        times, self.ids, self.data = read_candump(path)
+        self.duration = float(times[-1] - times[0]) if len(times) else 0.0
+        self._offsets = times - times[0] if len(times) else times
+        self.realtime = realtime
+        self.loop = loop
+        self._position = 0
+        self._started = None
+
+    def read(self, max_frames, timeout):
+        """ Next (timestamps, ids, data) batch, or None once the log is exhausted. """
+        if self._started is None:
+            self._started = time.time()
+        if self._position >= len(self.ids):
+            if not self.loop or not len(self.ids):
+                return None
+            self._position = 0
+            self._started = time.time()
+
+        start = self._position
+        stop = min(start + max_frames, len(self.ids))
+        if self.realtime:
+            # Hand over what is due, waiting up to timeout for the next frame if nothing is
+            elapsed = time.time() - self._started
+            if self._offsets[start] > elapsed:
+                time.sleep(min(self._offsets[start] - elapsed, timeout))
+                elapsed = time.time() - self._started
+            stop = min(stop, int(np.searchsorted(self._offsets, elapsed, side='right')))
+            if stop <= start:
+                return self._empty()
+        self._position = stop
+        return (self._started + self._offsets[start:stop],
+                self.ids[start:stop], self.data[start:stop])
+
+    @staticmethod
+    def _empty():
+        return (np.empty(0), np.empty(0, dtype=np.uint32),
+                np.empty((0, FRAME_BYTES), dtype=np.uint8))
+
+    def close(self):
+        pass
+
+
+class BusSource:
+    """ Frames from a live bus through python-can (socketcan, virtual, ...).
+
+    python-can delivers one message at a time, so frames are collected for
+    up to `timeout` seconds and handed over as one batch for decoding.
+    """
+
+    def __init__(self, channel, interface='socketcan'):
+        try:
+            import can
+        except ImportError as e:
+            raise RuntimeError("reading a live bus needs python-can (pip install python-can)") from e
+        self.bus = can.Bus(channel=channel, interface=interface)
+
+    def read(self, max_frames, timeout):
+        frames = []
+        times = []
+        deadline = time.monotonic() + timeout
+        while len(frames) < max_frames:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            message = self.bus.recv(remaining)
+            if message is None:
+                break
+            if message.is_remote_frame or message.is_error_frame or message.is_fd:
+                continue
+            times.append(message.timestamp)
+            frame_id = message.arbitration_id
+            if message.is_extended_id:
+                frame_id |= EXTENDED_ID_FLAG
+            frames.append((frame_id, bytes(message.data)))
+        ids, data = frame_batch(frames)
+        return np.array(times, dtype=np.float64), ids, data
+
+    def close(self):
+        self.bus.shutdown()
@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+from .dbc import load_dbc
+from .decoder import BatchDecoder
+from .ring_buffer import RingBuffer
+
+# --- Configuration ---
+DBC_ENV = 'MINI_MATT_DBC'  # path of the vehicle's DBC file
+SOURCE_ENV = 'MINI_MATT_TELEMETRY'  # 'candump:<log>' or '<interface>:<channel>', e.g. socketcan:can0
+
+# --- Ingestion ---
+SIGNAL_CAPACITY = 4096  # samples kept per signal
+BATCH_FRAMES = 4096  # most frames decoded at once
+BATCH_SECONDS = 0.05  # longest a frame waits to be decoded
+
+
+def create_source(spec):
+    """ A frame source from a SOURCE_ENV style spec. """
+    from .sources import BusSource, CandumpSource
+    kind, _, argument = spec.partition(':')
+    if kind == 'candump':
+        return CandumpSource(argument, realtime=True, loop=True)
+    return BusSource(argument, interface=kind)
+
+
+class TelemetryStore(threading.Thread):
+    """ Decoded vehicle signals, fed from a CAN source by a background thread.
+
+    Frames are read in batches (up to BATCH_FRAMES, or whatever arrived in
+    BATCH_SECONDS), decoded with one vectorized pass per batch and appended
+    to a preallocated RingBuffer per signal, so steady-state ingestion
+    allocates nothing per frame. Readers on any thread ask for the latest
+    value, a window of views or summary statistics; the lock is only held
+    for the slicing or the reduction, never for decoding.
+    """
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        """ The store configured by MINI_MATT_DBC and MINI_MATT_TELEMETRY, started on first use.
+
+        None when telemetry is not configured or could not be started.
+        """
+        if cls._shared is None:
+            dbc_path = os.environ.get(DBC_ENV)
+            spec = os.environ.get(SOURCE_ENV)
+            if not dbc_path or not spec:
+                return None
+            try:
+                store = cls(load_dbc(dbc_path), create_source(spec))
+            except Exception as e:
+                print(f"[TELEMETRY] Not started: {e}")
+                cls._shared = False
+                return None
+            store.start()
+            cls._shared = store
+        return cls._shared or None
+
+    def __init__(self, messages, source=None, capacity=SIGNAL_CAPACITY):
+        super().__init__()
+        self.daemon = True
+        self.source = source
+        self.decoder = BatchDecoder(messages)
+        self.buffers = {name: RingBuffer(capacity) for name in self.decoder.signal_names}
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.batches = 0
+        self._running = True
+
+    @property
+    def signal_names(self):
+        return list(self.buffers)
+
+    def run(self):
+        print(f"[TELEMETRY] Decoding {len(self.buffers)} signals")
+        while self._running:
+            batch = self.source.read(BATCH_FRAMES, BATCH_SECONDS)
+            if batch is None:
+                break
+            self.ingest(*batch)
+        self.source.close()
+
+    def stop(self):
+        self._running = False
+
+    def ingest(self, timestamps, ids, data):
+        """ Decode one batch of frames and store its samples. """
+        if not len(ids):
+            return
+        decoded = self.decoder.decode(timestamps, ids, data)
+        with self.lock:
+            for name, (times, values) in decoded.items():
+                self.buffers[name].extend(times, values)
+            self.frames += len(ids)
+            self.batches += 1
+
+    # --- Readers (any thread) ---
+    def latest(self, name):
+        """ (timestamp, value) of a signal's newest sample, or None. """
+        with self.lock:
+            return self.buffers[name].latest()
+
+    def window(self, name, seconds=None, count=None):
+        """ (timestamps, values) views of the last `seconds` or the last `count` samples.
+
+        The arrays are views into the ring buffer: read them promptly, or
+        copy them if they are kept, as new samples eventually overwrite them.
+        """
+        with self.lock:
+            buffer = self.buffers[name]
+            if seconds is not None:
+                return buffer.since(time.time() - seconds)
+            return buffer.last(count)
+
+    def stats(self, name, seconds):
+        """ count, min, max, mean and last value of a signal over the last `seconds`. """
+        with self.lock:
+            times, values = self.buffers[name].since(time.time() - seconds)
+            if not len(values):
+                return {"count": 0}
+            return {
+                "count": len(values),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "mean": float(np.mean(values)),
+                "last": float(values[-1]),
+            }
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.core.image import ImageLoader
+from kivy.graphics import Fbo, Rectangle
+
+
+# --- Cache defaults ---
+COVER_CACHE_DIR = os.path.expanduser('~/.cache/mini-matt/covers')
+INDEX_FILE = 'index.json'
+THUMBNAIL_HEIGHT = 300  # matches the cover widget on the music page
+MAX_TEXTURES = 16  # decoded covers kept on the GPU
+MAX_THUMBNAILS = 512  # scaled covers kept on disk
+DECODE_WORKERS = 2
+FETCH_TIMEOUT = 10  # seconds
+INDEX_SAVE_DELAY = 2.0  # seconds of newly stored covers batched into one index write
+
+
+class CoverArtCache:
+    """Two-tier cache of cover art textures keyed by art URL.
+
+    Recently shown covers stay in an LRU of GPU textures. Behind that, each
+    cover is stored on disk once, scaled to THUMBNAIL_HEIGHT and named by
+    the SHA-1 of the original image bytes, so tracks sharing art share a
+    file and a repeat visit only decodes a small PNG. Fetching and decoding
+    run in a worker pool; textures are created and callbacks run on the
+    Kivy thread.
+    """
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        """Returns the cache used by every CoverImage."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self, cache_dir=COVER_CACHE_DIR, thumbnail_height=THUMBNAIL_HEIGHT,
+                 max_textures=MAX_TEXTURES, max_thumbnails=MAX_THUMBNAILS,
+                 workers=DECODE_WORKERS):
+        self.cache_dir = cache_dir
+        self.thumbnail_height = thumbnail_height
+        self.max_textures = max_textures
+        self.max_thumbnails = max_thumbnails
+        self._textures = OrderedDict()  # url -> texture, Kivy thread only
+        self._waiting = {}  # url -> callbacks for a load in progress, Kivy thread only
+
+        # url -> digest of the original bytes, shared with the workers
+        self._index_lock = threading.Lock()
+        self._index = {}
+        self._index_loaded = False  # nothing is written over the file before it is read
+        self._index_dirty = False
+        self._index_timer = None
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cover-art')
+        self._pool.submit(self._load_index)
+
+    def request(self, url, callback):
+        """Calls callback(url, texture) on the Kivy thread; texture is None on failure."""
+        texture = self._textures.get(url)
+        if texture is not None:
+            self._textures.move_to_end(url)
+            callback(url, texture)
+            return
+
+        if url in self._waiting:
+            self._waiting[url].append(callback)
+            return
+        self._waiting[url] = [callback]
+        self._pool.submit(self._load, url)
+
+    # --- Kivy thread ---
+    def _loaded(self, url, image, digest):
+        """Uploads a decoded image, scaling and storing it if it came from the source."""
+        texture = None
+        try:
+            texture = image.texture
+            if digest is not None:
+                texture, pixels = self._scale(texture)
+                self._pool.submit(self._save_thumbnail, url, digest, texture.size, pixels)
+            self._textures[url] = texture
+            while len(self._textures) > self.max_textures:
+                self._textures.popitem(last=False)
+        except Exception as e:
+            print(f"[COVER_ART] Error preparing {url}: {e}")
+            texture = None
+        self._finish(url, texture)
+
+    def _finish(self, url, texture):
+        for callback in self._waiting.pop(url, ()):
+            callback(url, texture)
+
+    def _scale(self, texture):
+        """Draws texture at thumbnail height; returns the new texture and its pixels."""
+        ratio = min(1.0, self.thumbnail_height / texture.height)
+        size = (max(1, int(texture.width * ratio)), max(1, int(texture.height * ratio)))
+        fbo = Fbo(size=size)
+        with fbo:
+            Rectangle(texture=texture, size=size)
+        fbo.draw()
+        return fbo.texture, fbo.pixels
+
+    # --- Worker threads ---
+    def _load(self, url):
+        """Decodes a cover from the disk cache, or fetches and decodes the original."""
+        try:
+            with self._index_lock:
+                digest = self._index.get(url)
+            path = digest and self._thumbnail_path(digest)
+            if path and os.path.exists(path):
+                os.utime(path)  # keeps recently used thumbnails through pruning
+                image = ImageLoader.load(path, keep_data=True, nocache=True)
+                Clock.schedule_once(lambda dt: self._loaded(url, image, None))
+                return
+
+            data = self._fetch(url)
+            digest = hashlib.sha1(data).hexdigest()
+            path = self._thumbnail_path(digest)
+            if os.path.exists(path):
+                # Same art under a new URL, already scaled
+                self._remember(url, digest)
+                image = ImageLoader.load(path, keep_data=True, nocache=True)
+                Clock.schedule_once(lambda dt: self._loaded(url, image, None))
+                return
+
+            image = self._decode(data)
+            Clock.schedule_once(lambda dt: self._loaded(url, image, digest))
+        except Exception as e:
+            print(f"[COVER_ART] Error loading {url}: {e}")
+            Clock.schedule_once(lambda dt: self._finish(url, None))
+
+    def _fetch(self, url):
+        if url.startswith(('http://', 'https://')):
+            with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+                return response.read()
+        if url.startswith('file://'):
+            url = urllib.request.url2pathname(url[len('file://'):])
+        with open(url, 'rb') as f:
+            return f.read()
+
+    def _decode(self, data):
+        # Kivy picks image loaders by file extension
+        suffix = '.png' if data.startswith(b'\x89PNG') else '.jpg'
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return ImageLoader.load(tmp_path, keep_data=True, nocache=True)
+        finally:
+            os.remove(tmp_path)
+
+    def _save_thumbnail(self, url, digest, size, pixels):
+        try:
+            loaders = [loader for loader in ImageLoader.loaders if loader.can_save('png', False)]
+            if not loaders:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._thumbnail_path(digest)
+            tmp_path = path + '.tmp.png'
+            # Fbo pixels are read bottom row first
+            loaders[0].save(tmp_path, size[0], size[1], 'rgba', pixels, True, 'png')
+            os.replace(tmp_path, path)
+            self._remember(url, digest)
+        except Exception as e:
+            print(f"[COVER_ART] Error saving thumbnail for {url}: {e}")
+
+    def _remember(self, url, digest):
+        with self._index_lock:
+            if self._index.get(url) == digest:
+                return
+            self._index[url] = digest
+            self._index_dirty = True
+            self._schedule_index_save()
+
+    def _schedule_index_save(self):
+        """Writes the index once INDEX_SAVE_DELAY has passed; the caller holds the index lock."""
+        if self._index_loaded and self._index_timer is None:
+            self._index_timer = threading.Timer(INDEX_SAVE_DELAY, self._flush_index)
+            self._index_timer.daemon = True
+            self._index_timer.start()
+
+    def _flush_index(self):
+        # Workers write the index file one at a time
+        with self._index_lock:
+            self._index_timer = None
+            if self._index_dirty:
+                self._index_dirty = False
+                self._save_index(self._index)
+
+    def _thumbnail_path(self, digest):
+        return os.path.join(self.cache_dir, digest + '.png')
+
+    def _load_index(self):
+        """Reads the URL index, prunes thumbnails beyond max_thumbnails and their entries."""
+        index = {}
+        kept = None  # digests of the thumbnails left on disk
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE)) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[COVER_ART] Ignoring unreadable cover index: {e}")
+
+        if os.path.isdir(self.cache_dir):
+            try:
+                thumbnails = sorted(
+                    (entry for entry in os.scandir(self.cache_dir)
+                     if entry.name.endswith('.png') and not entry.name.endswith('.tmp.png')),
+                    key=lambda entry: entry.stat().st_mtime,
+                    reverse=True
+                )
+                for entry in thumbnails[self.max_thumbnails:]:
+                    os.remove(entry.path)
+                kept = {entry.name[:-len('.png')] for entry in thumbnails[:self.max_thumbnails]}
+            except OSError as e:
+                print(f"[COVER_ART] Error pruning cover cache: {e}")
+
+        with self._index_lock:
+            for url, digest in index.items():
+                if kept is None or digest in kept:
+                    self._index.setdefault(url, digest)
+                else:
+                    self._index_dirty = True  # rewrite the file without it
+            self._index_loaded = True
+            if self._index_dirty:
+                self._schedule_index_save()
+
+    def _save_index(self, index):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, INDEX_FILE)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"[COVER_ART] Error saving cover index: {e}")
@@ -1,43 +1,40 @@
-from kivy.uix.image import AsyncImage
+from kivy.uix.image import Image
 from kivy.graphics import Color, Rectangle
 
+from .cover_art_cache import CoverArtCache
 from .theme import Theme
 
 
-class CoverImage(AsyncImage):
-    """AsyncImage that shows a gray square when no image is available."""
+class CoverImage(Image):
+    """Image that shows cover art from the shared cache, or a gray square without it."""
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.art_url = ''
         with self.canvas.before:
             self._bg_color = Color(*Theme.PLACEHOLDER_COLOR)
             self._bg_rect = Rectangle(pos=self.pos, size=self.size)
-        self.bind(pos=self._update_bg, size=self._update_bg,
-                   on_load=self._on_load, on_error=self._on_error)
+        self.bind(pos=self._update_bg, size=self._update_bg)
 
     def _update_bg(self, *args):
         self._bg_rect.pos = self.pos
         self._bg_rect.size = self.size
 
-    def _on_load(self, *args):
-        # Hide placeholder when an image is successfully loaded
-        if self.texture:
-            self._bg_color.a = 0
-        else:
-            self._bg_color.a = 1
-
-    def _on_error(self, *args):
+    def _on_art(self, url, texture):
+        # Ignore covers that arrive after the track has changed again
+        if url != self.art_url:
+            return
+        self.texture = texture
         # Show gray placeholder on load failure
-        self._bg_color.a = 1
-        self.texture = None
+        self._bg_color.a = 0 if texture else 1
 
     def set_source(self, src: str):
-        """Set the image source and reset placeholder state."""
+        """Show the cover for src; does nothing unless the art actually changed."""
+        if src == self.art_url:
+            return
+        self.art_url = src
         if src:
-            self._bg_color.a = 0
-            self.source = src
-            self.reload()
+            CoverArtCache.shared().request(src, self._on_art)
         else:
-            self.source = ''
             self.texture = None
             self._bg_color.a = 1
@@ -0,0 +1,61 @@
+import importlib
+import threading
+import time
+
+from kivy.clock import Clock
+
+
+class PageRegistry:
+    """Imports and builds pages the first time they are shown.
+
+    Pages are registered by module path and class name, so nothing about a
+    page (its imports, threads or Clock events) costs anything until the
+    user navigates to it. Built pages are kept for reuse. Page modules and
+    the heavy libraries they pull in can be imported ahead of time on a
+    background thread; widgets are still only built on the Kivy thread.
+    """
+
+    def __init__(self, pages=None):
+        self._specs = {}  # name -> (module path, class name)
+        self._pages = {}  # name -> built page
+        self.build_times = {}  # name -> seconds spent importing and building
+        for name, (module, class_name) in (pages or {}).items():
+            self.register(name, module, class_name)
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def register(self, name, module, class_name):
+        self._specs[name] = (module, class_name)
+
+    def preload(self, names, callback=None):
+        """Imports the modules of pages in a background thread, then calls callback()."""
+        modules = [self._specs[name][0] for name in names if name not in self._pages]
+
+        def run():
+            for module in modules:
+                try:
+                    importlib.import_module(module)
+                except Exception as e:
+                    # Surfaces again, with a traceback, when the page is built
+                    print(f"[PAGES] Preloading {module} failed: {e}")
+            if callback:
+                Clock.schedule_once(lambda dt: callback())
+
+        threading.Thread(target=run, name='page-preload', daemon=True).start()
+
+    def get(self, name):
+        """Returns the page, importing and constructing it on first use."""
+        page = self._pages.get(name)
+        if page is None:
+            start = time.perf_counter()
+            module, class_name = self._specs[name]
+            page_class = getattr(importlib.import_module(module), class_name)
+            page = page_class()
+            self._pages[name] = page
+            self.build_times[name] = time.perf_counter() - start
+        return page
+
+    def built(self):
+        """Returns (name, page) for every page constructed so far."""
+        return list(self._pages.items())
@@ -0,0 +1,77 @@
+import weakref
+
+from kivy.event import EventDispatcher
+from kivy.properties import ColorProperty
+
+ROLES = ('background', 'sidebar', 'primary', 'secondary', 'accent', 'success',
+         'warning', 'error', 'placeholder', 'sidebar_selected', 'sidebar_hover')
+
+
+class Palette(EventDispatcher):
+    """Observable set of named colors that repaints whatever was painted with it.
+
+    Widgets paint a property or canvas instruction with a role ('primary',
+    'sidebar', ...) instead of copying a color. The palette remembers the
+    role per target, keyed weakly by the widget that owns it. Targets are
+    held weakly too, as a widget is usually its own target, so painting
+    never keeps anything alive. Applying a new set of colors rewrites every
+    painted target in one pass, within a single frame, without rebuilding
+    any widget. Roles are also Kivy properties for anything that would
+    rather bind to them.
+    """
+
+    background = ColorProperty((1, 1, 1, 1))
+    sidebar = ColorProperty((1, 1, 1, 1))
+    primary = ColorProperty((0, 0, 0, 1))
+    secondary = ColorProperty((0, 0, 0, 1))
+    accent = ColorProperty((0, 0, 0, 1))
+    success = ColorProperty((0, 0, 0, 1))
+    warning = ColorProperty((0, 0, 0, 1))
+    error = ColorProperty((0, 0, 0, 1))
+    placeholder = ColorProperty((0, 0, 0, 1))
+    sidebar_selected = ColorProperty((1, 1, 1, 1))
+    sidebar_hover = ColorProperty((1, 1, 1, 1))
+
+    def __init__(self, colors=None, **kwargs):
+        super().__init__(**kwargs)
+        # owner -> {(id(target), attr): (weakref to target, attr, role)}
+        self._painted = weakref.WeakKeyDictionary()
+        if colors:
+            self.apply(colors)
+
+    def color(self, role):
+        return tuple(getattr(self, role))
+
+    def paint(self, target, role, attr='color', owner=None):
+        """Set target.attr to the role's color now and on every later apply().
+
+        owner defaults to target; painting the same target and attribute
+        again replaces its role, so state changes (selected, error, ...)
+        just paint again.
+        """
+        owner = target if owner is None else owner
+        targets = self._painted.get(owner)
+        if targets is None:
+            targets = self._painted[owner] = {}
+        targets[(id(target), attr)] = (weakref.ref(target), attr, role)
+        setattr(target, attr, self.color(role))
+        return target
+
+    def apply(self, colors):
+        """Switch to a dict of role -> rgba and repaint every painted target."""
+        for role, rgba in colors.items():
+            setattr(self, role, rgba)
+        for owner, targets in list(self._painted.items()):
+            for key, (ref, attr, role) in list(targets.items()):
+                target = ref()
+                if target is None:
+                    # Dropped from its owner's canvas, or collected with it
+                    del targets[key]
+                    continue
+                setattr(target, attr, self.color(role))
+            if not targets:
+                self._painted.pop(owner, None)
+
+    def painted_count(self):
+        return sum(1 for targets in list(self._painted.values())
+                   for ref, _, _ in list(targets.values()) if ref() is not None)
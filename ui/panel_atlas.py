@@ -0,0 +1,76 @@
+from kivy.graphics.texture import Texture
+
+RADII = (0, 6, 8, 12)  # corner radii available as 9-patches, in pixels
+MIDDLE = 2  # opaque texels between the corners that stretch across the panel
+
+
+class PanelAtlas:
+    """One small texture holding a white rounded-corner 9-patch per radius.
+
+    Every panel background samples the same texture and is tinted by the
+    Color before it, so any number of panels can share a single mesh. Each
+    patch is padded by a copy of its own edge so linear filtering never
+    bleeds a neighbour in.
+    """
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        """Returns the atlas used by every PanelBatch."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self, radii=RADII):
+        self._patches = {}  # radius -> x of the patch's first texel
+        self._coords = {}  # radius -> texture coordinates, see patch()
+        x = 0
+        for radius in radii:
+            self._patches[radius] = x + 1
+            x += radius * 2 + MIDDLE + 2
+        self.height = max(radii) * 2 + MIDDLE + 2
+        self.texture = Texture.create(size=(x, self.height), colorfmt='rgba')
+        self.texture.add_reload_observer(self._blit)
+        self._blit(self.texture)
+
+    def _blit(self, texture):
+        width, height = texture.size
+        pixels = bytearray(width * height * 4)
+        for radius, left in self._patches.items():
+            size = radius * 2 + MIDDLE
+            for y in range(-1, size + 1):
+                for x in range(-1, size + 1):
+                    alpha = self._coverage(radius, min(max(x, 0), size - 1),
+                                           min(max(y, 0), size - 1))
+                    offset = ((y + 1) * width + left + x) * 4
+                    pixels[offset:offset + 4] = bytes((255, 255, 255, alpha))
+        texture.blit_buffer(bytes(pixels), colorfmt='rgba', bufferfmt='ubyte')
+
+    @staticmethod
+    def _coverage(radius, x, y):
+        """Alpha (0-255) of texel (x, y) of a patch, antialiased at the corners."""
+        size = radius * 2 + MIDDLE
+        cx = min(max(x + 0.5, radius), size - radius)
+        cy = min(max(y + 0.5, radius), size - radius)
+        distance = ((x + 0.5 - cx) ** 2 + (y + 0.5 - cy) ** 2) ** 0.5
+        if distance == 0:
+            return 255
+        return int(round(min(max(radius - distance + 0.5, 0.0), 1.0) * 255))
+
+    def patch(self, radius):
+        """Texture coordinates (us, vs) of the patch's four grid lines each way."""
+        coords = self._coords.get(radius)
+        if coords is None:
+            coords = self._coords[radius] = self._patch_coords(radius)
+        return coords
+
+    def _patch_coords(self, radius):
+        left = self._patches[radius]
+        width, height = self.texture.size
+        xs = (left, left + radius, left + radius + MIDDLE, left + radius * 2 + MIDDLE)
+        ys = (1, 1 + radius, 1 + radius + MIDDLE, 1 + radius * 2 + MIDDLE)
+        return tuple(x / width for x in xs), tuple(y / height for y in ys)
+
+    def radius(self, requested):
+        """The largest available radius not above requested."""
+        return max(radius for radius in self._patches if radius <= max(requested, 0))
@@ -0,0 +1,112 @@
+from kivy.clock import Clock
+from kivy.graphics import Color, InstructionGroup, Mesh
+
+from .panel_atlas import PanelAtlas
+from .theme import Theme
+
+# Two triangles for each of the nine cells of a 4x4 vertex grid
+PATCH_INDICES = tuple(
+    index
+    for row in range(3)
+    for column in range(3)
+    for index in (row * 4 + column, row * 4 + column + 1, row * 4 + column + 5,
+                  row * 4 + column, row * 4 + column + 5, row * 4 + column + 4)
+)
+
+
+class PanelBatch:
+    """Draws rounded backgrounds for many widgets as one mesh per color role.
+
+    A container owns the batch and its instructions; member widgets must
+    share the container's coordinate space (no RelativeLayout in between).
+    Each member is a 9-patch from the shared PanelAtlas, so a whole list of
+    rows costs one Color and one Mesh per role rather than a Color and a
+    RoundedRectangle per widget. Moving or resizing members only fires a
+    trigger; vertices are rebuilt once per frame. Roles draw in the order
+    they first appear, so add backgrounds before what sits on them.
+    """
+
+    def __init__(self, container):
+        self.container = container
+        self.atlas = PanelAtlas.shared()
+        self.group = InstructionGroup()
+        container.canvas.before.add(self.group)
+        self._members = {}  # widget -> [role, radius, anchor]
+        self._layers = {}  # role -> (Color, Mesh), in drawing order
+        self._drawn = []  # roles whose layers are in the group
+        self._trigger = Clock.create_trigger(self.rebuild, -1)
+
+    def member_count(self):
+        return len(self._members)
+
+    def add(self, widget, role, radius=0, anchor=None):
+        """Draw widget's background; it is skipped while anchor has no parent."""
+        if widget in self._members:
+            self.remove(widget)
+        self._members[widget] = [role, self.atlas.radius(radius), anchor]
+        widget.fbind('pos', self._trigger)
+        widget.fbind('size', self._trigger)
+        if anchor is not None:
+            anchor.fbind('parent', self._trigger)
+        self._trigger()
+
+    def remove(self, widget):
+        member = self._members.pop(widget, None)
+        if member is None:
+            return
+        widget.funbind('pos', self._trigger)
+        widget.funbind('size', self._trigger)
+        if member[2] is not None:
+            member[2].funbind('parent', self._trigger)
+        self._trigger()
+
+    def set_role(self, widget, role):
+        member = self._members.get(widget)
+        if member is not None and member[0] != role:
+            member[0] = role
+            self._trigger()
+
+    def rebuild(self, *args):
+        """Regenerate every layer's vertices from the members' current geometry."""
+        # Layers are kept once created so roles keep their drawing order
+        geometry = {role: ([], []) for role in self._layers}
+        for widget, (role, radius, anchor) in self._members.items():
+            if anchor is not None and anchor.parent is None:
+                continue
+            vertices, indices = geometry.setdefault(role, ([], []))
+            self._append_panel(vertices, indices, widget, radius)
+
+        drawn = []
+        for role, (vertices, indices) in geometry.items():
+            layer = self._layers.get(role)
+            if layer is None:
+                color = Theme.paint(Color(), role, 'rgba', owner=self.container)
+                mesh = Mesh(mode='triangles', texture=self.atlas.texture)
+                layer = self._layers[role] = (color, mesh)
+            layer[1].vertices = vertices
+            layer[1].indices = indices
+            if indices:
+                drawn.append(role)
+
+        # Unused roles are taken out rather than left as empty draws
+        if drawn != self._drawn:
+            self._drawn = drawn
+            self.group.clear()
+            for role in drawn:
+                for instruction in self._layers[role]:
+                    self.group.add(instruction)
+
+    def _append_panel(self, vertices, indices, widget, radius):
+        x, y = widget.pos
+        width, height = widget.size
+        corner = min(radius, width / 2, height / 2)
+        xs = (x, x + corner, x + width - corner, x + width)
+        ys = (y, y + corner, y + height - corner, y + height)
+        us, vs = self.atlas.patch(radius)
+
+        base = len(vertices) // 4
+        for row in range(4):
+            py, v = ys[row], vs[row]
+            vertices.extend((xs[0], py, us[0], v, xs[1], py, us[1], v,
+                             xs[2], py, us[2], v, xs[3], py, us[3], v))
+        indices.extend([base + index for index in PATCH_INDICES])
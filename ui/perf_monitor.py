@@ -0,0 +1,261 @@
+import json
+import os
+import time
+from collections import deque
+
+from kivy.clock import Clock
+from kivy.weakmethod import WeakMethod
+
+from bluetooth.timed_lock import TimedLock
+
+PERF_ENV = 'MINI_MATT_PERF'
+PERF_LOG_DIR = os.path.expanduser('~/.config/mini-matt')
+FRAME_SAMPLES = 600  # about ten seconds of frames at 60 fps
+CALLBACK_SAMPLES = 256  # recent durations kept per callback for percentiles
+HISTOGRAM_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33)  # last bucket is everything slower
+CLOCK_SCHEDULERS = ('schedule_once', 'schedule_interval', 'create_trigger',
+                    'create_lifecycle_aware_trigger')
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def callback_name(callback):
+    """Readable name for a Clock callback, e.g. 'MusicPage.update_progress'."""
+    owner = getattr(callback, '__self__', None)
+    label = getattr(owner, 'perf_label', None)
+    if label:
+        return label
+    func = getattr(callback, 'func', None)  # functools.partial
+    if func is not None:
+        return callback_name(func)
+    return getattr(callback, '__qualname__', None) or type(callback).__name__
+
+
+class CallbackStats:
+    """Call count, total, recent durations and a histogram for one callback."""
+
+    __slots__ = ('calls', 'total', 'max', 'recent', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=CALLBACK_SAMPLES)
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(HISTOGRAM_BOUNDS_MS) and ms > HISTOGRAM_BOUNDS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+
+    def describe(self):
+        recent = list(self.recent)
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 2),
+            "mean_ms": round(self.total / self.calls * 1000, 3) if self.calls else 0.0,
+            "p95_ms": round(percentile(recent, 0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "histogram": self.histogram[:],
+        }
+
+
+class _TimedCallback:
+    """Stands in for a Clock callback and records how long each call takes.
+
+    Bound methods are held weakly, as the Clock itself does, so timing a
+    widget's events does not keep the widget alive. Compares equal to the
+    callback it wraps so Clock.unschedule(callback) still finds it.
+    """
+
+    def __init__(self, monitor, callback):
+        self._monitor = monitor
+        self.name = callback_name(callback)
+        if getattr(callback, '__self__', None) is not None:
+            self._weak = WeakMethod(callback)
+            self._strong = None
+        else:
+            self._weak = None
+            self._strong = callback
+
+    @property
+    def callback(self):
+        if self._weak is not None:
+            return self._weak()
+        return self._strong
+
+    def __call__(self, *args):
+        callback = self.callback
+        if callback is None:
+            # Owner was collected; False also stops an interval event
+            return False
+        start = time.perf_counter()
+        try:
+            return callback(*args)
+        finally:
+            self._monitor.record(self.name, time.perf_counter() - start)
+
+    def __eq__(self, other):
+        if isinstance(other, _TimedCallback):
+            return other is self
+        return self.callback == other
+
+    def __hash__(self):
+        return id(self)
+
+
+class PerfMonitor:
+    """Collects frame times, per-callback Clock timings and lock waits.
+
+    Frame times are always cheap to sample. Timing callbacks means wrapping
+    everything passed to the Clock's scheduling methods (the Clock is
+    compiled, so its events cannot be instrumented directly); it is only
+    installed when MINI_MATT_PERF=1, as early as possible so the callbacks
+    widgets create while being built are covered too.
+    """
+    _shared = None
+
+    @classmethod
+    def shared(cls):
+        """Returns the monitor used by the performance overlay."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def __init__(self):
+        self.callbacks = {}  # name -> CallbackStats
+        self.frame_times = deque(maxlen=FRAME_SAMPLES)
+        self.locks = {}  # name -> TimedLock
+        self.timing_callbacks = False
+        self._frame_event = None
+        self._originals = {}  # Clock method name -> original bound method
+        self._started = time.time()
+
+    @staticmethod
+    def enabled_by_env():
+        return os.environ.get(PERF_ENV) == '1'
+
+    def install(self):
+        """Start timing every callback scheduled through the Kivy Clock."""
+        if self.timing_callbacks:
+            return
+        for name in CLOCK_SCHEDULERS:
+            original = getattr(Clock, name, None)
+            if original is None:
+                continue
+            self._originals[name] = original
+            setattr(Clock, name, self._wrap_scheduler(original))
+        self.timing_callbacks = True
+        self.start_frames()
+        print("[PERF] Timing Clock callbacks")
+
+    def uninstall(self):
+        for name, original in self._originals.items():
+            setattr(Clock, name, original)
+        self._originals.clear()
+        self.timing_callbacks = False
+
+    def _wrap_scheduler(self, original):
+        def schedule(callback, *args, **kwargs):
+            return original(_TimedCallback(self, callback), *args, **kwargs)
+        return schedule
+
+    def start_frames(self):
+        """Sample the time between frames."""
+        if self._frame_event is None:
+            schedule = self._originals.get('schedule_interval', Clock.schedule_interval)
+            self._frame_event = schedule(self._on_frame, 0)
+
+    def stop_frames(self):
+        if self._frame_event is not None:
+            self._frame_event.cancel()
+            self._frame_event = None
+
+    def _on_frame(self, dt):
+        self.frame_times.append(dt)
+
+    def record(self, name, seconds):
+        stats = self.callbacks.get(name)
+        if stats is None:
+            stats = self.callbacks[name] = CallbackStats()
+        stats.add(seconds)
+
+    def watch_lock(self, name, owner, attr='lock'):
+        """Swap owner.attr for a TimedLock; call before any thread uses the lock."""
+        if not self.timing_callbacks:
+            return
+        lock = TimedLock()
+        setattr(owner, attr, lock)
+        self.locks[name] = lock
+
+    def reset(self):
+        self.callbacks.clear()
+        self.frame_times.clear()
+        for lock in self.locks.values():
+            lock.waits.clear()
+        self._started = time.time()
+
+    def frame_stats(self):
+        frames = list(self.frame_times)
+        return {
+            "fps": round(Clock.get_fps(), 1),
+            "samples": len(frames),
+            "p50_ms": round(percentile(frames, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(frames, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(frames, 0.99) * 1000, 2),
+            "max_ms": round(max(frames, default=0.0) * 1000, 2),
+        }
+
+    def callback_stats(self, limit=None):
+        """Per-callback stats, busiest (by total time) first."""
+        ranked = sorted(self.callbacks.items(), key=lambda item: item[1].total, reverse=True)
+        return [{"name": name, **stats.describe()} for name, stats in ranked[:limit]]
+
+    def lock_stats(self):
+        stats = {}
+        for name, lock in self.locks.items():
+            waits = list(lock.waits)
+            stats[name] = {
+                "acquisitions": lock.acquisitions,
+                "p50_us": round(percentile(waits, 0.50) * 1e6, 1),
+                "p95_us": round(percentile(waits, 0.95) * 1e6, 1),
+                "p99_us": round(percentile(waits, 0.99) * 1e6, 1),
+                "max_us": round(max(waits, default=0.0) * 1e6, 1),
+            }
+        return stats
+
+    def report(self):
+        """Everything collected so far as a JSON-ready dict."""
+        return {
+            "time": time.time(),
+            "since": self._started,
+            "timing_callbacks": self.timing_callbacks,
+            "histogram_bounds_ms": list(HISTOGRAM_BOUNDS_MS),
+            "frames": self.frame_stats(),
+            "locks": self.lock_stats(),
+            "callbacks": self.callback_stats(),
+        }
+
+    def export(self, directory=PERF_LOG_DIR):
+        """Writes the report to a timestamped file; returns its path or None."""
+        path = os.path.join(directory, time.strftime('perf_%Y%m%d-%H%M%S.json'))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(self.report(), f, indent=2)
+            print(f"[PERF] Report written to {path}")
+            return path
+        except Exception as e:
+            print(f"[PERF] Error writing report: {e}")
+            return None
@@ -0,0 +1,124 @@
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+
+from .perf_monitor import HISTOGRAM_BOUNDS_MS, PerfMonitor
+from .theme import Theme
+
+REFRESH_INTERVAL = 0.5  # seconds between overlay updates
+TOP_CALLBACKS = 12  # busiest callbacks listed
+SPARK = ' ▁▂▃▄▅▆▇█'
+
+
+def sparkline(counts):
+    peak = max(counts) or 1
+    return ''.join(SPARK[0 if not count else max(1, round(count / peak * 8))]
+                   for count in counts)
+
+
+class PerfOverlay(BoxLayout):
+    """Frame, callback and lock timings drawn over the whole window.
+
+    Toggled with F12 or from the Settings page. Touches outside its buttons
+    pass through to the dashboard underneath; it only refreshes while shown.
+    """
+    _shown = None
+
+    @classmethod
+    def toggle(cls):
+        """Show the overlay, or hide it if it is already up."""
+        if cls._shown is not None:
+            cls._shown.hide()
+        else:
+            cls().show()
+
+    @classmethod
+    def is_shown(cls):
+        return cls._shown is not None
+
+    def __init__(self, monitor=None, **kwargs):
+        super().__init__(orientation='vertical', size_hint=(1, 0.5),
+                         pos_hint={'top': 1}, padding=Theme.PADDING_SMALL,
+                         spacing=Theme.SPACING_SMALL, **kwargs)
+        self.monitor = monitor or PerfMonitor.shared()
+        self._refresh_event = None
+
+        with self.canvas.before:
+            Color(0, 0, 0, 0.75)
+            self._bg_rect = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_bg, size=self._update_bg)
+
+        self.text_label = Label(font_name='RobotoMono-Regular', font_size=12,
+                                color=(1, 1, 1, 1), halign='left', valign='top')
+        self.text_label.bind(size=self.text_label.setter('text_size'))
+        self.add_widget(self.text_label)
+
+        buttons = BoxLayout(size_hint_y=None, height=Theme.BUTTON_HEIGHT,
+                            spacing=Theme.SPACING_SMALL)
+        for text, handler in (("Export", self.export), ("Reset", self.reset),
+                              ("Close", lambda *args: self.hide())):
+            button = Button(text=text, font_size=Theme.FONT_SIZE_SMALL)
+            button.bind(on_press=handler)
+            buttons.add_widget(button)
+        self.add_widget(buttons)
+
+    def _update_bg(self, *args):
+        self._bg_rect.pos = self.pos
+        self._bg_rect.size = self.size
+
+    def show(self):
+        if PerfOverlay._shown is not None:
+            return
+        PerfOverlay._shown = self
+        self.monitor.start_frames()
+        Window.add_widget(self)
+        self.refresh()
+        self._refresh_event = Clock.schedule_interval(self.refresh, REFRESH_INTERVAL)
+
+    def hide(self):
+        if PerfOverlay._shown is not self:
+            return
+        PerfOverlay._shown = None
+        if self._refresh_event:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+        if not self.monitor.timing_callbacks:
+            # Started for the overlay; with MINI_MATT_PERF=1 frames are always sampled
+            self.monitor.stop_frames()
+        Window.remove_widget(self)
+
+    def export(self, *args):
+        path = self.monitor.export()
+        self.refresh()
+        if path:
+            self.text_label.text = f"Exported to {path}\n" + self.text_label.text
+
+    def reset(self, *args):
+        self.monitor.reset()
+        self.refresh()
+
+    def refresh(self, *args):
+        frames = self.monitor.frame_stats()
+        lines = [
+            f"FPS {frames['fps']:5.1f}   frame ms  p50 {frames['p50_ms']:5.1f}"
+            f"  p95 {frames['p95_ms']:5.1f}  p99 {frames['p99_ms']:5.1f}"
+            f"  max {frames['max_ms']:6.1f}",
+        ]
+        for name, stats in self.monitor.lock_stats().items():
+            lines.append(f"{name}  n={stats['acquisitions']}  wait us  p95 {stats['p95_us']}"
+                         f"  p99 {stats['p99_us']}  max {stats['max_us']}")
+        lines.append("")
+        if not self.monitor.timing_callbacks:
+            lines.append("Start with MINI_MATT_PERF=1 to time Clock callbacks")
+        else:
+            bounds = ' '.join(f"{bound:g}" for bound in HISTOGRAM_BOUNDS_MS)
+            lines.append(f"{'callback':<36}{'calls':>7}{'mean':>7}{'p95':>7}{'max':>7}"
+                         f"  histogram ms [{bounds}]")
+            for stats in self.monitor.callback_stats(TOP_CALLBACKS):
+                lines.append(f"{stats['name'][-35:]:<36}{stats['calls']:>7}"
+                             f"{stats['mean_ms']:>7.2f}{stats['p95_ms']:>7.2f}"
+                             f"{stats['max_ms']:>7.1f}  {sparkline(stats['histogram'])}")
+        self.text_label.text = '\n'.join(lines)
@@ -0,0 +1,159 @@
+import os
+from collections import deque
+
+from kivy.clock import Clock
+from kivy.config import Config
+from kivy.graphics import (ClearBuffers, ClearColor, Color, Fbo, PopMatrix, PushMatrix,
+                           Rectangle, Scale, Translate)
+from kivy.uix.boxlayout import BoxLayout
+
+from .perf_monitor import percentile
+from .theme import Theme
+
+RENDER_SCALE_ENV = 'MINI_MATT_RENDER_SCALE'  # a fraction such as 0.75, or 'auto'
+SCALE_STEPS = (1.0, 0.75, 0.5)  # scales 'auto' moves between, one step at a time
+ADAPT_INTERVAL = 1.0  # seconds between automatic scale decisions
+ADAPT_FRAMES = 60  # frames each decision needs, all drawn at the current scale
+SLOW_FACTOR = 1.25  # p90 frame time over budget * this steps the scale down
+FAST_FACTOR = 1.1  # ... and under budget * this, for RECOVER_CHECKS checks, steps it up
+RECOVER_CHECKS = 5
+
+
+class RenderScaleLayout(BoxLayout):
+    """BoxLayout that draws its children at a fraction of native resolution.
+
+    Children are drawn into an Fbo scale times the layout's size, which is
+    stretched back over the layout with linear filtering, so the GPU fills
+    a quarter of the pixels at 0.5. Only what is inside the layout is
+    affected: the sidebar and modal views are drawn at native resolution.
+    Page text is upscaled with everything else, so it softens below 1;
+    drawing it at native resolution would need a second pass over every
+    label, costing the fill rate the Fbo saves and breaking stacking and
+    scroll clipping. Layout and touch coordinates are untouched.
+
+    The default scale is 1, where text is as crisp as without the layout.
+    With adaptive on, the scale drops a step only while frames run over
+    budget and climbs back to 1 once they have stayed within it for a few
+    seconds, so text softens only while the GPU can't keep up.
+    """
+
+    def __init__(self, scale=1.0, adaptive=False, **kwargs):
+        self.fbo = Fbo(size=(1, 1), with_stencilbuffer=True)
+        with self.fbo:
+            # Children expect the window background underneath them
+            self._clear = Theme.paint(ClearColor(0, 0, 0, 0), 'background', 'rgba', owner=self)
+            ClearBuffers()
+            PushMatrix()
+            self._scale = Scale(1, 1, 1)
+            self._translate = Translate(0, 0)
+        self._pop = PopMatrix()
+        self.fbo.add(self._pop)
+        super().__init__(**kwargs)
+        self.canvas.add(self.fbo)  # renders the children whenever they change
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self._rect = Rectangle()
+        self.render_scale = scale
+        self.budget = 1 / (Config.getint('graphics', 'maxfps') or 60)
+        self._adapt_event = None
+        self._frame_event = None
+        self._frames = deque(maxlen=ADAPT_FRAMES)
+        self._fast_checks = 0
+        self.fbind('pos', self._update_fbo)
+        self.fbind('size', self._update_fbo)
+        if adaptive:
+            self.start_adapting()
+        self._update_fbo()
+
+    @staticmethod
+    def from_env():
+        """(scale, adaptive) from MINI_MATT_RENDER_SCALE, or None when unset or 1.
+
+        'auto' starts at 1; a fixed fraction below 1 trades text sharpness
+        for fill rate for the whole session.
+        """
+        value = os.environ.get(RENDER_SCALE_ENV, '').strip().lower()
+        if value == 'auto':
+            return 1.0, True
+        try:
+            scale = float(value)
+        except ValueError:
+            return None
+        if not 0 < scale < 1:
+            return None
+        return scale, False
+
+    def add_widget(self, widget, *args, **kwargs):
+        # Children draw into the Fbo, in the usual place relative to each other
+        canvas = self.canvas
+        self.canvas = self.fbo
+        self.fbo.remove(self._pop)
+        try:
+            super().add_widget(widget, *args, **kwargs)
+        finally:
+            self.fbo.add(self._pop)
+            self.canvas = canvas
+
+    def remove_widget(self, widget, *args, **kwargs):
+        canvas = self.canvas
+        self.canvas = self.fbo
+        try:
+            super().remove_widget(widget, *args, **kwargs)
+        finally:
+            self.canvas = canvas
+
+    def set_render_scale(self, scale):
+        if scale == self.render_scale:
+            return
+        self.render_scale = scale
+        self._frames.clear()  # judge the new scale on its own frames
+        self._update_fbo()
+        print(f"[RENDER] Content drawn at {scale:g}x")
+
+    def _update_fbo(self, *args):
+        scale = self.render_scale
+        width, height = max(1, int(self.width * scale)), max(1, int(self.height * scale))
+        if tuple(self.fbo.size) != (width, height):
+            self.fbo.size = (width, height)
+            self.fbo.texture.mag_filter = 'linear'
+            self.fbo.texture.min_filter = 'linear'
+        # Window coordinates of the children onto the Fbo's pixels
+        self._scale.xyz = (width / max(self.width, 1), height / max(self.height, 1), 1)
+        self._translate.xy = (-self.x, -self.y)
+        self._rect.texture = self.fbo.texture
+        self._rect.pos = self.pos
+        self._rect.size = self.size
+
+    def start_adapting(self):
+        """Follow frame times, choosing among SCALE_STEPS."""
+        if self._adapt_event is None:
+            self._frames.clear()
+            self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+            self._adapt_event = Clock.schedule_interval(self._adapt, ADAPT_INTERVAL)
+
+    def stop_adapting(self):
+        if self._adapt_event is not None:
+            self._frame_event.cancel()
+            self._adapt_event.cancel()
+            self._frame_event = self._adapt_event = None
+
+    def _on_frame(self, dt):
+        self._frames.append(dt)
+
+    def _adapt(self, dt):
+        if len(self._frames) < ADAPT_FRAMES:
+            return
+        slow = percentile(self._frames, 0.9)
+        lower = [step for step in SCALE_STEPS if step < self.render_scale]
+        higher = [step for step in SCALE_STEPS if step > self.render_scale]
+        if slow > self.budget * SLOW_FACTOR:
+            self._fast_checks = 0
+            if lower:
+                self.set_render_scale(lower[0])
+        elif slow < self.budget * FAST_FACTOR and higher:
+            self._fast_checks += 1
+            if self._fast_checks >= RECOVER_CHECKS:
+                self._fast_checks = 0
+                self.set_render_scale(higher[-1])
+        else:
+            self._fast_checks = 0
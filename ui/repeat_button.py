@@ -0,0 +1,28 @@
+from kivy.clock import Clock
+from kivy.uix.button import Button
+
+REPEAT_DELAY = 0.4  # seconds held before the first repeat
+REPEAT_INTERVAL = 0.15  # seconds between repeats after that
+
+
+class RepeatButton(Button):
+    """Button that keeps dispatching on_press while it is held down"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._repeat_event = None
+        self.fbind('state', self._on_state)
+
+    def _on_state(self, instance, state):
+        if self._repeat_event:
+            self._repeat_event.cancel()
+            self._repeat_event = None
+        if state == 'down':
+            self._repeat_event = Clock.schedule_once(self._start_repeating, REPEAT_DELAY)
+
+    def _start_repeating(self, dt):
+        self._repeat_event = Clock.schedule_interval(self._repeat, REPEAT_INTERVAL)
+        self._repeat(dt)
+
+    def _repeat(self, dt):
+        self.dispatch('on_press')
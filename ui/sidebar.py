@@ -1,14 +1,14 @@
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
-from kivy.graphics import Color, Rectangle
 from kivy.animation import Animation
+from ui.panel_batch import PanelBatch
 from ui.theme import Theme
 
 class SidebarButton(Button):
     """Custom sidebar button with modern styling"""
     
-    def __init__(self, icon_text, page_name, **kwargs):
+    def __init__(self, icon_text, page_name, panel_batch=None, **kwargs):
         super().__init__(**kwargs)
         self.page_name = page_name
         self.icon_text = icon_text
@@ -16,38 +16,30 @@ class SidebarButton(Button):
         
         # Styling
         self.background_color = (0, 0, 0, 0)  # Transparent
-        self.color = Theme.SECONDARY_COLOR
+        Theme.paint(self, 'secondary')
         self.font_size = Theme.FONT_SIZE_ICON
         self.text = icon_text
         self.size_hint_y = None
         self.height = 100
         
-        # Custom background
-        with self.canvas.before:
-            Color(*Theme.SIDEBAR_COLOR)
-            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
-        
-        self.bind(pos=self.update_bg, size=self.update_bg)
-    
-    def update_bg(self, *args):
-        """Update background rectangle"""
-        self.bg_rect.pos = self.pos
-        self.bg_rect.size = self.size
+        # Background, drawn with the sidebar's other panels when given its batch
+        self.panel_batch = panel_batch or PanelBatch(self)
+        self.panel_batch.add(self, 'sidebar')
     
     def set_active(self, active):
         """Set button active state"""
         self.is_active = active
         if active:
-            self.canvas.before.children[0].rgba = Theme.SIDEBAR_SELECTED_COLOR
-            self.color = Theme.ACCENT_COLOR
+            self.panel_batch.set_role(self, 'sidebar_selected')
+            Theme.paint(self, 'accent')
         else:
-            self.canvas.before.children[0].rgba = Theme.SIDEBAR_COLOR
-            self.color = Theme.SECONDARY_COLOR
+            self.panel_batch.set_role(self, 'sidebar')
+            Theme.paint(self, 'secondary')
     
     def on_press(self):
         """Handle button press with animation"""
         # Brief highlight animation
-        anim = Animation(color=Theme.ACCENT_COLOR, duration=0.1)
+        anim = Animation(color=Theme.palette.accent, duration=0.1)
         anim.start(self)
 
 class SidebarNavigation(BoxLayout):
@@ -76,12 +68,9 @@ class SidebarNavigation(BoxLayout):
     
     def setup_sidebar(self):
         """Setup the sidebar layout and buttons"""
-        # Background
-        with self.canvas.before:
-            Color(*Theme.SIDEBAR_COLOR)
-            self.bg_rect = Rectangle(pos=self.pos, size=self.size)
-        
-        self.bind(pos=self.update_bg, size=self.update_bg)
+        # Background; the buttons' backgrounds share its batch
+        self.panel_batch = PanelBatch(self)
+        self.panel_batch.add(self, 'sidebar')
         
         # Logo/Brand area
         logo_area = BoxLayout(
@@ -94,9 +83,9 @@ class SidebarNavigation(BoxLayout):
         logo_label = Label(
             text='CAR',
             font_size='24sp',
-            color=Theme.PRIMARY_COLOR,
             bold=True
         )
+        Theme.paint(logo_label, 'primary')
         
         logo_area.add_widget(logo_label)
         self.add_widget(logo_area)
@@ -107,7 +96,8 @@ class SidebarNavigation(BoxLayout):
         for item in self.nav_items:
             button = SidebarButton(
                 icon_text=item['icon'],
-                page_name=item['page']
+                page_name=item['page'],
+                panel_batch=self.panel_batch
             )
             button.bind(on_press=lambda x, page=item['page']: self.navigate_to(page))
             
@@ -125,10 +115,10 @@ class SidebarNavigation(BoxLayout):
             label = Label(
                 text=item['label'],
                 font_size='10sp',
-                color=Theme.SECONDARY_COLOR,
                 size_hint_y=None,
                 height=20
             )
+            Theme.paint(label, 'secondary')
             button_container.add_widget(label)
             
             nav_area.add_widget(button_container)
@@ -139,11 +129,6 @@ class SidebarNavigation(BoxLayout):
         # Spacer to push everything to top
         self.add_widget(BoxLayout())
     
-    def update_bg(self, *args):
-        """Update background rectangle"""
-        self.bg_rect.pos = self.pos
-        self.bg_rect.size = self.size
-    
     def bind_navigation(self, callback):
         """Bind navigation callback"""
         self.navigation_callback = callback
@@ -159,11 +144,11 @@ class SidebarNavigation(BoxLayout):
         if self.active_page and self.active_page in self.buttons:
             button, label = self.buttons[self.active_page]
             button.set_active(False)
-            label.color = Theme.SECONDARY_COLOR
+            Theme.paint(label, 'secondary')
         
         # Activate new
         if page_name in self.buttons:
             button, label = self.buttons[page_name]
             button.set_active(True)
-            label.color = Theme.ACCENT_COLOR
+            Theme.paint(label, 'accent')
             self.active_page = page_name
@@ -0,0 +1,84 @@
+import os
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.label import Label
+
+from .theme import Theme
+from .view_binding import ViewBinding
+
+SIGNALS_ENV = 'MINI_MATT_TELEMETRY_SIGNALS'  # comma-separated signal names to show
+# ... or per view, e.g. MINI_MATT_TELEMETRY_SIGNALS_CLIMATE
+MAX_SIGNALS = 6  # shown when SIGNALS_ENV is not set
+REFRESH_INTERVAL = 0.25  # seconds between reads of the store
+RANGE_SECONDS = 10.0  # window of the min/max column
+
+
+def format_value(value):
+    return "--" if value is None else f"{value:.6g}"
+
+
+class TelemetryPanel(GridLayout):
+    """Latest value and recent range of a few vehicle signals from a TelemetryStore.
+
+    The store is read a few times a second while the panel is shown
+    (start() / stop()); labels are only rewritten when a value changed.
+    """
+
+    @classmethod
+    def for_app(cls, view=None):
+        """A panel on the running app's telemetry, or None until telemetry has started."""
+        store = getattr(App.get_running_app(), 'telemetry', None)
+        if not store:
+            return None
+        return cls(store, cls.configured_names(store, view))
+
+    def __init__(self, store, names=None, **kwargs):
+        super().__init__(cols=3, size_hint_y=None, spacing=Theme.SPACING_SMALL, **kwargs)
+        self.bind(minimum_height=self.setter('height'))
+        self.store = store
+        self.names = names or self.configured_names(store)
+        self.view = ViewBinding()
+        self._event = None
+        for name in self.names:
+            for text, field, role in ((name, None, 'secondary'),
+                                      ("--", f"{name}.value", 'primary'),
+                                      ("", f"{name}.range", 'secondary')):
+                label = Label(text=text, font_size=Theme.FONT_SIZE_SMALL,
+                              size_hint_y=None, height=Theme.BUTTON_HEIGHT / 2)
+                Theme.paint(label, role)
+                if field:
+                    self.view.bind(field, label)
+                self.add_widget(label)
+
+    @staticmethod
+    def configured_names(store, view=None):
+        """Signals named for the view, else in MINI_MATT_TELEMETRY_SIGNALS, else the first few."""
+        setting = os.environ.get(f"{SIGNALS_ENV}_{view.upper()}", '') if view else ''
+        setting = setting or os.environ.get(SIGNALS_ENV, '')
+        requested = [name.strip() for name in setting.split(',') if name.strip()]
+        if requested:
+            return [name for name in requested if name in store.buffers]
+        return store.signal_names[:MAX_SIGNALS]
+
+    def start(self):
+        if not self._event:
+            self.refresh()
+            self._event = Clock.schedule_interval(self.refresh, REFRESH_INTERVAL)
+
+    def stop(self):
+        if self._event:
+            self._event.cancel()
+            self._event = None
+
+    def refresh(self, *args):
+        model = {}
+        for name in self.names:
+            latest = self.store.latest(name)
+            stats = self.store.stats(name, RANGE_SECONDS)
+            model[f"{name}.value"] = format_value(latest and latest[1])
+            model[f"{name}.range"] = (
+                f"{format_value(stats['min'])} – {format_value(stats['max'])}"
+                if stats["count"] else "")
+        self.view.update(model)
@@ -1,19 +1,31 @@
 """Theme configuration for the car dashboard"""
+from .palette import Palette
+
 
 class Theme:
-    """Theme configuration and dark mode support."""
+    """Theme configuration and dark mode support.
+
+    Colors that follow dark mode are read through Theme.palette: widgets
+    paint themselves with a role (Theme.paint(label, 'primary')) and are
+    repainted in place when the mode changes. The *_COLOR attributes hold
+    the active values for code that only needs the color once.
+    """
 
     # -- Light Theme Colors --
     LIGHT_BACKGROUND = (1, 1, 1, 1)
     LIGHT_SIDEBAR = (0.95, 0.95, 0.95, 1)
     LIGHT_PRIMARY = (0.2, 0.2, 0.2, 1)
     LIGHT_SECONDARY = (0.5, 0.5, 0.5, 1)
+    LIGHT_SIDEBAR_SELECTED = (0.9, 0.9, 0.9, 1)
+    LIGHT_SIDEBAR_HOVER = (0.92, 0.92, 0.92, 1)
 
     # -- Dark Theme Colors --
     DARK_BACKGROUND = (0.08, 0.08, 0.08, 1)
     DARK_SIDEBAR = (0.15, 0.15, 0.15, 1)
     DARK_PRIMARY = (0.9, 0.9, 0.9, 1)
     DARK_SECONDARY = (0.7, 0.7, 0.7, 1)
+    DARK_SIDEBAR_SELECTED = (0.25, 0.25, 0.25, 1)
+    DARK_SIDEBAR_HOVER = (0.2, 0.2, 0.2, 1)
 
     ACCENT_COLOR = (0.0, 0.47, 0.84, 1)
     SUCCESS_COLOR = (0.2, 0.7, 0.3, 1)
@@ -29,11 +41,12 @@ class Theme:
     SECONDARY_COLOR = LIGHT_SECONDARY
 
     DARK_MODE = False
+    DARK_MODE_KEY = 'settings.dark_mode'  # where the choice is kept in the StateStore
 
     # Sidebar
     SIDEBAR_WIDTH = 120
-    SIDEBAR_SELECTED_COLOR = (0.9, 0.9, 0.9, 1)
-    SIDEBAR_HOVER_COLOR = (0.92, 0.92, 0.92, 1)
+    SIDEBAR_SELECTED_COLOR = LIGHT_SIDEBAR_SELECTED
+    SIDEBAR_HOVER_COLOR = LIGHT_SIDEBAR_HOVER
 
     # Typography
     FONT_THIN = 'Roboto-Thin'
@@ -63,18 +76,42 @@ class Theme:
     # Animations
     TRANSITION_DURATION = 0.2
 
+    @classmethod
+    def palette_colors(cls, dark: bool):
+        """Role -> color for the light or dark palette."""
+        return {
+            'background': cls.DARK_BACKGROUND if dark else cls.LIGHT_BACKGROUND,
+            'sidebar': cls.DARK_SIDEBAR if dark else cls.LIGHT_SIDEBAR,
+            'primary': cls.DARK_PRIMARY if dark else cls.LIGHT_PRIMARY,
+            'secondary': cls.DARK_SECONDARY if dark else cls.LIGHT_SECONDARY,
+            'accent': cls.ACCENT_COLOR,
+            'success': cls.SUCCESS_COLOR,
+            'warning': cls.WARNING_COLOR,
+            'error': cls.ERROR_COLOR,
+            'placeholder': cls.PLACEHOLDER_COLOR,
+            'sidebar_selected': cls.DARK_SIDEBAR_SELECTED if dark else cls.LIGHT_SIDEBAR_SELECTED,
+            'sidebar_hover': cls.DARK_SIDEBAR_HOVER if dark else cls.LIGHT_SIDEBAR_HOVER,
+        }
+
+    @classmethod
+    def paint(cls, target, role, attr='color', owner=None):
+        """Give target.attr the palette's role color, now and after every mode change."""
+        return cls.palette.paint(target, role, attr, owner)
+
     @classmethod
     def apply_dark_mode(cls, enabled: bool):
-        """Switch between light and dark color palettes."""
+        """Switch between light and dark palettes, repainting widgets in place."""
+        if enabled == cls.DARK_MODE:
+            return
         cls.DARK_MODE = enabled
-        if enabled:
-            cls.BACKGROUND_COLOR = cls.DARK_BACKGROUND
-            cls.SIDEBAR_COLOR = cls.DARK_SIDEBAR
-            cls.PRIMARY_COLOR = cls.DARK_PRIMARY
-            cls.SECONDARY_COLOR = cls.DARK_SECONDARY
-        else:
-            cls.BACKGROUND_COLOR = cls.LIGHT_BACKGROUND
-            cls.SIDEBAR_COLOR = cls.LIGHT_SIDEBAR
-            cls.PRIMARY_COLOR = cls.LIGHT_PRIMARY
-            cls.SECONDARY_COLOR = cls.LIGHT_SECONDARY
+        colors = cls.palette_colors(enabled)
+        cls.BACKGROUND_COLOR = colors['background']
+        cls.SIDEBAR_COLOR = colors['sidebar']
+        cls.PRIMARY_COLOR = colors['primary']
+        cls.SECONDARY_COLOR = colors['secondary']
+        cls.SIDEBAR_SELECTED_COLOR = colors['sidebar_selected']
+        cls.SIDEBAR_HOVER_COLOR = colors['sidebar_hover']
+        cls.palette.apply(colors)
+
 
+Theme.palette = Palette(Theme.palette_colors(Theme.DARK_MODE))
@@ -0,0 +1,108 @@
+import json
+import os
+import time
+
+from kivy.core.window import Window
+
+RECORD_ENV = 'MINI_MATT_RECORD_TOUCHES'
+RECORD_DIR = os.path.expanduser('~/.config/mini-matt')
+SESSION_VERSION = 1
+COORD_SCALE = 10000  # positions are stored as integer fractions of the window
+EVENT_KINDS = ('begin', 'update', 'end')
+
+
+def save_session(path, session):
+    """Write a session with one event per line; small, and diffs cleanly."""
+    header = {key: value for key, value in session.items() if key != 'events'}
+    lines = [json.dumps(event, separators=(',', ':')) for event in session['events']]
+    with open(path, 'w') as f:
+        f.write('{"header":' + json.dumps(header) + ',\n"events":[\n')
+        f.write(',\n'.join(lines))
+        f.write('\n]}\n')
+
+
+def load_session(path):
+    """Read a session saved by save_session; raises ValueError on other files."""
+    with open(path) as f:
+        data = json.load(f)
+    header = data.get('header', {})
+    if header.get('version') != SESSION_VERSION:
+        raise ValueError(f"{path}: not a version {SESSION_VERSION} touch session")
+    session = dict(header)
+    session['events'] = [tuple(event) for event in data['events']]
+    return session
+
+
+class TouchRecorder:
+    """Records every touch the window receives into a replayable session.
+
+    Each event is (milliseconds since the first touch, kind, touch number,
+    x, y), with kind an index into EVENT_KINDS and x/y fractions of the
+    window scaled to integers, so a session replays on any window size and
+    a minute of driving stays a few hundred kilobytes. Watching the window
+    means recording sees touches exactly as the widgets do, whatever the
+    input provider (mouse, mtdev, hidinput).
+    """
+
+    def __init__(self):
+        self.events = []
+        self.page = None
+        self.recording = False
+        self._first = None
+        self._numbers = {}  # MotionEvent uid -> touch number, while it is down
+        self._next_number = 0
+
+    @staticmethod
+    def enabled_by_env():
+        return os.environ.get(RECORD_ENV) == '1'
+
+    def start(self, page=None):
+        """Start recording; page is where a replay should begin."""
+        if self.recording:
+            return
+        self.events = []
+        self.page = page
+        self._first = None
+        self._numbers.clear()
+        self._next_number = 0
+        Window.bind(on_motion=self._on_motion)
+        self.recording = True
+        print("[TOUCH] Recording touches")
+
+    def stop(self):
+        if self.recording:
+            Window.unbind(on_motion=self._on_motion)
+            self.recording = False
+
+    def _on_motion(self, window, etype, me):
+        if not me.is_touch or etype not in EVENT_KINDS:
+            return
+        number = self._numbers.get(me.uid)
+        if number is None:
+            if etype != 'begin':
+                return  # went down before recording started
+            number = self._numbers[me.uid] = self._next_number
+            self._next_number += 1
+        if etype == 'end':
+            del self._numbers[me.uid]
+        now = time.perf_counter()
+        if self._first is None:
+            self._first = now
+        self.events.append((int((now - self._first) * 1000), EVENT_KINDS.index(etype), number,
+                            round(me.sx * COORD_SCALE), round(me.sy * COORD_SCALE)))
+
+    def session(self):
+        return {
+            "version": SESSION_VERSION,
+            "window": list(Window.size),
+            "page": self.page,
+            "events": self.events,
+        }
+
+    def save(self, directory=RECORD_DIR):
+        """Write the session to directory/touches_<time>.json; returns the path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime('touches_%Y%m%d-%H%M%S.json'))
+        save_session(path, self.session())
+        print(f"[TOUCH] Saved {len(self.events)} touch events to {path}")
+        return path
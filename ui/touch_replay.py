@@ -0,0 +1,88 @@
+import time
+
+from kivy.base import EventLoop
+from kivy.input.motionevent import MotionEvent
+from kivy.input.provider import MotionEventProvider
+
+from .touch_recorder import COORD_SCALE, EVENT_KINDS
+
+
+class ReplayTouch(MotionEvent):
+    """A recorded touch being played back."""
+
+    def depack(self, args):
+        self.sx, self.sy = args
+        if not self.profile:
+            self.profile.append('pos')
+        super().depack(args)
+
+
+class TouchReplay(MotionEventProvider):
+    """Plays a recorded touch session back through Kivy's input pipeline.
+
+    It is an input provider like the mouse or touchscreen ones, so replayed
+    touches pass the same postprocessing (double tap, jitter, ...), grabs and
+    widget dispatch as real ones: a recorded tap on a sidebar icon presses
+    that SidebarButton, and a recorded drag scrolls the device list. Events
+    are released when their recorded time comes due, so a session always
+    plays with the same timing. Each release is logged in dispatched as
+    (kind, due time, dispatch time) on the perf_counter clock.
+    """
+
+    def __init__(self, session, speed=1.0):
+        super().__init__('replay', None)
+        self.events = session['events']
+        self.speed = speed
+        self.dispatched = []
+        self._index = 0
+        self._start = None
+        self._touches = {}  # touch number -> ReplayTouch, while it is down
+        self._ids = 0
+
+    @property
+    def finished(self):
+        return self._index >= len(self.events)
+
+    def play(self):
+        """Register with the event loop and start releasing events."""
+        EventLoop.add_input_provider(self)
+        self.start()
+
+    def start(self):
+        self._index = 0
+        self._touches.clear()
+        self.dispatched = []
+        self._start = time.perf_counter()
+
+    def stop(self):
+        self._start = None
+        if self in EventLoop.input_providers:
+            EventLoop.remove_input_provider(self)
+
+    def update(self, dispatch_fn):
+        if self._start is None:
+            return
+        now = time.perf_counter()
+        events = self.events
+        while self._index < len(events):
+            offset, kind, number, x, y = events[self._index]
+            due = self._start + offset / 1000 / self.speed
+            if due > now:
+                break
+            self._index += 1
+            args = [x / COORD_SCALE, y / COORD_SCALE]
+            etype = EVENT_KINDS[kind]
+            if etype == 'begin':
+                self._ids += 1
+                touch = self._touches[number] = ReplayTouch(
+                    self.device, self._ids, args, is_touch=True, type_id='touch')
+            else:
+                touch = self._touches.get(number)
+                if touch is None:
+                    continue
+                touch.move(args)
+                if etype == 'end':
+                    touch.update_time_end()
+                    del self._touches[number]
+            dispatch_fn(etype, touch)
+            self.dispatched.append((etype, due, now))
@@ -0,0 +1,53 @@
+from .theme import Theme
+
+
+class ViewBinding:
+    """Maps view-model fields to widget properties, writing only values that changed.
+
+    Assigning a Label's text or color re-renders its texture on the CPU, and
+    Kivy's own equality check does not catch a color tuple being assigned
+    over the list it stores. The binding remembers the last value written to
+    each widget property and skips the write when the new one is equal.
+    """
+
+    def __init__(self):
+        self._targets = {}  # field -> [(widget, prop, convert)] or [(None, callback, convert)]
+        self._written = {}  # (widget, prop) or callback -> last value applied
+
+    def bind(self, field, widget, prop='text', convert=None):
+        """Write model[field] (through convert) to widget.prop on update."""
+        self._targets.setdefault(field, []).append((widget, prop, convert))
+        return self
+
+    def bind_call(self, field, callback, convert=None):
+        """Call callback(value) on update when model[field] changes."""
+        self._targets.setdefault(field, []).append((None, callback, convert))
+        return self
+
+    def bind_role(self, field, widget, prop='color'):
+        """Paint widget.prop with the palette role named by model[field] on update."""
+        return self.bind_call(field, lambda role: Theme.paint(widget, role, prop))
+
+    def update(self, model):
+        """Apply a dict of field values; returns how many targets were touched."""
+        touched = 0
+        for field, value in model.items():
+            for widget, target, convert in self._targets.get(field, ()):
+                if convert is not None:
+                    value_out = convert(value)
+                else:
+                    value_out = value
+                key = target if widget is None else (widget, target)
+                if key in self._written and self._written[key] == value_out:
+                    continue
+                self._written[key] = value_out
+                if widget is None:
+                    target(value_out)
+                else:
+                    setattr(widget, target, value_out)
+                touched += 1
+        return touched
+
+    def invalidate(self):
+        """Forget what was written so the next update touches every target."""
+        self._written.clear()